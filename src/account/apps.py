@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AccountConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "account"
+
+    def ready(self):
+        from django.conf import settings
+        from users import instrumentation
+
+        from account import signals  # noqa: F401 - connecte les receivers
+
+        if getattr(settings, "USERS_INSTRUMENTATION", False):
+            instrumentation.enable()
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from account.repositories import build_storage
+from users.adapters.email_filter import EmailFilterRepository, build_email_filter
+
+
+class Command(BaseCommand):
+    help = (
+        "Construit le filtre de Bloom des emails enregistrés et l'écrit dans "
+        "USERS_EMAIL_FILTER['PATH'], relu par les workers au démarrage."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        config = getattr(settings, "USERS_EMAIL_FILTER", None)
+        if not config or not config.get("PATH"):
+            raise CommandError("USERS_EMAIL_FILTER['PATH'] n'est pas renseigné")
+        # tous les shards (anciens compris) : un email manquant serait refusé
+        repository = build_email_filter(config, build_storage())
+        if not isinstance(repository, EmailFilterRepository):
+            raise CommandError("Le filtre d'emails est désactivé (USERS_EMAIL_FILTER)")
+        repository.batch_size = options["batch_size"]
+
+        started = time.perf_counter()
+        bloom = repository.rebuild()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{bloom.count} emails, {bloom.nbytes / 2**20:.1f} Mio, "
+            f"{bloom.hashes} hachages, faux positifs estimés "
+            f"{bloom.error_rate:.2%}, en {elapsed:.1f}s -> {config['PATH']}"
+        )
@@ -0,0 +1,73 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from users.adapters.django_outbox import DjangoOutbox
+from users.services.event_dispatcher import EventDispatcher
+
+
+def load_handlers() -> dict:
+    config = getattr(settings, "USERS_EVENT_HANDLERS", {})
+    return {
+        name: [import_string(path) for path in paths] for name, paths in config.items()
+    }
+
+
+class Command(BaseCommand):
+    help = "Publie les événements de domaine de l'outbox (worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Handlers exécutés en parallèle"
+        )
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument(
+            "--backoff",
+            type=float,
+            default=1.0,
+            help="Délai après le premier échec (s), doublé à chaque échec",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Vide l'outbox puis s'arrête au lieu de tourner en continu",
+        )
+
+    def handle(self, *args, **options):
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+
+        dispatcher = EventDispatcher(
+            DjangoOutbox(),
+            load_handlers(),
+            max_workers=options["workers"],
+            max_attempts=options["max_attempts"],
+            backoff=options["backoff"],
+        )
+        with dispatcher:
+            if options["once"]:
+                report = dispatcher.dispatch_once(options["batch_size"])
+                total = report
+                while report.claimed == options["batch_size"]:
+                    report = dispatcher.dispatch_once(options["batch_size"])
+                    total.add(report)
+            else:
+                try:
+                    total = dispatcher.run(
+                        options["batch_size"],
+                        options["poll_interval"],
+                        should_stop=lambda: bool(stopping),
+                    )
+                except KeyboardInterrupt:
+                    return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total.dispatched} publiés, {total.retried} reprogrammés, "
+                f"{total.abandoned} abandonnés"
+            )
+        )
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from account.repositories import build_unit_of_work
+from users.adapters.hashers import build_engine
+from users.services.importer import (
+    FORMATS,
+    Checkpoint,
+    ImportProgress,
+    detect_format,
+    import_users,
+)
+from users.services.user_services import UserService
+
+
+class Command(BaseCommand):
+    help = "Importe des utilisateurs depuis un fichier CSV ou JSONL (email, password)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            help="Fichier de reprise (par défaut <path>.checkpoint.json)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Hache chaque lot dans un pool de ce nombre de process",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore un checkpoint existant et repart du début",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            fmt = options["format"] or detect_format(path)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        checkpoint = Checkpoint(options["checkpoint"] or f"{path}.checkpoint.json")
+        if options["restart"]:
+            checkpoint.clear()
+        elif (previous := checkpoint.load()) is not None:
+            self.stdout.write(f"Reprise après {previous.rows} lignes")
+
+        hashing = dict(getattr(settings, "USERS_PASSWORD_HASHING", None) or {})
+        if options["workers"]:
+            hashing.update(POOL="process", WORKERS=options["workers"])
+        service = UserService(build_unit_of_work(), hasher=build_engine(hashing))
+        with open(path, "rb") as f:
+            progress = import_users(
+                service,
+                f,
+                fmt,
+                batch_size=options["batch_size"],
+                checkpoint=checkpoint,
+                on_batch=self._report,
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import terminé : {self._summary(progress)} en {progress.elapsed:.1f}s"
+            )
+        )
+
+    def _report(self, progress: ImportProgress) -> None:
+        self.stdout.write(
+            f"{self._summary(progress)} – {progress.rows_per_second:.0f} lignes/s"
+        )
+
+    @staticmethod
+    def _summary(progress: ImportProgress) -> str:
+        return (
+            f"{progress.rows} lignes, {progress.created} créés, "
+            f"{progress.already_exists} existants, {progress.invalid} invalides"
+        )
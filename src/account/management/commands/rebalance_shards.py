@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from account.repositories import build_storage
+from users.adapters.sharding import RebalanceReport, rebalance
+
+
+class Command(BaseCommand):
+    help = (
+        "Déplace les utilisateurs vers le shard de leur email après un "
+        "changement de USERS_SHARDS (reprise possible à tout moment)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--source",
+            action="append",
+            help="Base à vider ou vérifier (répétable) ; par défaut tous les "
+            "shards, anciens compris",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Compte sans rien déplacer"
+        )
+
+    def handle(self, *args, **options):
+        shards = getattr(settings, "USERS_SHARDS", None)
+        if not shards:
+            raise CommandError("USERS_SHARDS est vide : pas de shard à équilibrer")
+        unknown = set(options["source"] or ()) - set(settings.DATABASES)
+        if unknown:
+            raise CommandError(f"Bases inconnues : {', '.join(sorted(unknown))}")
+
+        report = rebalance(
+            build_storage(options["batch_size"]),
+            sources=options["source"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            on_batch=self._report,
+        )
+        for (source, target), count in sorted(report.moved.items()):
+            self.stdout.write(f"{source} -> {target} : {count}")
+        verb = "à déplacer" if options["dry_run"] else "déplacés"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Terminé : {report.scanned} lus, {report.total_moved} {verb} "
+                f"en {report.elapsed:.1f}s"
+            )
+        )
+
+    def _report(self, report: RebalanceReport) -> None:
+        rate = report.scanned / report.elapsed if report.elapsed else 0.0
+        self.stdout.write(
+            f"{report.scanned} lus, {report.total_moved} mal placés"
+            f" – {rate:.0f} lignes/s"
+        )
@@ -0,0 +1,95 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from account.repositories import build_databases
+from users.adapters.hashers import build_engine
+from users.services.rehash import RehashProgress, rehash_legacy_passwords
+
+
+class Command(BaseCommand):
+    help = (
+        "Enveloppe les anciens hash SHA-256 dans le KDF courant "
+        "(USERS_PASSWORD_HASHING), en parallèle sur un pool de process, "
+        "base par base (tous les shards avec USERS_SHARDS)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=200)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Process de hachage (par défaut : nombre de cœurs)",
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            help="Lots lus mais pas encore écrits (par défaut : 2 par process)",
+        )
+        parser.add_argument(
+            "--after",
+            help="Reprend après cet id, <base>:<id> avec des shards "
+            "(affiché à chaque lot)",
+        )
+
+    def handle(self, *args, **options):
+        kdf = build_engine(getattr(settings, "USERS_PASSWORD_HASHING", None)).preferred
+        workers = options["workers"]
+        databases = build_databases()
+        self.sharded = len(databases) > 1
+        total = RehashProgress()
+        started = time.perf_counter()
+        with ProcessPoolExecutor(workers) as executor:
+            for repository, after in self._resume(databases, options["after"]):
+                progress = rehash_legacy_passwords(
+                    repository,
+                    kdf,
+                    executor,
+                    chunk_size=options["chunk_size"],
+                    max_in_flight=options["max_in_flight"] or 2 * workers,
+                    after=after,
+                    on_chunk=lambda p, using=repository.using: self._report(p, using),
+                )
+                total.rows += progress.rows
+                total.rehashed += progress.rehashed
+                total.skipped += progress.skipped
+        total.elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Terminé : {self._summary(total)} en {total.elapsed:.1f}s "
+                f"({total.rows_per_second:.0f} hash/s, {workers} process)"
+            )
+        )
+
+    def _resume(self, databases, after):
+        """(repository, id de reprise) des bases à traiter, dans l'ordre."""
+        if not self.sharded or after is None:
+            return [(repository, after) for repository in databases]
+        using, _, last_id = after.partition(":")
+        aliases = [repository.using for repository in databases]
+        if using not in aliases:
+            raise CommandError(
+                f"--after : base inconnue {using!r}, attendu <base>:<id>"
+            )
+        start = aliases.index(using)
+        return [(databases[start], last_id or None)] + [
+            (repository, None) for repository in databases[start + 1 :]
+        ]
+
+    def _report(self, progress: RehashProgress, using: str) -> None:
+        after = f"{using}:{progress.after}" if self.sharded else progress.after
+        self.stdout.write(
+            f"{self._summary(progress)} – {progress.rows_per_second:.0f} hash/s"
+            f" – dernier id {after}"
+        )
+
+    @staticmethod
+    def _summary(progress: RehashProgress) -> str:
+        return (
+            f"{progress.rows} lus, {progress.rehashed} réécrits, "
+            f"{progress.skipped} modifiés entre-temps"
+        )
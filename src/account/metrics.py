@@ -0,0 +1,56 @@
+"""
+Exposition des mesures de users.instrumentation côté Django : comptage des
+requêtes SQL par `execute_wrapper`, en-tête Server-Timing et endpoint au
+format texte Prometheus.
+"""
+
+import contextlib
+import time
+
+from django.db import connections
+from django.http import Http404, HttpResponse
+
+from users import instrumentation
+
+
+def _count_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        instrumentation.record_query(time.perf_counter() - start)
+
+
+class ServerTimingMixin:
+    """
+    Pour une APIView : mesure la requête (étapes et requêtes SQL) et ajoute
+    l'en-tête Server-Timing. Sans effet quand l'instrumentation est coupée.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not instrumentation.state.enabled:
+            return super().dispatch(request, *args, **kwargs)
+        with instrumentation.request_scope(), contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_count_query))
+            return super().dispatch(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        timings = instrumentation._current.get()
+        if timings is None:
+            return response
+        # rendu anticipé pour mesurer la sérialisation ; render() est idempotent
+        with instrumentation.span("serialization"):
+            response.render()
+        response["Server-Timing"] = timings.server_timing()
+        return response
+
+
+def metrics_view(request):
+    if not instrumentation.state.enabled:
+        raise Http404
+    return HttpResponse(
+        instrumentation.metrics.render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
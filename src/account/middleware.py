@@ -0,0 +1,25 @@
+from django.urls import reverse
+
+from account import views
+
+
+class FastPathMiddleware:
+    """
+    Sert les vues du chemin rapide (views.fast_register / fast_login) sans
+    résolution d'URL ni les middlewares placés après celui-ci : à mettre
+    juste après SecurityMiddleware. Les autres requêtes suivent la pile
+    normale ; les mêmes vues restent routées par urls.py sans ce middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.routes = {
+            reverse("fast-register"): views.fast_register,
+            reverse("fast-login"): views.fast_login,
+        }
+
+    def __call__(self, request):
+        view = self.routes.get(request.path_info)
+        if view is None:
+            return self.get_response(request)
+        return view(request)
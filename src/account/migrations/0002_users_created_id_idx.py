@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usermodel",
+            index=models.Index(
+                fields=["created_at", "id"], name="users_created_id_idx"
+            ),
+        ),
+    ]
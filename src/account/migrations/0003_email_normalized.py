@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:40
+
+import account.models
+from django.db import migrations, models
+from django.db.models import Count
+
+BATCH_SIZE = 1000
+
+
+def normalize(email):
+    return email.strip().lower()
+
+
+def backfill_email_normalized(apps, schema_editor):
+    UserModel = apps.get_model("account", "UserModel")
+    db = schema_editor.connection.alias
+    rows = (
+        UserModel.objects.using(db)
+        .filter(email_normalized__isnull=True)
+        .values_list("pk", "email")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for pk, email in rows:
+        batch.append(UserModel(pk=pk, email_normalized=normalize(email)))
+        if len(batch) >= BATCH_SIZE:
+            UserModel.objects.using(db).bulk_update(batch, ["email_normalized"])
+            batch = []
+    if batch:
+        UserModel.objects.using(db).bulk_update(batch, ["email_normalized"])
+
+    duplicates = list(
+        UserModel.objects.using(db)
+        .values("email_normalized")
+        .annotate(n=Count("pk"))
+        .filter(n__gt=1)
+        .values_list("email_normalized", flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Comptes en double une fois les emails normalisés, à fusionner "
+            f"avant la migration : {', '.join(duplicates)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0002_users_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usermodel",
+            name="email_normalized",
+            field=account.models.NormalizedEmailField(
+                editable=False, max_length=254, null=True, source="email"
+            ),
+        ),
+        migrations.RunPython(backfill_email_normalized, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="usermodel",
+            name="email_normalized",
+            field=account.models.NormalizedEmailField(
+                editable=False, max_length=254, source="email", unique=True
+            ),
+        ),
+        # l'unicité porte désormais sur la forme normalisée
+        migrations.AlterField(
+            model_name="usermodel",
+            name="email",
+            field=models.EmailField(max_length=254),
+        ),
+    ]
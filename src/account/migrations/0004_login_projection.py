@@ -0,0 +1,66 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_login_projection(apps, schema_editor):
+    UserModel = apps.get_model("account", "UserModel")
+    LoginProjection = apps.get_model("account", "LoginProjection")
+    db = schema_editor.connection.alias
+    rows = (
+        UserModel.objects.using(db)
+        .values_list("pk", "email_normalized", "email", "password", "is_active")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for pk, email_normalized, email, password, is_active in rows:
+        batch.append(
+            LoginProjection(
+                user_id=pk,
+                email_normalized=email_normalized,
+                email=email,
+                password=password,
+                is_active=is_active,
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            LoginProjection.objects.using(db).bulk_create(batch)
+            batch = []
+    if batch:
+        LoginProjection.objects.using(db).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0003_email_normalized"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoginProjection",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="account.usermodel",
+                    ),
+                ),
+                ("email_normalized", models.CharField(max_length=254, unique=True)),
+                ("email", models.CharField(max_length=254)),
+                ("password", models.CharField(max_length=255)),
+                ("is_active", models.BooleanField()),
+            ],
+            options={
+                "db_table": "users_login",
+            },
+        ),
+        migrations.RunPython(backfill_login_projection, migrations.RunPython.noop),
+    ]
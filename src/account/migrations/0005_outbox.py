@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0004_login_projection"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("payload", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "available_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("claimed_by", models.CharField(blank=True, default="", max_length=32)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("dispatched_at", models.DateTimeField(null=True)),
+                ("failed_at", models.DateTimeField(null=True)),
+            ],
+            options={
+                "db_table": "users_outbox",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(
+                            ("dispatched_at__isnull", True), ("failed_at__isnull", True)
+                        ),
+                        fields=["available_at", "id"],
+                        name="users_outbox_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
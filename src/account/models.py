@@ -1,34 +1,123 @@
 from django.db import models
+from django.utils import timezone
 import uuid
 from users.core.models import User
+from users.core.value_object import normalize_email
+
+
+class NormalizedEmailField(models.CharField):
+    """
+    Copie normalisée (normalize_email) d'un autre champ, recalculée à chaque
+    insertion ou save(). Les UPDATE directs doivent la renseigner eux-mêmes.
+    """
+
+    def __init__(self, *args, source: str = "email", **kwargs):
+        self.source = source
+        kwargs.setdefault("max_length", 254)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = normalize_email(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
 
 
 class UserModel(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    email = models.EmailField(unique=True)
+    email = models.EmailField()
+    # clé de recherche et d'unicité : login insensible à la casse, indexé
+    email_normalized = NormalizedEmailField(unique=True, editable=False)
     password = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "users"
+        indexes = [
+            # pagination keyset de DjangoUserRepository.iter_users
+            models.Index(fields=["created_at", "id"], name="users_created_id_idx"),
+        ]
 
     # --- MAPPING ---
     def to_domain(self) -> User:
-        user = User(
+        return User.hydrate(
+            id=str(self.id),
             email=self.email,
             password=self.password,
             is_active=self.is_active,
             created_at=self.created_at,
         )
-        user.id = str(self.id)
-        return user
 
     @classmethod
     def from_domain(cls, user: User) -> "UserModel":
         return cls(
             id=user.id,
             email=user.email,
+            email_normalized=normalize_email(user.email),
+            password=user.password,
+            is_active=user.is_active,
+        )
+
+
+class LoginProjection(models.Model):
+    """
+    Modèle de lecture du login (côté requête du CQRS) : une ligne compacte
+    par utilisateur, tenue à jour par DjangoUserRepository dans la même
+    transaction que l'écriture sur UserModel.
+    """
+
+    user = models.OneToOneField(
+        UserModel, primary_key=True, on_delete=models.CASCADE, related_name="+"
+    )
+    email_normalized = models.CharField(max_length=254, unique=True)
+    email = models.CharField(max_length=254)
+    password = models.CharField(max_length=255)
+    is_active = models.BooleanField()
+
+    class Meta:
+        db_table = "users_login"
+
+    @classmethod
+    def from_domain(cls, user: User) -> "LoginProjection":
+        return cls(
+            user_id=user.id,
+            email_normalized=normalize_email(user.email),
+            email=user.email,
             password=user.password,
             is_active=user.is_active,
         )
+
+
+class OutboxEvent(models.Model):
+    """
+    Événement de domaine à publier (outbox transactionnelle) : inséré dans
+    la transaction qui modifie l'utilisateur, publié ensuite par
+    `manage.py dispatch_events`.
+    """
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    # prochaine tentative ; repoussée par le bail d'un worker ou le backoff
+    available_at = models.DateTimeField(default=timezone.now)
+    claimed_by = models.CharField(max_length=32, blank=True, default="")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    dispatched_at = models.DateTimeField(null=True)
+    failed_at = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = "users_outbox"
+        indexes = [
+            # seuls les événements en attente sont parcourus par les workers
+            models.Index(
+                fields=["available_at", "id"],
+                name="users_outbox_pending_idx",
+                condition=models.Q(dispatched_at__isnull=True, failed_at__isnull=True),
+            ),
+        ]
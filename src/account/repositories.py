@@ -0,0 +1,87 @@
+"""
+Construction des repositories et des unités de travail à partir des
+settings, partagée par les vues et les commandes : avec USERS_SHARDS, tout
+passe par les shards, jamais directement par "default".
+"""
+
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from users import instrumentation
+from users.adapters.async_repository import AbstractAsyncUserRepository
+from users.adapters.caching_repository import CachingUserRepository
+from users.adapters.django_repository import (
+    AsyncDjangoUserRepository,
+    DjangoUserRepository,
+)
+from users.adapters.email_filter import EmailFilterRepository, build_email_filter
+from users.adapters.repository import AbstractUserRepository
+from users.adapters.sharding import AsyncShardedUserRepository, ShardedUserRepository
+from users.services.unit_of_work import DjangoUnitOfWork
+
+
+def _shards():
+    return (
+        getattr(settings, "USERS_SHARDS", None),
+        getattr(settings, "USERS_SHARDS_PREVIOUS", None),
+    )
+
+
+def build_storage(batch_size: int = 1000) -> AbstractUserRepository:
+    """Stockage seul (shards ou "default"), sans cache ni filtre."""
+    shards, previous = _shards()
+    if shards:
+        return ShardedUserRepository(shards, batch_size, previous=previous)
+    return DjangoUserRepository(batch_size)
+
+
+def build_databases(batch_size: int = 1000) -> List[DjangoUserRepository]:
+    """
+    Un repository par base qui contient des utilisateurs, anciens shards
+    compris, pour la maintenance base par base (rehash_passwords).
+    """
+    storage = build_storage(batch_size)
+    if isinstance(storage, ShardedUserRepository):
+        return list(storage.repositories.values())
+    return [storage]
+
+
+def build_user_repository() -> AbstractUserRepository:
+    """Stockage décoré du cache (USERS_CACHE) et du filtre (USERS_EMAIL_FILTER)."""
+    repository = build_storage()
+    cache_config = getattr(settings, "USERS_CACHE", None)
+    if cache_config:
+        backend = cache_config.get("BACKEND")
+        repository = CachingUserRepository(
+            repository,
+            maxsize=cache_config.get("MAXSIZE", 10_000),
+            ttl=cache_config.get("TTL", 60),
+            backend=caches[backend] if backend else None,
+        )
+        instrumentation.metrics.register_gauges("cache", repository.stats.as_dict)
+    filter_config = getattr(settings, "USERS_EMAIL_FILTER", None) or {}
+    backend = filter_config.get("BACKEND")
+    repository = build_email_filter(
+        filter_config, repository, backend=caches[backend] if backend else None
+    )
+    if isinstance(repository, EmailFilterRepository):
+        instrumentation.metrics.register_gauges(
+            "email_filter", repository.stats.as_dict
+        )
+    return repository
+
+
+def build_unit_of_work(
+    users: Optional[AbstractUserRepository] = None,
+) -> DjangoUnitOfWork:
+    """Unit of work sur `users`, par défaut sur le stockage seul (commandes)."""
+    return DjangoUnitOfWork(users=users if users is not None else build_storage())
+
+
+def build_async_repository() -> AbstractAsyncUserRepository:
+    shards, previous = _shards()
+    if shards:
+        return AsyncShardedUserRepository(shards, previous=previous)
+    return AsyncDjangoUserRepository()
@@ -0,0 +1,31 @@
+from django.conf import settings
+
+# modèles répartis par users.adapters.sharding
+SHARDED_MODELS = {"usermodel", "loginprojection"}
+
+
+class UserShardRouter:
+    """
+    Actif avec settings.USERS_SHARDS. Le choix du shard est fait par
+    ShardedUserRepository (`using` explicite, selon l'email) ; le routeur
+    garde les objets liés dans la base de leur instance et limite les shards
+    aux tables de l'app account (les autres apps restent dans "default").
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and model._meta.model_name in SHARDED_MODELS:
+            return instance._state.db
+        return None
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._meta.model_name, obj2._meta.model_name} <= SHARDED_MODELS:
+            return obj1._state.db == obj2._state.db
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in getattr(settings, "USERS_SHARDS", ()):
+            return app_label == "account"
+        return None
@@ -0,0 +1,17 @@
+"""
+Projection de login tenue à jour pour les écritures qui ne passent pas par
+DjangoUserRepository (admin, shell, fixtures). Le repository écrit par
+bulk_create et update(), qui n'émettent pas post_save, et projette lui-même.
+La suppression d'un utilisateur emporte sa ligne de projection (CASCADE).
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from account.models import UserModel
+from users.adapters.django_repository import project
+
+
+@receiver(post_save, sender=UserModel)
+def project_saved_user(sender, instance: UserModel, using: str, **kwargs) -> None:
+    project([instance.to_domain()], using=using)
@@ -1,8 +1,23 @@
 # users/adapters/urls.py
 from django.urls import path
-from account.views import RegisterUserView, AuthenticateUserView
+from account.metrics import metrics_view
+from account.views import (
+    AsyncAuthenticateUserView,
+    AsyncRegisterUserView,
+    AuthenticateUserView,
+    RegisterUserView,
+    UserListView,
+    fast_login,
+    fast_register,
+)
 
 urlpatterns = [
     path("register/", RegisterUserView.as_view(), name="register"),
     path("login/", AuthenticateUserView.as_view(), name="login"),
+    path("users/", UserListView.as_view(), name="user-list"),
+    path("async/register/", AsyncRegisterUserView.as_view(), name="async-register"),
+    path("async/login/", AsyncAuthenticateUserView.as_view(), name="async-login"),
+    path("fast/register/", fast_register, name="fast-register"),
+    path("fast/login/", fast_login, name="fast-login"),
+    path("metrics/", metrics_view, name="metrics"),
 ]
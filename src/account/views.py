@@ -1,22 +1,72 @@
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.permissions import IsAdminUser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from account.metrics import ServerTimingMixin
+from account.repositories import (
+    build_async_repository,
+    build_unit_of_work,
+    build_user_repository,
+)
+from users import instrumentation
 from users.core.commands import RegisterUserCommand
 from users.services.user_services import UserService
-from users.adapters.django_repository import DjangoUserRepository
-from users.services.unit_of_work import DjangoUnitOfWork
+from users.adapters.hashers import build_engine
+from users.adapters import identity_map
+from users.adapters.throttling import build_throttle
+from users.core.exceptions import TooManyAttempts
+from users.services.async_user_services import AsyncUserService
+
+try:  # optionnel : parsing et encodage JSON plus rapides
+    import orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    orjson = None
+
+
+repo = build_user_repository()
+instrumentation.metrics.register_gauges("identity_map", identity_map.stats.as_dict)
+hasher = build_engine(getattr(settings, "USERS_PASSWORD_HASHING", None))
+
+
+throttle = build_throttle(getattr(settings, "USERS_LOGIN_THROTTLE", None), caches)
+
+
+def check_throttle(request, email) -> None:
+    """Lève TooManyAttempts avant tout accès à la base ou hachage."""
+    if throttle is not None:
+        throttle.check(email, request.META.get("REMOTE_ADDR"))
+
+
+def count_failed_login(request, email) -> None:
+    # seuls les échecs sont limités : les logins réussis ne comptent pas
+    if throttle is not None:
+        throttle.failed(email, request.META.get("REMOTE_ADDR"))
+
+
+def get_service() -> UserService:
+    # une unit of work par requête : elle porte l'état de la transaction
+    return UserService(build_unit_of_work(repo), hasher=hasher)
+
 
-repo = DjangoUserRepository()
-service = UserService(DjangoUnitOfWork())
+# sans état de transaction : partagé entre les requêtes
+async_service = AsyncUserService(build_async_repository(), hasher=hasher)
 
 
-class RegisterUserView(APIView):
+class RegisterUserView(ServerTimingMixin, APIView):
     def post(self, request):
         cmd = RegisterUserCommand(
             email=request.data.get("email"), password=request.data.get("password")
         )
         try:
-            user = service.register(cmd)
+            user = get_service().register(cmd)
             return Response(
                 {"id": user.id, "email": user.email}, status=status.HTTP_201_CREATED
             )
@@ -24,14 +74,155 @@ class RegisterUserView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AuthenticateUserView(APIView):
+class AuthenticateUserView(ServerTimingMixin, APIView):
     def post(self, request):
         email = request.data.get("email")
         password = request.data.get("password")
         try:
-            user = service.authenticate(email, password)
+            check_throttle(request, email)
+            user = get_service().authenticate(email, password)
             return Response(
                 {"id": user.id, "email": user.email}, status=status.HTTP_200_OK
             )
+        except TooManyAttempts as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(e.retry_after)},
+            )
         except Exception as e:
+            count_failed_login(request, email)
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class UserListView(APIView):
+    # liste tous les emails : réservée aux comptes staff de Django
+    permission_classes = [IsAdminUser]
+    default_limit = 50
+    max_limit = 500
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return Response(
+                {"error": "limit doit être un entier"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = min(max(limit, 1), self.max_limit)
+        try:
+            users, next_cursor = get_service().list_users(
+                limit, request.query_params.get("cursor")
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {
+                "results": [
+                    {
+                        "id": user.id,
+                        "email": user.email,
+                        "is_active": user.is_active,
+                        "created_at": user.created_at,
+                    }
+                    for user in users
+                ],
+                "next_cursor": next_cursor,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+# ---------- Vues asynchrones (ASGI) ----------
+# Même contrat que RegisterUserView / AuthenticateUserView. DRF ne gère pas
+# les handlers async : vues Django simples, sans session donc sans CSRF.
+def _json_body(request) -> dict:
+    try:
+        data = (
+            orjson.loads(request.body or b"{}")
+            if orjson
+            else json.loads(request.body or b"{}")
+        )
+    except ValueError:  # orjson.JSONDecodeError en hérite
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _json_response(data: dict, status_code: int) -> HttpResponse:
+    content = orjson.dumps(data) if orjson else json.dumps(data).encode()
+    return HttpResponse(content, status=status_code, content_type="application/json")
+
+
+def _too_many_attempts(e: TooManyAttempts) -> HttpResponse:
+    response = _json_response({"error": str(e)}, status.HTTP_429_TOO_MANY_REQUESTS)
+    response["Retry-After"] = str(e.retry_after)
+    return response
+
+
+# ---------- Chemin rapide (WSGI) ----------
+# Même contrat JSON que RegisterUserView / AuthenticateUserView sans la
+# négociation, les parsers et les renderers de DRF. Servies directement par
+# account.middleware.FastPathMiddleware, qui court-circuite les middlewares
+# suivants (sessions, CSRF, auth, messages).
+@csrf_exempt
+def fast_register(request):
+    if request.method != "POST":
+        return _json_response({"error": "Méthode non autorisée"}, 405)
+    data = _json_body(request)
+    cmd = RegisterUserCommand(email=data.get("email"), password=data.get("password"))
+    try:
+        user = get_service().register(cmd)
+    except Exception as e:
+        return _json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+    return _json_response({"id": user.id, "email": user.email}, status.HTTP_201_CREATED)
+
+
+@csrf_exempt
+def fast_login(request):
+    if request.method != "POST":
+        return _json_response({"error": "Méthode non autorisée"}, 405)
+    data = _json_body(request)
+    try:
+        check_throttle(request, data.get("email"))
+        user = get_service().authenticate(data.get("email"), data.get("password"))
+    except TooManyAttempts as e:
+        return _too_many_attempts(e)
+    except Exception as e:
+        count_failed_login(request, data.get("email"))
+        return _json_response({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+    return _json_response({"id": user.id, "email": user.email}, status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncRegisterUserView(View):
+    async def post(self, request):
+        data = _json_body(request)
+        cmd = RegisterUserCommand(
+            email=data.get("email"), password=data.get("password")
+        )
+        try:
+            user = await async_service.register(cmd)
+            return JsonResponse(
+                {"id": user.id, "email": user.email}, status=status.HTTP_201_CREATED
+            )
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncAuthenticateUserView(View):
+    async def post(self, request):
+        data = _json_body(request)
+        try:
+            check_throttle(request, data.get("email"))
+            user = await async_service.authenticate(
+                data.get("email"), data.get("password")
+            )
+            return JsonResponse(
+                {"id": user.id, "email": user.email}, status=status.HTTP_200_OK
+            )
+        except TooManyAttempts as e:
+            return _too_many_attempts(e)
+        except Exception as e:
+            count_failed_login(request, data.get("email"))
+            return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,106 @@
+"""
+Benchmarks hors-ligne du POC.
+
+Chaque module s'exécute depuis `src/` :
+
+    python -m benchmarks.repository
+"""
+
+import contextlib
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable, Iterator
+
+
+def per_call(fn: Callable[[], object], number: int = 10_000, repeat: int = 5) -> float:
+    """Meilleur temps moyen par appel (en secondes) sur `repeat` séries."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def print_table(title: str, rows: list[tuple], headers: tuple) -> None:
+    print(f"\n{title}")
+    widths = [
+        max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)
+    ]
+    line = "  ".join(str(h).ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print("-" * len(line))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+@contextlib.contextmanager
+def django_database(on_disk: bool = False) -> Iterator[None]:
+    """
+    Configure Django et crée une base de test jetable (comme pytest-django),
+    sur le moteur défini dans les settings : SQLite par défaut.
+
+    `on_disk` place la base SQLite dans un fichier temporaire : la base en
+    mémoire partagée verrouille ses tables dès que plusieurs threads écrivent.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "interface_django.settings")
+    import django
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    django.setup()
+    setup_test_environment()
+    tmpdir = None
+    if on_disk and connection.vendor == "sqlite":
+        tmpdir = tempfile.mkdtemp()
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(tmpdir, "bench.db")
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def wsgi_request(
+    app, method: str, path: str, body: bytes = b"", query: str = "", **extra
+):
+    """
+    Appelle une application WSGI comme le ferait un serveur : contrairement
+    au client de test, les signaux request_started/finished ferment ou
+    recyclent les connexions selon CONN_MAX_AGE. `extra` complète l'environ
+    WSGI (ex. HTTP_COOKIE).
+    """
+    import io
+
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "testserver",
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.url_scheme": "http",
+        "wsgi.version": (1, 0),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        **extra,
+    }
+    status = []
+    chunks = app(environ, lambda s, headers, exc_info=None: status.append(s))
+    try:
+        content = b"".join(chunks)
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+    return int(status[0].split()[0]), content
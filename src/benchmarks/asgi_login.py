@@ -0,0 +1,85 @@
+"""
+Débit de logins concurrents : vues DRF synchrones (un thread par requête,
+comme sous WSGI) contre vues asynchrones (boucle d'événements ASGI, hachage
+déporté dans un pool).
+
+    python -m benchmarks.asgi_login [--concurrency N] [--iterations N]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import django_database, print_table
+
+LOGINS_PER_WORKER = 5
+
+
+def run(concurrency: int = 8, iterations: int = 100_000) -> dict:
+    import asyncio
+
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient, Client
+
+    from account import views
+    from users.adapters.hashers import build_engine
+    from users.core.commands import RegisterUserCommand
+
+    hasher = build_engine({"PBKDF2_ITERATIONS": iterations})
+    views.hasher = hasher
+    views.async_service.hasher = hasher
+    emails = [f"load{i}@example.com" for i in range(concurrency)]
+    views.get_service().register_many(
+        RegisterUserCommand(email=email, password="Password123@") for email in emails
+    )
+    requests = [
+        {"email": email, "password": "Password123@"}
+        for email in emails * LOGINS_PER_WORKER
+    ]
+
+    def sync_login(payload):
+        response = Client().post("/account/login/", payload, "application/json")
+        assert response.status_code == 200
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        list(pool.map(sync_login, requests))
+        wsgi = len(requests) / (time.perf_counter() - start)
+
+    @async_to_sync
+    async def async_logins():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login(payload):
+            async with semaphore:
+                response = await client.post(
+                    "/account/async/login/", payload, "application/json"
+                )
+                assert response.status_code == 200
+
+        await asyncio.gather(*(login(payload) for payload in requests))
+
+    start = time.perf_counter()
+    async_logins()
+    asgi = len(requests) / (time.perf_counter() - start)
+
+    return {"wsgi_logins_per_s": wsgi, "asgi_logins_per_s": asgi}
+
+
+def main(argv: list[str]) -> None:
+    def option(name, default):
+        return int(argv[argv.index(name) + 1]) if name in argv else default
+
+    concurrency = option("--concurrency", 8)
+    with django_database():
+        results = run(concurrency, option("--iterations", 100_000))
+    print_table(
+        f"Logins concurrents ({concurrency} en parallèle)",
+        [tuple(f"{v:.1f}" for v in results.values())],
+        tuple(results),
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,88 @@
+"""
+Inscriptions concurrentes sur des emails qui se recouvrent : exists() puis
+save() (deux requêtes, sujet aux courses) contre create_if_absent (une
+requête INSERT ... ON CONFLICT DO NOTHING RETURNING).
+
+    python -m benchmarks.concurrent_register [--threads N] [--emails N]
+
+Résultat attendu : exactement un utilisateur créé par email, aucune erreur
+d'intégrité, et une latence par inscription environ divisée par deux.
+Sur SQLite les écritures sont sérialisées ; PostgreSQL est plus représentatif.
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import django_database, print_table
+
+ATTEMPTS_PER_EMAIL = 4
+
+
+def run(threads: int = 8, emails: int = 200) -> dict:
+    from django.db import IntegrityError, close_old_connections
+
+    from account.models import UserModel
+    from users.adapters.django_repository import DjangoUserRepository
+    from users.core.models import User
+
+    repo = DjangoUserRepository()
+
+    def exists_then_save(email):
+        if repo.exists(email):
+            return "exists"
+        try:
+            repo.save(User(email=email, password="h"))
+        except IntegrityError:
+            return "integrity_error"
+        return "created"
+
+    def create_if_absent(email):
+        created = repo.create_if_absent(User(email=email, password="h"))
+        return "created" if created else "exists"
+
+    results = {}
+    for name, strategy in (
+        ("exists_then_save", exists_then_save),
+        ("create_if_absent", create_if_absent),
+    ):
+        attempts = [
+            f"{name}{i}@example.com" for i in range(emails)
+        ] * ATTEMPTS_PER_EMAIL
+
+        def attempt(email):
+            try:
+                return strategy(email)
+            finally:
+                close_old_connections()
+
+        with ThreadPoolExecutor(threads) as pool:
+            start = time.perf_counter()
+            outcomes = list(pool.map(attempt, attempts))
+            elapsed = time.perf_counter() - start
+
+        results[name] = {
+            "created": outcomes.count("created"),
+            "rows": UserModel.objects.filter(email__startswith=name).count(),
+            "integrity_errors": outcomes.count("integrity_error"),
+            "us_per_attempt": elapsed / len(attempts) * 1e6,
+        }
+    return results
+
+
+def main(argv: list[str]) -> None:
+    def option(name, default):
+        return int(argv[argv.index(name) + 1]) if name in argv else default
+
+    with django_database(on_disk=True):
+        results = run(option("--threads", 8), option("--emails", 200))
+    headers = ("stratégie", *next(iter(results.values())))
+    rows = [
+        (name, *(f"{v:.0f}" for v in values.values()))
+        for name, values in results.items()
+    ]
+    print_table("Inscriptions concurrentes", rows, headers)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
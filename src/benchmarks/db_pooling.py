@@ -0,0 +1,94 @@
+"""
+Requêtes/s avec et sans réutilisation des connexions, sur une vraie base.
+
+    DB_ENGINE=postgresql DATABASE_URL=postgresql://... python -m benchmarks.db_pooling
+
+Chaque profil tourne dans un sous-process (les settings sont figés au
+démarrage de Django) :
+  - new_connection : CONN_MAX_AGE=0, une connexion par requête ;
+  - persistent     : CONN_MAX_AGE=60, une connexion gardée par thread ;
+  - pool           : pool psycopg (DB_POOL=1, nécessite psycopg[pool]).
+
+Les requêtes passent par le handler WSGI réel (voir wsgi_request) sur
+GET /account/users/ (session d'un compte staff), un endpoint dominé par la
+base. Sans DB_ENGINE, le benchmark tourne sur SQLite, où ouvrir une
+connexion coûte peu.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import django_database, print_table, wsgi_request
+
+PROFILES = {
+    "new_connection": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "0"},
+    "persistent": {"DB_CONN_MAX_AGE": "60", "DB_POOL": "0"},
+    "pool": {"DB_POOL": "1"},
+}
+
+
+def measure(threads: int, requests: int) -> float:
+    from django.contrib.auth import get_user_model
+    from django.core.wsgi import get_wsgi_application
+    from django.test import Client
+
+    from account.models import UserModel
+
+    UserModel.objects.bulk_create(
+        UserModel(email=f"pool{i}@example.com", password="h") for i in range(100)
+    )
+    app = get_wsgi_application()
+    # la liste est réservée au staff
+    client = Client()
+    client.force_login(get_user_model().objects.create_user("bench", is_staff=True))
+    cookie = client.cookies.output(header="", sep=";").strip()
+
+    def call(_):
+        status, _ = wsgi_request(
+            app, "GET", "/account/users/", query="limit=10", HTTP_COOKIE=cookie
+        )
+        assert status == 200
+
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(call, range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def run(threads: int = 8, requests: int = 2_000) -> dict:
+    results = {}
+    for name, env in PROFILES.items():
+        if name == "pool" and os.environ.get("DB_ENGINE") != "postgresql":
+            continue
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.db_pooling", "--child"],
+            env={**os.environ, **env, "BENCH_ARGS": f"{threads} {requests}"},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results[name] = json.loads(output.splitlines()[-1])
+    return results
+
+
+def main(argv: list[str]) -> None:
+    if "--child" in argv:
+        threads, requests = map(int, os.environ["BENCH_ARGS"].split())
+        with django_database(on_disk=True):
+            print(json.dumps(measure(threads, requests)))
+        return
+
+    results = run()
+    print_table(
+        "GET /account/users/ (requêtes/s)",
+        [(name, f"{rps:.0f}") for name, rps in results.items()],
+        ("profil", "req/s"),
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
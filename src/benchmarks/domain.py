@@ -0,0 +1,85 @@
+"""
+Coût de construction et mémoire par User : ancien modèle (avec __dict__,
+`seen` inutilisé et uuid4 écrasé à l'hydratation) contre le modèle à
+__slots__ et son constructeur d'hydratation.
+
+    python -m benchmarks.domain [nombre d'utilisateurs]
+"""
+
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from benchmarks import per_call, print_table
+from users.core.models import User
+
+NOW = datetime(2025, 1, 1)
+USER_ID = str(uuid.uuid4())
+
+
+class LegacyUser:
+    """Reproduction du User d'origine, pour comparaison."""
+
+    def __init__(self, email, password="x", is_active=True, created_at=None):
+        self.id = str(uuid.uuid4())
+        self.password = password
+        self._email = email
+        self.is_active = is_active
+        self.created_at = created_at or datetime.utcnow()
+        self.seen = set()
+
+
+def legacy_hydrate():
+    user = LegacyUser("a@example.com", "hash", True, NOW)
+    user.id = USER_ID
+    return user
+
+
+def slots_init():
+    return User("a@example.com", "hash", True, NOW)
+
+
+def slots_hydrate():
+    return User.hydrate(USER_ID, "a@example.com", "hash", True, NOW)
+
+
+CASES = {
+    "legacy (init + id)": legacy_hydrate,
+    "slots __init__": slots_init,
+    "slots hydrate": slots_hydrate,
+}
+
+
+def bytes_per_user(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    users = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    # la liste elle-même n'est pas un coût par User
+    return (size - sys.getsizeof(users)) / count
+
+
+def run(count: int = 100_000) -> dict:
+    return {
+        name: {
+            "ns_per_user": per_call(factory) * 1e9,
+            "bytes_per_user": bytes_per_user(factory, count),
+        }
+        for name, factory in CASES.items()
+    }
+
+
+def main(argv: list[str]) -> None:
+    results = run(int(argv[0]) if argv else 100_000)
+    rows = [
+        (name, f"{r['ns_per_user']:.0f}", f"{r['bytes_per_user']:.0f}")
+        for name, r in results.items()
+    ]
+    print_table("Construction d'un User", rows, ("cas", "ns/user", "octets/user"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,60 @@
+"""
+Login sur un email inconnu : lecture de la projection contre réponse du
+filtre de Bloom, plus le coût de construction et de relecture du filtre.
+
+    python -m benchmarks.email_filter [nombre d'utilisateurs]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import django_database, per_call, print_table
+from benchmarks.repository import fill_database
+
+
+def run(size: int = 100_000) -> tuple:
+    from users.adapters.django_repository import DjangoUserRepository
+    from users.adapters.email_filter import EmailFilterRepository
+
+    fill_database(0, size)
+    inner = DjangoUserRepository()
+    path = os.path.join(tempfile.mkdtemp(), "emails.bloom")
+    repo = EmailFilterRepository(inner, capacity=size, path=path, refresh_interval=None)
+
+    started = time.perf_counter()
+    repo.bloom  # parcours complet puis écriture du fichier
+    build = time.perf_counter() - started
+    reloaded = EmailFilterRepository(inner, capacity=size, path=path)
+    # base remplie à l'instant : sans cela la marge de relecture couvrirait
+    # toutes les lignes
+    reloaded.overlap = 0
+    started = time.perf_counter()
+    reloaded.bloom
+    reload = time.perf_counter() - started
+
+    unknown = iter(range(10**9))
+    return {
+        "get_login inconnu (projection)": per_call(
+            lambda: inner.get_login(f"ghost{next(unknown)}@example.com"), 2_000, 3
+        ),
+        "get_login inconnu (filtre)": per_call(
+            lambda: repo.get_login(f"ghost{next(unknown)}@example.com"), 2_000, 3
+        ),
+        "construction (parcours complet)": build,
+        "démarrage depuis le fichier": reload,
+    }, repo.bloom.nbytes
+
+
+def main(argv: list[str]) -> None:
+    size = int(argv[0]) if argv else 100_000
+    with django_database():
+        results, nbytes = run(size)
+    rows = [(name, f"{value * 1e3:.3f} ms") for name, value in results.items()]
+    rows.append(("taille du filtre", f"{nbytes / 1024:.0f} KiB"))
+    print_table(f"Emails inconnus ({size} utilisateurs)", rows, ("mesure", "valeur"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,80 @@
+"""
+Register/login par la pile WSGI complète : vues DRF contre le chemin rapide
+(account/fast/*, FastPathMiddleware). Latence et mémoire allouée (pic
+tracemalloc) par requête, hasher peu coûteux pour isoler le framework.
+
+    python -m benchmarks.fast_path [nombre de requêtes]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks import django_database, print_table, wsgi_request
+from benchmarks.service import HASHING, PASSWORD
+
+ROUTES = {"drf": "/account/", "fast": "/account/fast/"}
+
+
+def measure(
+    app, path: str, bodies: list[bytes], traced: list[bytes], expected: int
+) -> dict:
+    start = time.perf_counter()
+    for body in bodies:
+        status, content = wsgi_request(app, "POST", path, body)
+        assert status == expected, content
+    latency = (time.perf_counter() - start) / len(bodies)
+
+    # pic d'allocation d'une requête, mesuré à part : tracemalloc ralentit tout
+    peaks = []
+    tracemalloc.start()
+    for body in traced:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        status, content = wsgi_request(app, "POST", path, body)
+        assert status == expected, content
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return {"latency": latency, "peak_bytes": sum(peaks) / len(peaks)}
+
+
+def run(requests: int = 500) -> dict:
+    from django.core.wsgi import get_wsgi_application
+
+    from account import views
+    from users.adapters.hashers import build_engine
+
+    views.hasher = build_engine(HASHING)
+    app = get_wsgi_application()
+    results = {}
+    for name, prefix in ROUTES.items():
+        bodies = [
+            json.dumps(
+                {"email": f"{name}{i}@example.com", "password": PASSWORD}
+            ).encode()
+            for i in range(requests + 50)
+        ]
+        # emails distincts pour les inscriptions tracées par tracemalloc
+        results[f"{name} register"] = measure(
+            app, f"{prefix}register/", bodies[:requests], bodies[requests:], 201
+        )
+        results[f"{name} login"] = measure(
+            app, f"{prefix}login/", bodies[:requests], bodies[:50], 200
+        )
+    return results
+
+
+def main(argv: list[str]) -> None:
+    requests = int(argv[0]) if argv else 500
+    with django_database():
+        results = run(requests)
+    rows = [
+        (name, f"{r['latency'] * 1e6:.0f} us", f"{r['peak_bytes'] / 1024:.1f} KiB")
+        for name, r in results.items()
+    ]
+    print_table("Register / login par WSGI", rows, ("chemin", "latence", "pic mémoire"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
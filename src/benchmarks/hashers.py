@@ -0,0 +1,75 @@
+"""
+Coût du hachage au login : logins/s par cœur pour chaque réglage, à comparer
+au SLO de latence (un login = une vérification).
+
+    python -m benchmarks.hashers [--threads N]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import print_table
+from users.adapters.hashers import (
+    PasswordHashingEngine,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+SETTINGS = [
+    PBKDF2PasswordHasher(iterations=100_000),
+    PBKDF2PasswordHasher(iterations=300_000),
+    PBKDF2PasswordHasher(iterations=600_000),
+    ScryptPasswordHasher(n=2**14, r=8, p=1),
+    ScryptPasswordHasher(n=2**15, r=8, p=1),
+]
+
+
+def label(hasher) -> str:
+    if isinstance(hasher, PBKDF2PasswordHasher):
+        return f"pbkdf2 {hasher.iterations}"
+    return f"scrypt {hasher.params}"
+
+
+def run(threads: int = 1, logins: int = 8) -> dict:
+    results = {}
+    for hasher in SETTINGS:
+        engine = PasswordHashingEngine([hasher])
+        encoded = engine.hash("Password123@")
+
+        start = time.perf_counter()
+        for _ in range(logins):
+            engine.verify("Password123@", encoded)
+        single = (time.perf_counter() - start) / logins
+
+        with ThreadPoolExecutor(threads) as pool:
+            start = time.perf_counter()
+            list(
+                pool.map(
+                    lambda _: engine.verify("Password123@", encoded),
+                    range(logins * threads),
+                )
+            )
+            pooled = logins * threads / (time.perf_counter() - start)
+
+        results[label(hasher)] = {
+            "latency_ms": single * 1e3,
+            "logins_per_s_per_core": 1 / single,
+            f"logins_per_s_{threads}_threads": pooled,
+        }
+    return results
+
+
+def main(argv: list[str]) -> None:
+    threads = int(argv[argv.index("--threads") + 1]) if "--threads" in argv else 1
+    results = run(threads)
+    headers = ("réglage", *next(iter(results.values())).keys())
+    rows = [
+        (name, *(f"{v:.1f}" for v in values.values()))
+        for name, values in results.items()
+    ]
+    print_table("Vérification de mot de passe", rows, headers)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,58 @@
+"""
+Requêtes de bout en bout à travers les vues DRF (client de test Django :
+middlewares, parsing, sérialisation), hasher peu coûteux.
+
+    python -m benchmarks.http [nombre de requêtes]
+"""
+
+import sys
+import time
+
+from benchmarks import django_database, print_table
+from benchmarks.service import HASHING, PASSWORD
+
+
+def run(requests: int = 300) -> dict:
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+
+    from account import views
+    from users.adapters.hashers import build_engine
+
+    views.hasher = build_engine(HASHING)
+    client = Client()
+    emails = [f"http{i}@example.com" for i in range(requests)]
+
+    def timed(path: str, expected: int) -> float:
+        start = time.perf_counter()
+        for email in emails:
+            response = client.post(
+                path, {"email": email, "password": PASSWORD}, "application/json"
+            )
+            assert response.status_code == expected, response.content
+        return (time.perf_counter() - start) / requests
+
+    results = {
+        "register": timed("/account/register/", 201),
+        "login": timed("/account/login/", 200),
+    }
+    # la liste est réservée au staff
+    client.force_login(get_user_model().objects.create_user("bench", is_staff=True))
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get("/account/users/", {"limit": 50})
+        assert response.status_code == 200, response.content
+    results["list_50"] = (time.perf_counter() - start) / requests
+    return results
+
+
+def main(argv: list[str]) -> None:
+    requests = int(argv[0]) if argv else 300
+    with django_database():
+        results = run(requests)
+    rows = [(name, f"{v * 1e6:.0f} us") for name, v in results.items()]
+    print_table("Vues DRF (par requête)", rows, ("endpoint", "latence"))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+"""
+Lecture du login : UserModel complet (get_by_email, instanciation du modèle
+puis to_domain) contre la projection users_login lue en values_list
+(get_login). Latence et pic d'allocation par lecture.
+
+    python -m benchmarks.login_projection [nombre d'utilisateurs]
+"""
+
+import sys
+import tracemalloc
+
+from benchmarks import django_database, per_call, print_table
+from benchmarks.repository import fill_database
+
+
+def peak_bytes(fn, number: int = 200) -> float:
+    peaks = []
+    tracemalloc.start()
+    for _ in range(number):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+
+def run(size: int = 10_000) -> dict:
+    from django.db import connection
+
+    from users.adapters.django_repository import DjangoUserRepository
+
+    fill_database(0, size)
+    # fill_database écrit UserModel seul : projection construite en une requête
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO users_login (user_id, email_normalized, email, password,"
+            " is_active) SELECT id, email_normalized, email, password, is_active"
+            " FROM users"
+        )
+    repo = DjangoUserRepository()
+    email = f"user{size // 2}@example.com"
+    cases = {
+        "get_by_email (UserModel)": lambda: repo.get_by_email(email),
+        "get_login (projection)": lambda: repo.get_login(email),
+    }
+    return {
+        name: {"latency": per_call(fn, 2_000, 3), "peak_bytes": peak_bytes(fn)}
+        for name, fn in cases.items()
+    }
+
+
+def main(argv: list[str]) -> None:
+    size = int(argv[0]) if argv else 10_000
+    with django_database():
+        results = run(size)
+    rows = [
+        (name, f"{r['latency'] * 1e6:.0f} us", f"{r['peak_bytes'] / 1024:.1f} KiB")
+        for name, r in results.items()
+    ]
+    print_table(
+        f"Lecture du login ({size} utilisateurs)",
+        rows,
+        ("chemin", "latence", "pic mémoire"),
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
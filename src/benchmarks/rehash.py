@@ -0,0 +1,65 @@
+"""
+Débit de manage.py rehash_passwords selon le nombre de process : hash
+réécrits par seconde et efficacité par rapport à un process (1.0 = passage
+à l'échelle linéaire).
+
+    python -m benchmarks.rehash [utilisateurs] [itérations PBKDF2]
+"""
+
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks import django_database, print_table
+from benchmarks.repository import fill_database
+
+
+def worker_counts() -> list:
+    cores = os.cpu_count() or 1
+    counts, n = [], 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores]
+
+
+def run(size: int = 2_000, iterations: int = 20_000) -> dict:
+    from account.models import UserModel
+    from users.adapters.django_repository import DjangoUserRepository
+    from users.adapters.hashers import PBKDF2PasswordHasher
+    from users.services.rehash import rehash_legacy_passwords
+
+    fill_database(0, size)
+    legacy = hashlib.sha256(b"Password123@").hexdigest()
+    kdf = PBKDF2PasswordHasher(iterations)
+    results = {}
+    for workers in worker_counts():
+        UserModel.objects.update(password=legacy)
+        with ProcessPoolExecutor(workers) as executor:
+            progress = rehash_legacy_passwords(
+                DjangoUserRepository(), kdf, executor, max_in_flight=2 * workers
+            )
+        results[workers] = progress.rows_per_second
+    return results
+
+
+def main(argv: list[str]) -> None:
+    size = int(argv[0]) if argv else 2_000
+    iterations = int(argv[1]) if len(argv) > 1 else 20_000
+    with django_database():
+        results = run(size, iterations)
+    single = results[1]
+    rows = [
+        (workers, f"{rate:.0f}", f"{rate / (single * workers):.2f}")
+        for workers, rate in results.items()
+    ]
+    print_table(
+        f"Réécriture de {size} hash (PBKDF2 {iterations} itérations)",
+        rows,
+        ("process", "hash/s", "efficacité"),
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,92 @@
+"""
+Lookups InMemoryRepository et DjangoUserRepository : le coût par appel doit
+rester plat quand le nombre d'utilisateurs augmente (index en mémoire,
+index unique sur email_normalized côté base).
+
+    python -m benchmarks.repository [--django] [taille ...]
+"""
+
+import sys
+
+from benchmarks import django_database, per_call, print_table
+from users.adapters.repository import InMemoryRepository
+from users.core.models import User
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def build_repository(size: int) -> InMemoryRepository:
+    repo = InMemoryRepository(secondary_indexes={"is_active": lambda u: u.is_active})
+    for i in range(size):
+        repo.save(User(email=f"user{i}@example.com"))
+    return repo
+
+
+def run(sizes=DEFAULT_SIZES) -> dict:
+    results = {}
+    for size in sizes:
+        repo = build_repository(size)
+        target = repo.get_by_email(f"user{size - 1}@example.com")
+        results[size] = {
+            "exists_hit": per_call(lambda: repo.exists(target.email)),
+            "exists_miss": per_call(lambda: repo.exists("absent@example.com")),
+            "get_by_email": per_call(lambda: repo.get_by_email(target.email)),
+            "get_by_id": per_call(lambda: repo.get_by_id(target.id)),
+        }
+    return results
+
+
+def fill_database(start: int, stop: int, chunk: int = 10_000) -> None:
+    """Insère les utilisateurs user{start}..user{stop - 1} par lots."""
+    from account.models import UserModel
+
+    for low in range(start, stop, chunk):
+        UserModel.objects.bulk_create(
+            UserModel(email=f"user{i}@example.com", password="h")
+            for i in range(low, min(low + chunk, stop))
+        )
+
+
+def run_django(sizes=DEFAULT_SIZES) -> dict:
+    """À appeler dans `django_database()` ; la table grandit d'une taille à l'autre."""
+    from users.adapters.django_repository import DjangoUserRepository
+
+    repo = DjangoUserRepository()
+    results = {}
+    loaded = 0
+    for size in sorted(sizes):
+        fill_database(loaded, size)
+        loaded = size
+        target = repo.get_by_email(f"user{size - 1}@example.com")
+        results[size] = {
+            "exists_hit": per_call(lambda: repo.exists(target.email), 1_000, 3),
+            "exists_miss": per_call(
+                lambda: repo.exists("absent@example.com"), 1_000, 3
+            ),
+            "get_by_email": per_call(lambda: repo.get_by_email(target.email), 1_000, 3),
+            "get_by_id": per_call(lambda: repo.get_by_id(target.id), 1_000, 3),
+        }
+    return results
+
+
+def print_results(title: str, results: dict, unit: float, suffix: str) -> None:
+    rows = [
+        (size, *(f"{v * unit:.0f} {suffix}" for v in timings.values()))
+        for size, timings in results.items()
+    ]
+    headers = ("users", *next(iter(results.values())).keys())
+    print_table(title, rows, headers)
+
+
+def main(argv: list[str]) -> None:
+    django = "--django" in argv
+    sizes = tuple(int(a) for a in argv if a != "--django") or DEFAULT_SIZES
+    print_results("InMemoryRepository lookups (par appel)", run(sizes), 1e9, "ns")
+    if django:
+        with django_database():
+            results = run_django(sizes)
+        print_results("DjangoUserRepository lookups (par appel)", results, 1e6, "us")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+"""
+Débit des cas d'usage UserService.register / authenticate, en mémoire et
+sur la base Django. Le hasher est volontairement peu coûteux : on mesure
+le chemin autour du hachage, dont le coût est suivi par benchmarks.hashers.
+
+    python -m benchmarks.service [nombre d'appels]
+"""
+
+import itertools
+import sys
+import time
+
+from benchmarks import django_database, print_table
+from users.adapters.hashers import build_engine
+from users.core.commands import RegisterUserCommand
+
+HASHING = {"PBKDF2_ITERATIONS": 1_000}
+PASSWORD = "Password123@"
+
+
+def measure(service, calls: int, prefix: str) -> dict:
+    counter = itertools.count()
+    emails = [f"{prefix}{next(counter)}@example.com" for _ in range(calls)]
+
+    start = time.perf_counter()
+    for email in emails:
+        service.register(RegisterUserCommand(email=email, password=PASSWORD))
+    register = (time.perf_counter() - start) / calls
+
+    start = time.perf_counter()
+    for email in emails:
+        service.authenticate(email, PASSWORD)
+    authenticate = (time.perf_counter() - start) / calls
+
+    return {"register": register, "authenticate": authenticate}
+
+
+def run(calls: int = 500, django: bool = True) -> dict:
+    # importés ici : unit_of_work charge les modèles, Django doit être configuré
+    from users.services.unit_of_work import DjangoUnitOfWork, InMemoryUnitOfWork
+    from users.services.user_services import UserService
+
+    hasher = build_engine(HASHING)
+    results = {
+        "in_memory": measure(UserService(InMemoryUnitOfWork(), hasher), calls, "mem")
+    }
+    if django:
+        service = UserService(DjangoUnitOfWork(), hasher)
+        results["django"] = measure(service, calls, "db")
+    return results
+
+
+def main(argv: list[str]) -> None:
+    calls = int(argv[0]) if argv else 500
+    with django_database():
+        results = run(calls)
+    rows = [
+        (name, *(f"{v * 1e6:.0f} us ({1 / v:.0f}/s)" for v in timings.values()))
+        for name, timings in results.items()
+    ]
+    print_table(
+        f"UserService, hasher PBKDF2 {HASHING['PBKDF2_ITERATIONS']} itérations",
+        rows,
+        ("uow", "register", "authenticate"),
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,72 @@
+"""
+Coût du routage par shard sur N bases SQLite en mémoire, face à une seule
+base : lecture routée par email (une requête), lecture par id (tous les
+shards au pire) et parcours fusionné des flux keyset.
+
+    python -m benchmarks.sharding [utilisateurs] [shards]
+"""
+
+import os
+import sys
+
+from benchmarks import django_database, per_call, print_table
+
+
+def run(size: int, shards: int) -> dict:
+    from django.db import connections
+
+    from users.adapters.django_repository import DjangoUserRepository
+    from users.adapters.sharding import ShardedUserRepository
+    from users.core.models import User
+
+    aliases = [f"users_{i}" for i in range(shards)]
+    for alias in aliases:
+        connections[alias].creation.create_test_db(verbosity=0, keepdb=False)
+
+    single = DjangoUserRepository(batch_size=1000)
+    sharded = ShardedUserRepository(aliases, batch_size=1000)
+    for repo in (single, sharded):
+        for low in range(0, size, 10_000):
+            repo.save_many(
+                User(email=f"user{i}@example.com", password="h")
+                for i in range(low, min(low + 10_000, size))
+            )
+
+    email = f"user{size // 2}@example.com"
+    results = {}
+    for name, repo in (("1 base", single), (f"{shards} shards", sharded)):
+        user = repo.get_by_email(email)
+        results[name] = {
+            "get_login": per_call(lambda: repo.get_login(email), 1_000, 3),
+            "get_by_id": per_call(lambda: repo.get_by_id(user.id), 1_000, 3),
+            "iter_users": per_call(lambda: sum(1 for _ in repo.iter_users()), 1, 3)
+            / size,
+        }
+    return results
+
+
+def main(argv: list[str]) -> None:
+    size = int(argv[0]) if argv else 20_000
+    shards = int(argv[1]) if len(argv) > 1 else 4
+    # déclare les shards avant la lecture des settings
+    os.environ["USERS_SHARDS"] = str(shards)
+    with django_database():
+        results = run(size, shards)
+    rows = [
+        (
+            name,
+            f"{r['get_login'] * 1e6:.0f} us",
+            f"{r['get_by_id'] * 1e6:.0f} us",
+            f"{r['iter_users'] * 1e6:.1f} us",
+        )
+        for name, r in results.items()
+    ]
+    print_table(
+        f"Shards ({size} utilisateurs)",
+        rows,
+        ("stockage", "get_login", "get_by_id", "iter_users / ligne"),
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
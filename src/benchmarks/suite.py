@@ -0,0 +1,143 @@
+"""
+Suite complète : domaine, repositories, service et vues HTTP, résultats en
+JSON (secondes par opération, plus petit = meilleur) et comparaison entre
+deux exécutions pour repérer les régressions.
+
+    python -m benchmarks.suite run [--sizes 1000 100000 1000000] [--output f.json]
+    python -m benchmarks.suite compare avant.json apres.json [--threshold 0.1]
+
+`compare` sort avec le code 1 si une mesure se dégrade au-delà du seuil.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from benchmarks import django_database, per_call, print_table
+from benchmarks import http, repository, service
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+def run_domain() -> dict:
+    from benchmarks.domain import NOW, USER_ID
+    from users.core.models import User
+    from users.core.value_object import Email, Password
+
+    return {
+        "user_init": per_call(lambda: User("a@example.com", "hash", True, NOW)),
+        "user_hydrate": per_call(
+            lambda: User.hydrate(USER_ID, "a@example.com", "hash", True, NOW)
+        ),
+        "email": per_call(lambda: Email("a@example.com")),
+        "password": per_call(lambda: Password("Password123@")),
+    }
+
+
+def flatten(prefix: str, results: dict) -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(name, value))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(sizes=DEFAULT_SIZES, calls: int = 500, requests: int = 300) -> dict:
+    results = flatten("domain", run_domain())
+    results.update(flatten("repository.in_memory", repository.run(sizes)))
+    with django_database():
+        # les vues partagent la base : service et HTTP avant de la remplir
+        results.update(flatten("service", service.run(calls)))
+        results.update(flatten("http", http.run(requests)))
+        results.update(flatten("repository.django", repository.run_django(sizes)))
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "sizes": list(sizes),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> list[tuple]:
+    """(mesure, avant, après, ratio, régression) pour les mesures communes."""
+    before, after = baseline["results"], current["results"]
+    rows = []
+    for name in sorted(before.keys() & after.keys()):
+        ratio = after[name] / before[name] if before[name] else float("inf")
+        rows.append((name, before[name], after[name], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--calls", type=int, default=500)
+    run_parser.add_argument("--requests", type=int, default=300)
+    run_parser.add_argument("--output", help="fichier JSON (sinon stdout)")
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run(tuple(args.sizes), args.calls, args.requests)
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(payload + "\n")
+        else:
+            print(payload)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    print_table(
+        f"Comparaison (seuil +{args.threshold:.0%})",
+        [
+            (
+                name,
+                f"{b * 1e6:.2f}",
+                f"{a * 1e6:.2f}",
+                f"{r:.2f}x",
+                "REGRESSION" if bad else "",
+            )
+            for name, b, a, r, bad in rows
+        ],
+        ("mesure", "avant (us)", "après (us)", "ratio", ""),
+    )
+    regressions = [row for row in rows if row[4]]
+    for missing in sorted(baseline["results"].keys() - current["results"].keys()):
+        print(f"absente de {args.current} : {missing}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
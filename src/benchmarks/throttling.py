@@ -0,0 +1,64 @@
+"""
+Coût d'un login échoué pour LoginThrottle (check puis failed, IP + email)
+par stockage, comparé à ce qu'il évite : une lecture en base et un hachage
+par tentative.
+
+    python -m benchmarks.throttling
+"""
+
+import itertools
+import sys
+
+from benchmarks import per_call, print_table
+from users.adapters.throttling import (
+    CacheWindowStore,
+    LocalWindowStore,
+    LoginThrottle,
+    RateLimit,
+    SketchWindowStore,
+)
+
+# limites hautes : on mesure le chemin accepté, le plus long
+RATE = RateLimit(10**9, 60)
+
+
+def stores():
+    from django.core.cache.backends.locmem import LocMemCache
+
+    cache = CacheWindowStore(LocMemCache("bench", {}))
+    return {
+        "local + sketch": (LocalWindowStore(), SketchWindowStore()),
+        "local + local": (LocalWindowStore(), LocalWindowStore()),
+        "cache locmem": (cache, cache),
+    }
+
+
+def run() -> dict:
+    results = {}
+    for name, (email_store, ip_store) in stores().items():
+        throttle = LoginThrottle(RATE, RATE, email_store, ip_store)
+        # 10 000 emails et 1 000 IP distincts, en boucle
+        keys = itertools.cycle(
+            (f"user{i}@example.com", f"10.0.{i % 1000 // 256}.{i % 256}")
+            for i in range(10_000)
+        )
+
+        def failed_login():
+            email, ip = next(keys)
+            throttle.check(email, ip)
+            throttle.failed(email, ip)
+
+        results[name] = per_call(failed_login, 20_000)
+    return results
+
+
+def main(argv: list[str]) -> None:
+    results = run()
+    rows = [(name, f"{v * 1e6:.2f} us") for name, v in results.items()]
+    print_table(
+        "LoginThrottle.check + failed (email + IP)", rows, ("stockage", "par appel")
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
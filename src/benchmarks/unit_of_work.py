@@ -0,0 +1,67 @@
+"""
+Latence d'écriture : une transaction par save() (autocommit) contre la unit
+of work transactionnelle qui regroupe les écritures au commit().
+
+    python -m benchmarks.unit_of_work [écritures par cas d'usage]
+
+Lancer avec les settings PostgreSQL (voir settings.py) pour mesurer le coût
+réel des commits ; SQLite en mémoire sous-estime fortement l'écart.
+"""
+
+import sys
+import time
+
+from benchmarks import django_database, print_table
+
+ROUNDS = 50
+
+
+def run(writes: int = 10) -> dict:
+    from account.models import UserModel
+    from users.adapters.django_repository import DjangoUserRepository
+    from users.core.models import User
+    from users.services.unit_of_work import DjangoUnitOfWork
+
+    def users(prefix, round_):
+        return [
+            User(email=f"{prefix}{round_}-{i}@example.com", password="h")
+            for i in range(writes)
+        ]
+
+    repo = DjangoUserRepository()
+    start = time.perf_counter()
+    for round_ in range(ROUNDS):
+        for user in users("auto", round_):
+            repo.save(user)
+    autocommit = (time.perf_counter() - start) / ROUNDS
+
+    uow = DjangoUnitOfWork()
+    start = time.perf_counter()
+    for round_ in range(ROUNDS):
+        with uow:
+            for user in users("uow", round_):
+                uow.users.save(user)
+            uow.commit()
+    batched = (time.perf_counter() - start) / ROUNDS
+
+    assert UserModel.objects.count() == 2 * ROUNDS * writes
+    return {
+        "autocommit_ms": autocommit * 1e3,
+        "unit_of_work_ms": batched * 1e3,
+        "speedup": autocommit / batched,
+    }
+
+
+def main(argv: list[str]) -> None:
+    writes = int(argv[0]) if argv else 10
+    with django_database():
+        results = run(writes)
+    print_table(
+        f"Cas d'usage à {writes} écritures (moyenne sur {ROUNDS})",
+        [tuple(f"{v:.2f}" for v in results.values())],
+        tuple(results),
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
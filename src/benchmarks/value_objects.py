@@ -0,0 +1,95 @@
+"""
+Validation des value objects : implémentations d'origine (motif recompilé
+à chaque appel, quatre re.search, parsing UUID complet) contre les motifs
+précompilés, et validation unitaire contre validate_many.
+
+    python -m benchmarks.value_objects
+"""
+
+import re
+import uuid
+from dataclasses import dataclass
+
+from benchmarks import per_call, print_table
+from users.core.value_object import Email, Password, UserID
+
+EMAIL = "someone.name+tag@example-domain.com"
+PASSWORD = "Password123@abc"
+USER_ID = str(uuid.uuid4())
+BATCH = [f"user{i}@example.com" for i in range(1_000)]
+
+
+# Reproductions des value objects d'origine, pour comparaison
+@dataclass(frozen=True)
+class LegacyEmail:
+    value: str
+
+    def __post_init__(self):
+        pattern = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
+        if re.match(pattern, self.value) is None:
+            raise ValueError(self.value)
+
+
+@dataclass(frozen=True)
+class LegacyPassword:
+    value: str
+
+    def __post_init__(self):
+        pwd = self.value
+        if not (
+            len(pwd) >= 8
+            and re.search(r"[A-Z]", pwd)
+            and re.search(r"[a-z]", pwd)
+            and re.search(r"\d", pwd)
+            and re.search(r"[!@#$%^&*(),.?\":{}|<>]", pwd)
+        ):
+            raise ValueError(pwd)
+
+
+@dataclass(frozen=True)
+class LegacyUserID:
+    value: str
+
+    def __post_init__(self):
+        uuid.UUID(self.value)
+
+
+def run() -> dict:
+    def legacy_batch():
+        for value in BATCH:
+            LegacyEmail(value)
+
+    return {
+        "email": (
+            per_call(lambda: LegacyEmail(EMAIL)),
+            per_call(lambda: Email(EMAIL)),
+        ),
+        "email (interned)": (
+            per_call(lambda: LegacyEmail(EMAIL)),
+            per_call(lambda: Email.of(EMAIL)),
+        ),
+        "password": (
+            per_call(lambda: LegacyPassword(PASSWORD)),
+            per_call(lambda: Password(PASSWORD)),
+        ),
+        "user_id": (
+            per_call(lambda: LegacyUserID(USER_ID)),
+            per_call(lambda: UserID(USER_ID)),
+        ),
+        "1000 emails, validate_many": (
+            per_call(legacy_batch, number=100),
+            per_call(lambda: Email.validate_many(BATCH), number=100),
+        ),
+    }
+
+
+def main() -> None:
+    rows = [
+        (name, f"{before * 1e9:.0f}", f"{after * 1e9:.0f}", f"x{before / after:.1f}")
+        for name, (before, after) in run().items()
+    ]
+    print_table("Validation (ns par appel)", rows, ("cas", "avant", "après", "gain"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from users.config import get_database_config, get_shard_databases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -31,6 +33,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # account/fast/* : sert register/login sans les middlewares qui suivent
+    "account.middleware.FastPathMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -62,11 +66,85 @@ WSGI_APPLICATION = "interface_django.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+# Configuration lue depuis l'environnement (users.config.get_database_config) :
+# SQLite en WAL par défaut, DB_ENGINE=postgresql pour PostgreSQL avec
+# connexions persistantes ou pool.
+DATABASES = {"default": get_database_config(BASE_DIR)}
+
+# Shards des utilisateurs (users.adapters.sharding), déclarés par
+# l'environnement (users.config.get_shard_databases) : USERS_SHARDS=N pour N
+# bases SQLite locales, USERS_SHARD_URLS pour PostgreSQL. Les utilisateurs
+# sont répartis selon l'email normalisé ; les autres tables restent dans
+# "default". Après un ajout de shard (toujours en fin de liste), renseigner
+# USERS_SHARDS_PREVIOUS avec l'ancienne liste le temps de
+# `manage.py rebalance_shards`.
+SHARD_DATABASES = get_shard_databases(BASE_DIR)
+DATABASES.update(SHARD_DATABASES)
+USERS_SHARDS = list(SHARD_DATABASES)
+USERS_SHARDS_PREVIOUS = None
+DATABASE_ROUTERS = ["account.routers.UserShardRouter"] if USERS_SHARDS else []
+
+
+# Cache en lecture des utilisateurs (users.adapters.caching_repository).
+# None le désactive. BACKEND est un alias de CACHES pour le niveau partagé,
+# ex. {"MAXSIZE": 10_000, "TTL": 60, "BACKEND": "default"}.
+USERS_CACHE = None
+
+
+# Filtre de Bloom des emails enregistrés (users.adapters.email_filter) : un
+# login sur un email inconnu ne touche pas la base. None le désactive, ex.
+# {"CAPACITY": 1_000_000, "ERROR_RATE": 0.01, "PATH": BASE_DIR / "emails.bloom",
+#  "REFRESH_INTERVAL": 5, "BACKEND": "default"}. PATH évite le parcours
+# complet au démarrage des workers (fichier écrit par
+# `manage.py build_email_filter`). BACKEND, alias de CACHES partagé entre
+# workers, leur fait voir aussitôt les inscriptions et changements d'email
+# des autres ; sinon, et pour les écritures qui contournent le filtre,
+# elles sont vues au plus tard après REFRESH_INTERVAL secondes.
+USERS_EMAIL_FILTER = None
+
+
+# Hachage des mots de passe (users.adapters.hashers.build_engine).
+# ALGORITHM ("pbkdf2_sha256" ou "scrypt") hache les nouveaux mots de passe ;
+# les hash produits avec d'autres réglages sont recalculés au login.
+# POOL ("thread" ou "process") et WORKERS déportent le calcul dans un pool.
+# python -m benchmarks.hashers aide à choisir le coût.
+USERS_PASSWORD_HASHING = {
+    "ALGORITHM": "pbkdf2_sha256",
+    "PBKDF2_ITERATIONS": 600_000,
+    "SCRYPT": (2**14, 8, 1),
+    "POOL": None,
+    "WORKERS": None,
+}
+
+
+# Mesures par étape (users.instrumentation) : en-tête Server-Timing sur
+# register/login et métriques Prometheus sur /account/metrics/.
+# Désactivé, le coût se limite à un test de booléen par appel.
+USERS_INSTRUMENTATION = False
+
+
+# Limitation des tentatives de login (users.adapters.throttling), vérifiée
+# avant la lecture en base et le hachage ; None la désactive.
+# EMAIL et IP : (échecs, fenêtre en secondes) ; les logins réussis ne sont
+# pas comptés. Sans BACKEND, compteurs
+# en mémoire du process : MAX_EMAILS emails au plus (LRU) et un count-min
+# sketch SKETCH = (largeur, profondeur) pour les IP. BACKEND est un alias de
+# CACHES pour partager les compteurs entre workers.
+USERS_LOGIN_THROTTLE = {
+    "EMAIL": (10, 60),
+    "IP": (300, 60),
+    "BACKEND": None,
+    "MAX_EMAILS": 100_000,
+    "SKETCH": (4096, 4),
+}
+
+
+# Handlers des événements de domaine (chemins d'import), appelés par le
+# worker `manage.py dispatch_events` à partir de l'outbox.
+USERS_EVENT_HANDLERS = {
+    "UserRegistered": ["users.services.event_handlers.log_event"],
+    "UserActivated": ["users.services.event_handlers.log_event"],
+    "UserDeactivated": ["users.services.event_handlers.log_event"],
 }
 
 
@@ -0,0 +1,95 @@
+"""
+Budgets de requêtes SQL et de temps par opération, en un seul endroit :
+toute hausse passe par une modification de ce fichier, donc par la revue.
+
+Les instructions de contrôle de transaction (BEGIN, SAVEPOINT, ...) ne sont
+pas comptées : elles dépendent de l'encapsulation des tests, pas du code.
+Les temps sont larges (machines de CI lentes) et n'attrapent que les
+régressions grossières ; les mesures fines sont dans benchmarks/.
+"""
+
+import contextlib
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+@dataclass(frozen=True)
+class Budget:
+    queries: int  # par lot pour les opérations découpées en lots
+    seconds: float = 0.5
+
+
+BUDGETS = {
+    # repository : une requête par lecture ; chaque écriture met aussi à jour
+    # la projection de login (une requête de plus, par lot pour les groupées)
+    "repository.get_by_email": Budget(1),
+    "repository.get_by_id": Budget(1),
+    "repository.get_login": Budget(1),
+    "repository.exists": Budget(1),
+    "repository.save": Budget(2),
+    "repository.update": Budget(2),
+    "repository.create_if_absent": Budget(2),
+    "repository.exists_many": Budget(1),
+    "repository.save_many": Budget(2),
+    "repository.iter_users": Budget(1),
+    "repository.iter_emails": Budget(1),
+    # par lot : sélection des ids + UPDATE users + UPDATE projection
+    "repository.set_active": Budget(3),
+    # unit of work : les écritures en attente partent en une requête groupée,
+    # plus une insertion dans l'outbox si les utilisateurs ont des événements
+    "uow.commit": Budget(2),
+    # manage.py rehash_passwords, par lot : lecture keyset, relecture
+    # verrouillée des hash, bulk_update des utilisateurs et de la projection
+    "rehash.chunk": Budget(4),
+    # cas d'usage (hasher de test peu coûteux)
+    # exists (avant le hachage) + insertion + projection + outbox
+    "service.register": Budget(4),
+    # exists_many + bulk_create + projection + outbox
+    "service.register_many": Budget(4),
+    "service.authenticate": Budget(1),  # projection de login seule
+    "service.authenticate.rehash": Budget(3),  # projection + UPDATE + projection
+    "service.list_users": Budget(1),
+    # email inconnu écarté par le filtre de Bloom (users.adapters.email_filter)
+    "service.authenticate.unknown_email": Budget(0),
+}
+
+_TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextlib.contextmanager
+def query_budget(
+    name: str,
+    batches: int = 1,
+    budget: Optional[Budget] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> Iterator[CaptureQueriesContext]:
+    """Échoue si le bloc dépasse le budget `name` (multiplié par `batches`)."""
+    budget = budget or BUDGETS[name]
+    allowed = budget.queries * batches
+    start = time.perf_counter()
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    elapsed = time.perf_counter() - start
+
+    statements = [
+        q["sql"]
+        for q in context.captured_queries
+        if not q["sql"].lstrip().upper().startswith(_TRANSACTION_CONTROL)
+    ]
+    if len(statements) > allowed:
+        raise QueryBudgetExceeded(
+            f"{name} : {len(statements)} requêtes pour un budget de {allowed}\n"
+            + "\n".join(f"  {i}. {sql}" for i, sql in enumerate(statements, 1))
+        )
+    if elapsed > budget.seconds:
+        raise QueryBudgetExceeded(
+            f"{name} : {elapsed:.3f}s pour un budget de {budget.seconds}s"
+        )
@@ -0,0 +1,54 @@
+import pytest
+from django.conf import settings
+from django.db import connections
+
+from tests import budgets
+from users.adapters.hashers import build_engine
+from users.adapters.repository import InMemoryRepository
+
+# bases des shards de tests/test_sharding.py (SQLite, en mémoire pendant les
+# tests) ; créées seulement pour les tests qui les déclarent
+SHARDS = ["users_0", "users_1", "users_2", "users_3"]
+settings.DATABASES.update(
+    {
+        alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": f"{alias}.sqlite3"}
+        for alias in SHARDS
+    }
+)
+# Django a déjà lu DATABASES : valeurs par défaut des nouvelles entrées
+connections.configure_settings(settings.DATABASES)
+
+
+class CountingRepository(InMemoryRepository):
+    """Compte les lectures par email et les parcours d'emails (`since`)."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.scans = []
+
+    def _get_by_email(self, email):
+        self.reads += 1
+        return super()._get_by_email(email)
+
+    def _iter_emails(self, batch_size, since):
+        self.scans.append(since)
+        return super()._iter_emails(batch_size, since)
+
+
+@pytest.fixture
+def inner():
+    """Repository en mémoire sous un décorateur (cache, filtre d'emails)."""
+    return CountingRepository()
+
+
+@pytest.fixture
+def hasher():
+    # coût minimal : les tests vérifient le comportement, pas la résistance
+    return build_engine({"PBKDF2_ITERATIONS": 1_000, "SCRYPT": (2**4, 8, 1)})
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager de tests.budgets : `with query_budget("service.register"):`."""
+    return budgets.query_budget
@@ -0,0 +1,87 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from rest_framework.test import APIClient
+
+from account import views
+from account.models import UserModel
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(
+        get_user_model().objects.create_user("admin", is_staff=True)
+    )
+    return client
+
+
+def test_user_list_is_paginated_with_opaque_cursor(client):
+    UserModel.objects.bulk_create(
+        UserModel(email=f"list{i}@example.com", password="h") for i in range(3)
+    )
+
+    first = client.get("/account/users/", {"limit": 2}).json()
+    second = client.get(
+        "/account/users/", {"limit": 2, "cursor": first["next_cursor"]}
+    ).json()
+
+    emails = [u["email"] for u in first["results"] + second["results"]]
+    assert sorted(emails) == [f"list{i}@example.com" for i in range(3)]
+    assert second["next_cursor"] is None
+
+
+def test_user_list_rejects_invalid_cursor(client):
+    response = client.get("/account/users/", {"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_user_list_is_restricted_to_staff():
+    client = APIClient()
+    anonymous = client.get("/account/users/")
+    client.force_authenticate(get_user_model().objects.create_user("someone"))
+    not_staff = client.get("/account/users/")
+
+    assert anonymous.status_code == 403
+    assert not_staff.status_code == 403
+
+
+@pytest.mark.parametrize("prefix", ["/account/", "/account/fast/"])
+def test_register_and_login_contract(prefix, monkeypatch, hasher):
+    monkeypatch.setattr(views, "hasher", hasher)
+    client = Client()
+    payload = {"email": "contract@example.com", "password": "Password123@#"}
+
+    created = client.post(f"{prefix}register/", payload, "application/json")
+    duplicate = client.post(f"{prefix}register/", payload, "application/json")
+    login = client.post(f"{prefix}login/", payload, "application/json")
+    wrong = client.post(
+        f"{prefix}login/", {**payload, "password": "nope"}, "application/json"
+    )
+
+    assert created.status_code == 201
+    assert set(created.json()) == {"id", "email"}
+    assert duplicate.status_code == 400 and "error" in duplicate.json()
+    assert login.status_code == 200
+    assert login.json() == created.json()
+    assert wrong.status_code == 400
+    assert wrong.json() == {"error": "Mot de passe incorrect"}
+
+
+def test_fast_path_skips_later_middlewares(monkeypatch, hasher):
+    monkeypatch.setattr(views, "hasher", hasher)
+    client = Client(enforce_csrf_checks=True)
+
+    response = client.post(
+        "/account/fast/register/",
+        {"email": "lean@example.com", "password": "Password123@#"},
+        "application/json",
+    )
+
+    assert response.status_code == 201
+    # posé par XFrameOptionsMiddleware, placé après FastPathMiddleware
+    assert "X-Frame-Options" not in response
+    assert "X-Frame-Options" in client.get("/account/users/")
+    assert client.get("/account/fast/login/").status_code == 405
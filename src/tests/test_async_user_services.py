@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from users.adapters.async_repository import AsyncInMemoryRepository
+from users.core.commands import RegisterUserCommand
+from users.core.exceptions import InvalidOperation, UserAlreadyExists, UserNotFound
+from users.services.async_user_services import AsyncUserService
+
+
+@pytest.fixture
+def service(hasher):
+    return AsyncUserService(AsyncInMemoryRepository(), hasher=hasher)
+
+
+def test_register_and_authenticate(service):
+    async def scenario():
+        user = await service.register(
+            RegisterUserCommand(email="async@example.com", password="secret")
+        )
+        assert await service.authenticate("async@example.com", "secret") == user
+        with pytest.raises(UserAlreadyExists):
+            await service.register(
+                RegisterUserCommand(email="async@example.com", password="secret")
+            )
+        with pytest.raises(ValueError):
+            await service.authenticate("async@example.com", "wrong")
+        with pytest.raises(UserNotFound):
+            await service.authenticate("missing@example.com", "secret")
+
+    asyncio.run(scenario())
+
+
+def test_authenticate_rejects_deactivated_users(service):
+    async def scenario():
+        user = await service.register(
+            RegisterUserCommand(email="inactive@example.com", password="secret")
+        )
+        user.deactivate()
+        await service.users.update(user)
+        with pytest.raises(InvalidOperation):
+            await service.authenticate("inactive@example.com", "secret")
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.django_db
+def test_async_views(monkeypatch, hasher):
+    from account import views
+
+    monkeypatch.setattr(views.async_service, "hasher", hasher)
+    client = AsyncClient()
+    payload = {"email": "asgi@example.com", "password": "secret"}
+
+    @async_to_sync
+    async def scenario():
+        register = await client.post(
+            "/account/async/register/", payload, content_type="application/json"
+        )
+        duplicate = await client.post(
+            "/account/async/register/", payload, content_type="application/json"
+        )
+        login = await client.post(
+            "/account/async/login/", payload, content_type="application/json"
+        )
+        return register, duplicate, login
+
+    register, duplicate, login = scenario()
+
+    assert register.status_code == 201
+    assert duplicate.status_code == 400
+    assert login.status_code == 200
+    assert login.json() == register.json()
+
+
+@pytest.mark.django_db
+def test_async_save_is_atomic(monkeypatch):
+    from account.models import LoginProjection, OutboxEvent, UserModel
+    from users.adapters import django_repository
+    from users.core.models import User
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("arrêt entre l'utilisateur et sa projection")
+
+    monkeypatch.setattr(django_repository, "project", crash)
+    repo = django_repository.AsyncDjangoUserRepository()
+    user = User.register("atomic@example.com", "hash")
+
+    with pytest.raises(RuntimeError):
+        async_to_sync(repo.save)(user)
+
+    assert not UserModel.objects.exists()
+    assert not LoginProjection.objects.exists()
+    assert not OutboxEvent.objects.exists()
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from account.models import LoginProjection, OutboxEvent, UserModel
+from users.adapters.caching_repository import CachingUserRepository
+from users.adapters.django_repository import DjangoUserRepository
+from users.core.commands import SetUsersActiveCommand, UserSelection
+from users.core.events import UserDeactivated
+from users.core.exceptions import InvalidOperation
+from users.core.models import User
+from users.services.unit_of_work import DjangoUnitOfWork, InMemoryUnitOfWork
+from users.services.user_services import UserService
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(uow):
+    users = [
+        User(
+            f"u{i}@{'evil.com' if i % 2 else 'good.com'}",
+            "h",
+            created_at=START + timedelta(days=i),
+        )
+        for i in range(6)
+    ]
+    with uow:
+        uow.users.save_many(users)
+        uow.commit()
+    if isinstance(uow, DjangoUnitOfWork):
+        # created_at est posé par la base (auto_now_add) : on le recale
+        for user in users:
+            UserModel.objects.filter(id=user.id).update(created_at=user.created_at)
+    return users
+
+
+@pytest.fixture(params=["memory", "django"])
+def uow(request):
+    if request.param == "memory":
+        return InMemoryUnitOfWork()
+    request.getfixturevalue("db")
+    return DjangoUnitOfWork()
+
+
+def active_emails(uow):
+    with uow:
+        return sorted(u.email for u in uow.users.list() if u.is_active)
+
+
+def test_deactivate_by_email_domain_in_chunks(uow, hasher):
+    seed(uow)
+    service = UserService(uow, hasher=hasher)
+    cmd = SetUsersActiveCommand(UserSelection(email_domain="Evil.com"), is_active=False)
+
+    assert service.set_active_many(cmd, chunk_size=2) == 3
+    assert active_emails(uow) == ["u0@good.com", "u2@good.com", "u4@good.com"]
+    # déjà dans l'état demandé : rien à écrire
+    assert service.set_active_many(cmd, chunk_size=2) == 0
+
+
+def test_select_by_ids_and_created_at_range(uow, hasher):
+    users = seed(uow)
+    service = UserService(uow, hasher=hasher)
+
+    by_ids = UserSelection(ids=tuple(u.id for u in users[:3]))
+    assert service.set_active_many(SetUsersActiveCommand(by_ids, False), 2) == 3
+
+    by_range = UserSelection(
+        created_from=START + timedelta(days=2), created_to=START + timedelta(days=5)
+    )
+    assert service.set_active_many(SetUsersActiveCommand(by_range, True), 2) == 1
+    assert active_emails(uow) == [
+        "u2@good.com",
+        "u3@evil.com",
+        "u4@good.com",
+        "u5@evil.com",
+    ]
+
+
+def test_events_are_emitted_only_on_request(hasher):
+    uow = InMemoryUnitOfWork()
+    users = seed(uow)
+    service = UserService(uow, hasher=hasher)
+    selection = UserSelection(ids=(users[0].id, users[1].id))
+
+    service.set_active_many(SetUsersActiveCommand(selection, False))
+    assert uow.outbox.events == []
+
+    service.set_active_many(SetUsersActiveCommand(selection, True, emit_events=True))
+    assert len(uow.outbox.events) == 2
+
+
+def test_empty_selection_is_refused(hasher):
+    service = UserService(InMemoryUnitOfWork(), hasher=hasher)
+    with pytest.raises(InvalidOperation):
+        service.set_active_many(SetUsersActiveCommand(UserSelection(), False))
+
+
+@pytest.mark.django_db
+def test_django_chunks_are_set_based_and_update_the_projection(hasher, query_budget):
+    uow = DjangoUnitOfWork()
+    seed(uow)
+    selection = UserSelection(email_domain="evil.com")
+
+    with query_budget("repository.set_active"):
+        batch = uow.users.set_active(selection, False, limit=10)
+
+    assert len(batch.changed) == 3 and batch.next_after is None
+    assert not UserModel.objects.filter(email__endswith="evil.com", is_active=True)
+    assert not LoginProjection.objects.filter(
+        email__endswith="evil.com", is_active=True
+    )
+
+    cmd = SetUsersActiveCommand(selection, True, emit_events=True)
+    UserService(uow, hasher=hasher).set_active_many(cmd)
+    assert OutboxEvent.objects.filter(name="UserActivated").count() == 3
+    assert not OutboxEvent.objects.filter(name=UserDeactivated.__name__).exists()
+
+
+@pytest.mark.django_db
+def test_commit_invalidates_the_cache_of_deactivated_users(
+    django_capture_on_commit_callbacks,
+):
+    cache = CachingUserRepository(DjangoUserRepository())
+    saved = cache.save(User("cached@example.com", "h"))
+    before = User.hydrate(saved.id, saved.email, "h", True, saved.created_at)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with DjangoUnitOfWork(users=cache) as uow:
+            uow.users.set_active(UserSelection(ids=(saved.id,)), False)
+            uow.commit()
+            # lecteur concurrent : remet en cache la ligne d'avant le commit
+            cache._store(before)
+
+    assert cache.get_by_id(saved.id).is_active is False
+    assert cache.get_by_email("cached@example.com").is_active is False
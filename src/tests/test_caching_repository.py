@@ -0,0 +1,76 @@
+import threading
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from users.adapters.caching_repository import CachingUserRepository
+from users.core.models import User
+
+
+def test_read_through_and_hit_counters(inner):
+    repo = CachingUserRepository(inner)
+    user = repo.save(User(email="hot@example.com"))
+
+    assert repo.get_by_email("hot@example.com") == user
+    assert repo.get_by_email("hot@example.com") == user
+    assert repo.get_by_id(user.id) == user
+
+    assert inner.reads == 1
+    assert (repo.stats.misses, repo.stats.hits) == (1, 2)
+
+
+def test_update_invalidates_old_and_new_email(inner):
+    repo = CachingUserRepository(inner)
+    user = repo.save(User(email="before@example.com"))
+    repo.get_by_email("before@example.com")
+
+    user.email = "after@example.com"
+    repo.update(user)
+
+    assert repo.get_by_email("before@example.com") is None
+    assert repo.get_by_email("after@example.com").email == "after@example.com"
+
+
+def test_lru_eviction_and_ttl(inner):
+    repo = CachingUserRepository(inner, maxsize=2)
+    now = [0.0]
+    repo.local._clock = lambda: now[0]
+    for i in range(2):
+        repo.save(User(email=f"u{i}@example.com"))
+        repo.get_by_email(f"u{i}@example.com")  # 2 clés par utilisateur
+
+    assert repo.stats.evictions == 2
+    assert len(repo.local) == 2
+
+    now[0] = 61.0
+    repo.get_by_email("u1@example.com")
+    assert inner.reads == 3
+
+
+def test_shared_backend_tier(inner):
+    backend = LocMemCache("users-test", {})
+    first = CachingUserRepository(inner, backend=backend)
+    second = CachingUserRepository(inner, backend=backend)
+    first.save(User(email="shared@example.com"))
+    first.get_by_email("shared@example.com")
+
+    assert second.get_by_email("shared@example.com").email == "shared@example.com"
+    assert second.stats.backend_hits == 1
+    assert inner.reads == 1
+
+
+def test_hit_counters_from_many_threads(inner):
+    repo = CachingUserRepository(inner)
+    repo.save(User(email="busy@example.com"))
+    repo.get_by_email("busy@example.com")
+
+    def lookups():
+        for _ in range(10_000):
+            repo.get_by_email("busy@example.com")
+
+    threads = [threading.Thread(target=lookups) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert repo.stats.as_dict()["hits"] == 40_000
@@ -1,36 +1,153 @@
 import pytest
 from users.adapters.django_repository import DjangoUserRepository
 from users.core.models import User
-from account.models import UserModel
+from account.models import LoginProjection, UserModel
+from users.adapters.pagination import UserCursor
 
 pytestmark = pytest.mark.django_db
 
 
-def test_save_and_get_user():
+def test_save_and_get_user(query_budget):
     repo = DjangoUserRepository()
     user = User(email="django@example.com", password="123456")
 
-    saved_user = repo.save(user)
+    with query_budget("repository.save"):
+        saved_user = repo.save(user)
 
     assert saved_user.email == "django@example.com"
-    assert repo.exists("django@example.com")
+    with query_budget("repository.exists"):
+        assert repo.exists("django@example.com")
 
 
-def test_get_by_email_returns_user():
+def test_get_by_email_returns_user(query_budget):
     repo = DjangoUserRepository()
     user = User(email="test2@example.com", password="pwd")
     repo.save(user)
 
-    fetched = repo.get_by_email("test2@example.com")
+    with query_budget("repository.get_by_email"):
+        fetched = repo.get_by_email("test2@example.com")
+    with query_budget("repository.get_by_id"):
+        assert repo.get_by_id(fetched.id) == fetched
 
     assert fetched is not None
     assert fetched.email == "test2@example.com"
 
 
-def test_list_users():
+def test_list_users(query_budget):
     repo = DjangoUserRepository()
     repo.save(User(email="u1@example.com", password="p1"))
     repo.save(User(email="u2@example.com", password="p2"))
 
-    users = repo.list()
+    # une page, pas de requête par utilisateur
+    with query_budget("repository.iter_users"):
+        users = repo.list()
     assert len(users) == 2
+
+
+def test_exists_many_and_save_many_in_batches(query_budget):
+    repo = DjangoUserRepository(batch_size=2)
+    with query_budget("repository.save_many", batches=2):
+        repo.save_many(
+            User(email=f"bulk{i}@example.com", password="h") for i in range(3)
+        )
+
+    with query_budget("repository.exists_many", batches=2):  # lots IN de 2 emails
+        found = repo.exists_many(
+            ["bulk0@example.com", "bulk2@example.com", "x@example.com", "y@example.com"]
+        )
+
+    assert found == {"bulk0@example.com", "bulk2@example.com"}
+    assert UserModel.objects.count() == 3
+
+
+def test_iter_users_streams_pages_in_keyset_order(query_budget):
+    repo = DjangoUserRepository()
+    repo.save_many(User(email=f"page{i}@example.com", password="h") for i in range(5))
+    expected = [
+        str(pk)
+        for pk in UserModel.objects.order_by("created_at", "id").values_list(
+            "id", flat=True
+        )
+    ]
+
+    with query_budget("repository.iter_users", batches=3):  # pages de 2, 2 puis 1
+        ids = [u.id for u in repo.iter_users(batch_size=2)]
+    assert ids == expected
+
+    after = UserCursor.after(repo.get_by_id(expected[1]))
+    assert [u.id for u in repo.iter_users(batch_size=2, after=after)] == expected[2:]
+
+
+def test_create_if_absent_inserts_in_one_statement(query_budget):
+    repo = DjangoUserRepository()
+
+    with query_budget("repository.create_if_absent"):
+        assert repo.create_if_absent(User(email="once@example.com", password="h"))
+    with query_budget("repository.create_if_absent"):
+        assert not repo.create_if_absent(User(email="once@example.com", password="h"))
+
+    stored = UserModel.objects.get(email="once@example.com")
+    assert LoginProjection.objects.get(user_id=stored.id).password == "h"
+    assert stored.created_at is not None
+    assert repo.get_by_email("once@example.com").id == str(stored.id)
+
+
+def test_email_lookups_are_case_insensitive():
+    repo = DjangoUserRepository()
+    repo.save(User(email="Mixed.Case@Example.com", password="h"))
+
+    assert repo.exists("mixed.case@example.com")
+    assert repo.get_by_email(" MIXED.CASE@EXAMPLE.COM ").email == (
+        "Mixed.Case@Example.com"
+    )
+    assert repo.exists_many(["MIXED.case@example.com", "other@example.com"]) == {
+        "MIXED.case@example.com"
+    }
+    assert not repo.create_if_absent(User(email="mixed.case@example.com"))
+
+
+def test_query_budget_fails_on_extra_query(query_budget):
+    repo = DjangoUserRepository()
+
+    with pytest.raises(AssertionError, match="2 requêtes pour un budget de 1"):
+        with query_budget("repository.exists"):
+            repo.exists("a@example.com")
+            repo.exists("b@example.com")
+
+
+def test_login_projection_follows_writes(query_budget):
+    repo = DjangoUserRepository()
+    user = repo.save(User(email="Proj@Example.com", password="h1"))
+
+    with query_budget("repository.get_login"):
+        login = repo.get_login("proj@example.com")
+    assert (login.id, login.email, login.password_hash) == (user.id, user.email, "h1")
+
+    user.email = "moved@example.com"
+    user.password_hash = "h2"
+    user.deactivate()
+    repo.update(user)
+
+    assert repo.get_login("proj@example.com") is None
+    login = repo.get_login("MOVED@example.com")
+    assert (login.password_hash, login.is_active) == ("h2", False)
+    assert LoginProjection.objects.count() == 1
+
+
+def test_login_projection_follows_writes_outside_the_repository(admin_client):
+    repo = DjangoUserRepository()
+    obj = UserModel.objects.create(email="Admin@Example.com", password="h1")
+    assert repo.get_login("admin@example.com").password_hash == "h1"
+
+    # modification depuis l'admin : post_save tient la projection à jour
+    response = admin_client.post(
+        f"/admin/account/usermodel/{obj.id}/change/",
+        {"email": "admin@example.com", "password": "h2", "is_active": ""},
+    )
+    assert response.status_code == 302
+    login = repo.get_login("admin@example.com")
+    assert (login.password_hash, login.is_active) == ("h2", False)
+
+    obj.delete()
+    assert repo.get_login("admin@example.com") is None
+    assert not LoginProjection.objects.exists()
@@ -0,0 +1,185 @@
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from users.adapters.caching_repository import CachingUserRepository
+from users.adapters.django_repository import DjangoUserRepository
+from users.adapters.email_filter import BloomFilter, EmailFilterRepository
+from users.core.commands import RegisterUserCommand
+from users.core.exceptions import UserNotFound
+from users.core.models import User
+from users.services.unit_of_work import DjangoUnitOfWork
+from users.services.user_services import UserService
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_error_rate():
+    bloom = BloomFilter.for_capacity(10_000, 0.01)
+    for i in range(10_000):
+        bloom.add(f"user{i}@example.com")
+
+    assert all(f"user{i}@example.com" in bloom for i in range(10_000))
+    false_positives = sum(f"other{i}@example.com" in bloom for i in range(10_000))
+    assert false_positives < 200  # 1 % visé
+    assert bloom.error_rate == pytest.approx(0.01, rel=0.2)
+
+
+def test_bloom_filter_roundtrip_through_mmap(tmp_path):
+    path = str(tmp_path / "emails.bloom")
+    bloom = BloomFilter.for_capacity(100, 0.01)
+    bloom.add("a@example.com")
+    bloom.scanned_until = 1234.5
+    bloom.save(path)
+
+    loaded = BloomFilter.open(path)
+    assert "a@example.com" in loaded
+    assert "b@example.com" not in loaded
+    assert (loaded.count, loaded.scanned_until) == (1, 1234.5)
+    # copie privée : les ajouts ne modifient pas le fichier
+    loaded.add("b@example.com")
+    assert "b@example.com" not in BloomFilter.open(path)
+
+
+def test_unknown_email_is_answered_without_reading(inner):
+    inner.save(User(email="known@example.com"))
+    repo = EmailFilterRepository(inner, capacity=100, refresh_interval=None)
+
+    assert repo.get_login("unknown@example.com") is None
+    assert not repo.exists("unknown@example.com")
+    assert repo.exists_many(["unknown@example.com"]) == set()
+    assert inner.reads == 0
+    assert repo.get_by_email("KNOWN@example.com").email == "known@example.com"
+    assert inner.reads == 1
+    assert repo.stats.as_dict()["negatives"] == 3
+
+
+def test_writes_are_added_to_the_filter(inner):
+    repo = EmailFilterRepository(inner, capacity=100, refresh_interval=None)
+    repo.save(User(email="new@example.com"))
+    repo.save_many([User(email="bulk@example.com")])
+
+    assert repo.get_login("new@example.com") is not None
+    assert repo.get_login("bulk@example.com") is not None
+    assert len(inner.scans) == 1
+
+
+def test_refresh_catches_users_created_by_other_processes(inner):
+    now = [0.0]
+    repo = EmailFilterRepository(
+        inner, capacity=100, refresh_interval=5, clock=lambda: now[0]
+    )
+    assert repo.get_login("late@example.com") is None
+
+    inner.save(User(email="late@example.com"))  # écrit sans passer par le filtre
+    assert repo.get_login("late@example.com") is None  # encore dans l'intervalle
+    now[0] = 5.0
+    assert repo.get_login("late@example.com") is not None
+    assert repo.stats.refreshes == 1
+
+
+def test_shared_generation_publishes_writes_to_other_processes(inner):
+    backend = LocMemCache("email-filter-test", {})
+    writer, reader = (
+        EmailFilterRepository(
+            inner, capacity=100, refresh_interval=3600, backend=backend
+        )
+        for _ in range(2)
+    )
+    assert reader.get_login("shared@example.com") is None
+
+    user = writer.save(User(email="shared@example.com"))
+    # pas d'attente de l'intervalle : la génération partagée a avancé
+    assert reader.get_login("shared@example.com") is not None
+    user.email = "renamed@example.com"
+    writer.update(user)
+    assert reader.get_login("renamed@example.com") is not None
+    assert reader.stats.replays == 2 and reader.stats.refreshes == 0
+
+    # à jour : un « absent » ne relit ni le journal ni la base
+    assert reader.get_login("ghost@example.com") is None
+    assert reader.stats.replays == 2
+
+    # entrée du journal expirée : rattrapage des inscriptions en base
+    writer.save(User(email="expired@example.com"))
+    backend.clear()
+    backend.set("users:email_filter:generation", 3)
+    assert reader.get_login("expired@example.com") is not None
+    assert reader.stats.refreshes == 1
+
+
+def test_exists_many_confirms_negatives_written_elsewhere(inner):
+    repo = EmailFilterRepository(inner, capacity=100, refresh_interval=3600)
+    assert repo.exists_many(["other@example.com"]) == set()
+
+    inner.save(User(email="other@example.com"))  # autre process
+    assert repo.exists_many(["other@example.com"]) == {"other@example.com"}
+
+
+def test_persisted_filter_avoids_full_scan(inner, tmp_path):
+    path = str(tmp_path / "emails.bloom")
+    inner.save(User(email="first@example.com"))
+    EmailFilterRepository(inner, capacity=100, path=path).bloom
+
+    repo = EmailFilterRepository(inner, capacity=100, path=path)
+    assert "first@example.com" in repo.bloom
+    # relu depuis le fichier : rattrapage depuis le dernier parcours seulement
+    assert inner.scans[0] is None and inner.scans[1] is not None
+
+    # réglages différents : le fichier ne convient pas, reconstruction
+    other = EmailFilterRepository(inner, capacity=100, error_rate=0.001, path=path)
+    assert "first@example.com" in other.bloom
+
+
+def test_capacity_is_raised_when_exceeded(inner):
+    for i in range(50):
+        inner.save(User(email=f"u{i}@example.com"))
+    repo = EmailFilterRepository(inner, capacity=10, refresh_interval=None)
+
+    bloom = repo.bloom  # chargé au premier usage
+    assert repo.capacity == 100
+    assert repo.stats.error_rate < 0.02
+    assert all(f"u{i}@example.com" in bloom for i in range(50))
+
+
+@pytest.mark.django_db
+def test_authenticate_unknown_email_without_query(hasher, query_budget):
+    repo = EmailFilterRepository(DjangoUserRepository(), refresh_interval=None)
+    service = UserService(DjangoUnitOfWork(users=repo), hasher=hasher)
+    service.register(RegisterUserCommand(email="real@example.com", password="pw"))
+
+    with query_budget("service.authenticate.unknown_email"):
+        with pytest.raises(UserNotFound):
+            service.authenticate("ghost@example.com", "pw")
+    with query_budget("service.authenticate"):
+        assert service.authenticate("real@example.com", "pw").email == (
+            "real@example.com"
+        )
+
+
+@pytest.mark.django_db
+def test_django_iter_emails_streams_pages(query_budget):
+    repo = DjangoUserRepository()
+    repo.save_many(User(email=f"Page{i}@example.com") for i in range(5))
+
+    with query_budget("repository.iter_emails", batches=3):
+        emails = list(repo.iter_emails(batch_size=2))
+    assert sorted(emails) == sorted(f"page{i}@example.com" for i in range(5))
+
+
+@pytest.mark.django_db
+def test_commit_invalidates_the_cache_behind_the_filter(
+    django_capture_on_commit_callbacks,
+):
+    cache = CachingUserRepository(DjangoUserRepository())
+    repo = EmailFilterRepository(cache, capacity=100, refresh_interval=None)
+    saved = repo.save(User(email="stale@example.com"))
+    before = User.hydrate(saved.id, saved.email, "h", True, saved.created_at)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with DjangoUnitOfWork(users=repo) as uow:
+            user = uow.users.get_by_email("stale@example.com")
+            user.deactivate()
+            uow.users.update(user)
+            uow.commit()
+            # lecteur concurrent : remet en cache la ligne d'avant le commit
+            cache._store(before)
+
+    assert repo.get_by_email("stale@example.com").is_active is False
@@ -0,0 +1,135 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from account.models import OutboxEvent
+from users.adapters.django_outbox import DjangoOutbox
+from users.adapters.outbox import InMemoryOutbox
+from users.core.commands import RegisterUserCommand
+from users.core.events import UserDeactivated, UserRegistered
+from users.core.models import User
+from users.services.event_dispatcher import EventDispatcher
+from users.services.unit_of_work import DjangoUnitOfWork, InMemoryUnitOfWork
+from users.services.user_services import UserService
+
+
+def test_user_records_events_on_state_changes():
+    user = User.register("events@example.com", "hash")
+    user.activate()  # déjà actif : pas d'événement
+    user.deactivate()
+
+    assert user.pull_events() == [
+        UserRegistered(user.id, "events@example.com"),
+        UserDeactivated(user.id),
+    ]
+    assert user.pull_events() == []
+
+
+def test_in_memory_commit_publishes_to_outbox(hasher):
+    uow = InMemoryUnitOfWork()
+    user = UserService(uow, hasher=hasher).register(
+        RegisterUserCommand(email="mem@example.com", password="Password123@")
+    )
+
+    assert uow.outbox.events == [UserRegistered(user.id, "mem@example.com")]
+
+
+@pytest.mark.django_db
+def test_outbox_is_written_only_when_the_unit_of_work_commits(hasher):
+    user = UserService(DjangoUnitOfWork(), hasher=hasher).register(
+        RegisterUserCommand(email="outbox@example.com", password="Password123@")
+    )
+    assert list(OutboxEvent.objects.values_list("name", "payload")) == [
+        ("UserRegistered", {"user_id": user.id, "email": "outbox@example.com"})
+    ]
+
+    uow = DjangoUnitOfWork()
+    with uow:
+        stored = uow.users.get_by_id(user.id)
+        stored.deactivate()
+        uow.users.update(stored)
+        # pas de commit : ni mise à jour ni événement
+
+    assert OutboxEvent.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_inner_rollback_keeps_the_outer_block_events():
+    user = User.register("nested@example.com", "hash")
+    uow = DjangoUnitOfWork()
+    with uow:
+        uow.users.save(user)
+        with uow:
+            uow.users.save(User.register("inner@example.com", "hash"))
+            # pas de commit : seul le savepoint est annulé
+        uow.commit()
+
+    assert list(OutboxEvent.objects.values_list("name", "payload")) == [
+        ("UserRegistered", {"user_id": user.id, "email": "nested@example.com"})
+    ]
+
+
+@pytest.mark.django_db
+def test_claims_do_not_overlap():
+    outbox = DjangoOutbox()
+    outbox.add([UserDeactivated(str(i)) for i in range(5)])
+
+    first = outbox.claim(3, lease=60)
+    second = outbox.claim(3, lease=60)
+
+    assert len(first) == 3 and len(second) == 2
+    assert not {m.id for m in first} & {m.id for m in second}
+    assert outbox.claim(3, lease=60) == []
+
+
+def test_failed_events_are_retried_with_backoff_then_abandoned():
+    now = [1000.0]
+    outbox = InMemoryOutbox(clock=lambda: now[0])
+    outbox.add([UserDeactivated("1"), UserDeactivated("2")])
+    calls = []
+
+    def flaky(event):
+        calls.append(event.user_id)
+        if event.user_id == "2":
+            raise RuntimeError("indisponible")
+
+    dispatcher = EventDispatcher(
+        outbox,
+        {"UserDeactivated": [flaky]},
+        max_attempts=3,
+        backoff=10,
+        clock=lambda: now[0],
+    )
+    with dispatcher:
+        report = dispatcher.dispatch_once()
+        assert (report.dispatched, report.retried) == (1, 1)
+        assert dispatcher.dispatch_once().claimed == 0  # backoff de 10 s
+
+        now[0] += 10
+        assert dispatcher.dispatch_once().retried == 1
+        now[0] += 19
+        assert dispatcher.dispatch_once().claimed == 0  # puis 20 s
+        now[0] += 1
+        assert dispatcher.dispatch_once().abandoned == 1
+
+        now[0] += 1000
+        assert dispatcher.dispatch_once().claimed == 0
+    assert calls == ["1", "2", "2", "2"]
+
+
+@pytest.mark.django_db
+def test_dispatch_events_command_drains_the_outbox(caplog):
+    DjangoOutbox().add([UserRegistered(str(i), f"{i}@example.com") for i in range(3)])
+
+    with caplog.at_level("INFO", logger="users.events"):
+        call_command(
+            "dispatch_events", "--once", "--batch-size", "2", stdout=StringIO()
+        )
+
+    logged = sorted(r.getMessage() for r in caplog.records if r.name == "users.events")
+    assert logged == [
+        f"UserRegistered {{'user_id': '{i}', 'email': '{i}@example.com'}}"
+        for i in range(3)
+    ]
+    assert not OutboxEvent.objects.filter(dispatched_at=None).exists()
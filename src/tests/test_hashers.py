@@ -0,0 +1,48 @@
+import hashlib
+
+from users.adapters.hashers import (
+    PasswordHashingEngine,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+    SHA256LegacyPasswordHasher,
+    WrappedSHA256PasswordHasher,
+    wrap_legacy_hashes,
+)
+
+
+def test_hash_is_salted_and_versioned(hasher):
+    first, second = hasher.hash("Password123@"), hasher.hash("Password123@")
+
+    assert first != second
+    assert first.startswith("pbkdf2_sha256$1000$")
+    assert hasher.verify("Password123@", first) == (True, False)
+    assert hasher.verify("wrong", first) == (False, False)
+
+
+def test_changed_cost_or_algorithm_requires_rehash():
+    old = PasswordHashingEngine([PBKDF2PasswordHasher(iterations=1_000)])
+    new = PasswordHashingEngine(
+        [ScryptPasswordHasher(n=2**4), PBKDF2PasswordHasher(iterations=2_000)]
+    )
+    encoded = old.hash("Password123@")
+
+    assert new.verify("Password123@", encoded) == (True, True)
+    assert new.verify("Password123@", new.hash("Password123@")) == (True, False)
+
+
+def test_legacy_sha256_is_verified_then_rehashed(hasher):
+    legacy = hashlib.sha256(b"secret").hexdigest()
+
+    assert isinstance(hasher.hasher_for(legacy), SHA256LegacyPasswordHasher)
+    assert hasher.verify("secret", legacy) == (True, True)
+    assert hasher.verify("other", legacy) == (False, False)
+
+
+def test_wrapped_legacy_sha256_is_verified_then_rehashed(hasher):
+    legacy = hashlib.sha256(b"secret").hexdigest()
+    wrapped = wrap_legacy_hashes(hasher.preferred, [legacy])[0]
+
+    assert wrapped.startswith("sha256+pbkdf2_sha256$")
+    assert isinstance(hasher.hasher_for(wrapped), WrappedSHA256PasswordHasher)
+    assert hasher.verify("secret", wrapped) == (True, True)
+    assert hasher.verify("other", wrapped) == (False, False)
@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from users.adapters.django_repository import DjangoUserRepository
+from users.adapters.identity_map import IdentityMap, IdentityMapStats
+from users.core.commands import UserSelection
+from users.core.models import User
+from users.services.unit_of_work import DjangoUnitOfWork, InMemoryUnitOfWork
+
+
+@pytest.fixture
+def stats():
+    return IdentityMapStats()
+
+
+def test_same_instance_by_id_and_email(stats):
+    identity = IdentityMap(stats)
+    user = identity.add(User(email="Same@example.com"))
+
+    assert identity.get_by_id(user.id) is user
+    assert identity.get_by_email("same@example.com") is user
+    # relu en base sous une autre instance : celle déjà en circulation gagne
+    assert identity.add(User.hydrate(user.id, user.email, "h", True, None)) is user
+    assert stats.as_dict()["hit_ratio"] == 1.0
+
+
+def test_discard_uses_the_email_known_at_load(stats):
+    identity = IdentityMap(stats)
+    user = identity.add(User(email="before@example.com"))
+    user.email = "after@example.com"
+
+    identity.discard([user.id])
+
+    assert identity.get_by_email("before@example.com") is None
+    assert len(identity) == 0
+    assert (stats.invalidations, stats.misses) == (1, 1)
+
+
+def test_stats_shared_between_threads_lose_no_count(stats):
+    def lookups():
+        identity = IdentityMap(stats)  # une map par unit of work
+        for _ in range(10_000):
+            identity.get_by_id("missing")
+
+    threads = [threading.Thread(target=lookups) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stats.as_dict()["misses"] == 40_000
+
+
+def test_in_memory_unit_of_work_scopes_the_map_to_the_transaction():
+    uow = InMemoryUnitOfWork()
+    stored = uow.repository.save(User(email="mem@example.com"))
+    with uow:
+        first = uow.users.get_by_id(stored.id)
+        assert uow.users.get_by_email("MEM@example.com") is first
+    assert len(uow.users.identity) == 0
+
+
+@pytest.mark.django_db
+def test_repeated_lookups_hit_the_database_once(query_budget):
+    user = DjangoUserRepository().save(User(email="once@example.com", password="h"))
+    uow = DjangoUnitOfWork()
+
+    with uow:
+        with query_budget("repository.get_by_id"):
+            loaded = uow.users.get_by_id(user.id)
+            assert uow.users.get_by_id(user.id) is loaded
+            assert uow.users.get_by_email("Once@example.com") is loaded
+            assert uow.users.get_login("once@example.com") is loaded
+            assert uow.users.exists("once@example.com")
+
+    with uow:
+        # nouvelle transaction : nouvelle instance
+        assert uow.users.get_by_id(user.id) is not loaded
+
+
+@pytest.mark.django_db
+def test_writes_invalidate_the_map():
+    user = DjangoUserRepository().save(User(email="inv@example.com", password="h"))
+    uow = DjangoUnitOfWork()
+
+    with uow:
+        loaded = uow.users.get_by_email("inv@example.com")
+        loaded.email = "renamed@example.com"
+        uow.users.update(loaded)
+        uow.commit()
+        assert uow.users.get_by_email("inv@example.com") is None
+        assert uow.users.get_by_email("renamed@example.com").id == user.id
+
+        reloaded = uow.users.get_by_id(user.id)
+        uow.users.set_active(UserSelection(ids=[user.id]), False)
+        assert uow.users.get_by_id(user.id) is not reloaded
+        assert uow.users.get_by_id(user.id).is_active is False
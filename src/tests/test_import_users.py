@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from account.models import UserModel
+from users.services.importer import Checkpoint, ImportProgress
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashing(settings):
+    settings.USERS_PASSWORD_HASHING = {"PBKDF2_ITERATIONS": 1_000}
+
+
+def test_import_csv(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "email,password\n"
+        "a@example.com,Password123@\n"
+        "b@example.com,Password123@\n"
+        "not-an-email,Password123@\n"
+        "a@example.com,Password123@\n"
+    )
+
+    call_command("import_users", str(path), "--batch-size", "2")
+
+    assert set(UserModel.objects.values_list("email", flat=True)) == {
+        "a@example.com",
+        "b@example.com",
+    }
+    assert not (tmp_path / "users.csv.checkpoint.json").exists()
+
+
+def test_import_jsonl_resumes_from_checkpoint(tmp_path):
+    lines = [
+        json.dumps({"email": f"u{i}@example.com", "password": "Password123@"})
+        for i in range(3)
+    ]
+    path = tmp_path / "users.jsonl"
+    path.write_text("\n".join(lines) + "\n")
+    # le premier lot a déjà été importé avant un crash
+    Checkpoint(f"{path}.checkpoint.json").save(
+        ImportProgress(offset=len(lines[0]) + 1, rows=1, created=1)
+    )
+
+    call_command("import_users", str(path))
+
+    assert set(UserModel.objects.values_list("email", flat=True)) == {
+        "u1@example.com",
+        "u2@example.com",
+    }
@@ -0,0 +1,91 @@
+import pytest
+from rest_framework.test import APIClient
+
+from account import views
+from users import instrumentation
+from users.instrumentation import instrumented, metrics, span
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.enable()
+    metrics.reset()
+    yield metrics
+    instrumentation.disable()
+    metrics.reset()
+
+
+@pytest.fixture
+def client(monkeypatch, hasher):
+    monkeypatch.setattr(views, "hasher", hasher)
+    return APIClient()
+
+
+def test_disabled_instrumentation_records_nothing():
+    calls = []
+
+    @instrumented("test.noop")
+    def noop():
+        calls.append(1)
+        return "ok"
+
+    assert noop() == "ok"
+    assert calls == [1]
+    assert "test.noop" not in metrics.snapshot()
+
+
+def test_span_aggregates_calls_and_queries(enabled):
+    with instrumentation.request_scope() as timings:
+        with span("test.step"):
+            instrumentation.record_query(0.001)
+            instrumentation.record_query(0.001)
+        with span("test.step"):
+            pass
+
+    calls, _, queries = enabled.snapshot()["test.step"]
+    assert (calls, queries) == (2, 2)
+    assert timings.queries == 2
+    assert "test.step;dur=" in timings.server_timing()
+
+
+@pytest.mark.django_db
+def test_register_and_login_send_server_timing(enabled, client):
+    payload = {"email": "timing@example.com", "password": "Password123@#"}
+    register = client.post("/account/register/", payload, format="json")
+    login = client.post("/account/login/", payload, format="json")
+
+    assert register.status_code == 201
+    assert "service.register" in register["Server-Timing"]
+    assert "hashing.hash" in register["Server-Timing"]
+    assert "serialization" in login["Server-Timing"]
+    assert "db;dur=" in login["Server-Timing"]
+
+    _, _, queries = enabled.snapshot()["repository.get_login"]
+    assert queries == 1
+
+
+@pytest.mark.django_db
+def test_no_server_timing_when_disabled(client):
+    payload = {"email": "plain@example.com", "password": "Password123@#"}
+    response = client.post("/account/register/", payload, format="json")
+
+    assert response.status_code == 201
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_renders_prometheus_text(enabled, client):
+    payload = {"email": "prom@example.com", "password": "Password123@#"}
+    client.post("/account/register/", payload, format="json")
+
+    response = client.get("/account/metrics/")
+
+    assert response.status_code == 200
+    body = response.content.decode()
+    assert 'users_span_seconds_count{span="service.register"} 1' in body
+    # savepoints compris : tout ce qui passe par execute_wrapper est compté
+    assert 'users_span_queries_total{span="repository.create_if_absent"} ' in body
+
+
+def test_metrics_endpoint_is_hidden_when_disabled(client):
+    assert client.get("/account/metrics/").status_code == 404
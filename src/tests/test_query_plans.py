@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from users.adapters.django_repository import DjangoUserRepository
+from users.core.models import User
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="plans EXPLAIN QUERY PLAN de SQLite"
+    ),
+]
+
+
+def query_plans(action):
+    """Plans d'exécution des requêtes émises par `action`."""
+    with CaptureQueriesContext(connection) as ctx:
+        action()
+    plans = []
+    with connection.cursor() as cursor:
+        for query in ctx.captured_queries:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+            plans.append(" / ".join(row[-1] for row in cursor.fetchall()))
+    return plans
+
+
+@pytest.fixture
+def repo():
+    repo = DjangoUserRepository()
+    repo.save(User(email="Plan@Example.com", password="h"))
+    return repo
+
+
+def test_exists_is_index_only(repo):
+    (plan,) = query_plans(lambda: repo.exists("  PLAN@example.COM "))
+
+    assert "USING COVERING INDEX" in plan
+    assert "SCAN" not in plan
+
+
+def test_login_lookup_searches_the_normalized_email_index(repo):
+    (plan,) = query_plans(lambda: repo.get_by_email("plan@example.com"))
+
+    assert plan.startswith("SEARCH users USING INDEX")
+    assert "email_normalized" in plan or "autoindex" in plan
@@ -0,0 +1,98 @@
+import io
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.management import call_command
+
+from account.models import LoginProjection, UserModel
+from users.adapters.django_repository import DjangoUserRepository
+from users.adapters.hashers import PBKDF2PasswordHasher
+from users.core.models import User
+from users.services.rehash import rehash_legacy_passwords
+from users.services.unit_of_work import DjangoUnitOfWork
+from users.services.user_services import UserService
+
+pytestmark = pytest.mark.django_db
+
+KDF = PBKDF2PasswordHasher(1_000)
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashing(settings):
+    settings.USERS_PASSWORD_HASHING = {"PBKDF2_ITERATIONS": 1_000}
+
+
+def legacy(password: str) -> str:
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def create_users(count: int, password: str = "secret"):
+    return DjangoUserRepository().save_many(
+        User(email=f"legacy{i}@example.com", password=legacy(password))
+        for i in range(count)
+    )
+
+
+def passwords():
+    return set(UserModel.objects.values_list("password", flat=True))
+
+
+def test_rehash_wraps_legacy_hashes_in_chunks(query_budget):
+    create_users(5)
+    repo = DjangoUserRepository()
+    DjangoUserRepository().save(
+        User(email="modern@example.com", password=KDF.encode("x"))
+    )
+    reports = []
+
+    with ThreadPoolExecutor(2) as executor, query_budget("rehash.chunk", batches=3):
+        progress = rehash_legacy_passwords(
+            repo, KDF, executor, chunk_size=2, max_in_flight=2, on_chunk=reports.append
+        )
+
+    assert (progress.rows, progress.rehashed, progress.skipped) == (5, 5, 0)
+    assert len(reports) == 3
+    wrapped = [p for p in passwords() if p.startswith("sha256+")]
+    assert len(wrapped) == 5
+    assert set(LoginProjection.objects.values_list("password", flat=True)) == (
+        passwords()
+    )
+
+
+def test_rehash_is_resumable_and_skips_concurrent_changes():
+    first, second, third = create_users(3)
+    repo = DjangoUserRepository()
+
+    class LoginDuringRehash(DjangoUserRepository):
+        def replace_password_hashes(self, changes):
+            # connexion entre la lecture et l'écriture : hash déjà remplacé
+            second.password = KDF.encode("secret")
+            repo.update(second)
+            return super().replace_password_hashes(changes)
+
+    with ThreadPoolExecutor(1) as executor:
+        progress = rehash_legacy_passwords(
+            LoginDuringRehash(), KDF, executor, chunk_size=10
+        )
+        assert (progress.rehashed, progress.skipped) == (2, 1)
+        stored = repo.get_by_id(second.id).password
+        assert stored.startswith("pbkdf2_sha256$")
+
+        # relancé : plus rien à faire
+        assert rehash_legacy_passwords(repo, KDF, executor).rows == 0
+
+
+def test_command_then_login_replaces_the_wrapped_hash(hasher):
+    create_users(3)
+
+    out = io.StringIO()
+    call_command("rehash_passwords", "--workers", "2", "--chunk-size", "2", stdout=out)
+
+    assert "Terminé : 3 lus, 3 réécrits" in out.getvalue()
+
+    assert all(p.startswith("sha256+pbkdf2_sha256$") for p in passwords())
+    service = UserService(DjangoUnitOfWork(), hasher=hasher)
+    user = service.authenticate("legacy0@example.com", "secret")
+    stored = DjangoUserRepository().get_by_id(user.id).password
+    assert stored.startswith("pbkdf2_sha256$")
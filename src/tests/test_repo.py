@@ -1,6 +1,7 @@
 import pytest
 from users.core.models import User
 from users.adapters.repository import InMemoryRepository
+from users.adapters.pagination import UserCursor
 
 
 @pytest.fixture
@@ -34,3 +35,37 @@ def test_list_users(repo):
     users = repo.list()
     assert len(users) == 2
     assert u1 in users and u2 in users
+
+
+def test_update_reindexes_changed_email(repo):
+    user = repo.save(User(email="old@example.com"))
+
+    user.email = "new@example.com"
+    repo.update(user)
+
+    assert repo.exists("old@example.com") is False
+    assert repo.get_by_email("new@example.com") is user
+    assert len(repo.list()) == 1
+
+
+def test_secondary_index_follows_updates():
+    repo = InMemoryRepository(secondary_indexes={"is_active": lambda u: u.is_active})
+    active = repo.save(User(email="on@example.com"))
+    inactive = repo.save(User(email="off@example.com", is_active=False))
+
+    assert repo.find_by("is_active", True) == [active]
+    assert repo.find_by("is_active", False) == [inactive]
+
+    active.deactivate()
+    repo.update(active)
+
+    assert repo.find_by("is_active", True) == []
+    assert set(repo.find_by("is_active", False)) == {active, inactive}
+
+
+def test_iter_users_after_cursor(repo):
+    users = [repo.save(User(email=f"u{i}@example.com")) for i in range(3)]
+    ordered = sorted(users, key=UserCursor.after)
+
+    assert list(repo.iter_users()) == ordered
+    assert list(repo.iter_users(after=UserCursor.after(ordered[0]))) == ordered[1:]
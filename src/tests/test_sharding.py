@@ -0,0 +1,276 @@
+import hashlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import CommandError, call_command
+
+from account.models import LoginProjection, UserModel
+from account.routers import UserShardRouter
+from tests.conftest import SHARDS
+from users.adapters.django_repository import DjangoUserRepository
+from users.adapters.email_filter import BloomFilter
+from users.adapters.pagination import UserCursor
+from users.adapters.sharding import (
+    AsyncShardedUserRepository,
+    ShardedUserRepository,
+    ShardMap,
+    jump_hash,
+    shard_key,
+)
+from users.core.commands import (
+    RegisterUserCommand,
+    SetUsersActiveCommand,
+    UserSelection,
+)
+from users.core.models import User
+from users.services.async_user_services import AsyncUserService
+from users.services.unit_of_work import DjangoUnitOfWork
+from users.services.user_services import UserService
+
+pytestmark = pytest.mark.django_db(databases=["default", *SHARDS])
+
+THREE = SHARDS[:3]
+
+
+@pytest.fixture
+def repo():
+    return ShardedUserRepository(THREE, batch_size=2)
+
+
+def rows(alias):
+    return set(
+        UserModel.objects.using(alias).values_list("email_normalized", flat=True)
+    )
+
+
+def legacy(password: str) -> str:
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def moving_emails(prefix: str, count: int):
+    """Emails qui passent sur le 4e shard quand on l'ajoute."""
+    shards = ShardMap(SHARDS)
+    candidates = (f"{prefix}{i}@example.com" for i in range(1000))
+    return [e for e in candidates if shards.for_email(e) == SHARDS[3]][:count]
+
+
+def test_adding_a_shard_only_moves_keys_to_it():
+    keys = [shard_key(f"user{i}@example.com") for i in range(10_000)]
+    before = [jump_hash(k, 3) for k in keys]
+    after = [jump_hash(k, 4) for k in keys]
+
+    moved = [(b, a) for b, a in zip(before, after) if b != a]
+    assert {a for _, a in moved} == {3}
+    assert 0.2 < len(moved) / len(keys) < 0.3
+    assert all(count > 3000 for count in Counter(before).values())
+
+
+def test_each_user_lives_in_the_shard_of_its_email(repo, query_budget):
+    users = repo.save_many(User(email=f"User{i}@example.com") for i in range(12))
+    repo.save(User(email="single@example.com"))
+
+    shards = ShardMap(THREE)
+    for alias in THREE:
+        expected = {
+            e for e in (u.email.lower() for u in users) if shards.for_email(e) == alias
+        }
+        if shards.for_email("single@example.com") == alias:
+            expected.add("single@example.com")
+        assert rows(alias) == expected
+        assert rows(alias) == set(
+            LoginProjection.objects.using(alias).values_list(
+                "email_normalized", flat=True
+            )
+        )
+    assert rows("default") == set()
+
+    alias = shards.for_email("user3@example.com")
+    with query_budget("repository.get_login", using=alias):
+        assert repo.get_login("USER3@example.com").id == users[3].id
+    assert repo.get_by_id(users[3].id).email == "User3@example.com"
+    assert repo.exists_many(["user1@example.com", "nobody@example.com"]) == {
+        "user1@example.com"
+    }
+    assert not repo.create_if_absent(User(email="user5@EXAMPLE.com"))
+
+
+def test_fan_out_listing_merges_shards_in_keyset_order(repo):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    users = repo.save_many(User(email=f"page{i}@example.com") for i in range(9))
+    for i, user in enumerate(users):
+        alias = ShardMap(THREE).for_email(user.email)
+        UserModel.objects.using(alias).filter(id=user.id).update(
+            created_at=start + timedelta(minutes=i)
+        )
+
+    listed = [u.email for u in repo.iter_users(batch_size=2)]
+    assert listed == [f"page{i}@example.com" for i in range(9)]
+
+    fourth = repo.get_by_email("page3@example.com")
+    after = [u.email for u in repo.iter_users(2, after=UserCursor.after(fourth))]
+    assert after == [f"page{i}@example.com" for i in range(4, 9)]
+
+
+def test_service_over_shards(repo, hasher):
+    service = UserService(DjangoUnitOfWork(users=repo), hasher=hasher)
+    for i in range(6):
+        service.register(RegisterUserCommand(f"svc{i}@example.com", "Password123@"))
+
+    assert service.authenticate("svc4@example.com", "Password123@").email == (
+        "svc4@example.com"
+    )
+    cmd = SetUsersActiveCommand(UserSelection(email_domain="example.com"), False)
+    assert service.set_active_many(cmd, chunk_size=1) == 6
+    assert not any(u.is_active for u in repo.iter_users())
+
+
+def test_email_change_moves_the_row_and_keeps_created_at(repo):
+    user = repo.save(User(email="mover0@example.com"))
+    created_at = repo.get_by_id(user.id).created_at
+    shards = ShardMap(THREE)
+    new_email = next(
+        f"moved{i}@example.com"
+        for i in range(100)
+        if shards.for_email(f"moved{i}@example.com")
+        != shards.for_email("mover0@example.com")
+    )
+
+    user.email = new_email
+    repo.update(user)
+
+    assert rows(shards.for_email("mover0@example.com")) == set()
+    moved = repo.get_by_email(new_email)
+    assert (moved.id, moved.created_at) == (user.id, created_at)
+    assert repo.get_login(new_email).id == user.id
+
+
+def test_rebalance_after_adding_a_shard(settings):
+    ShardedUserRepository(THREE).save_many(
+        User(email=f"rb{i}@example.com") for i in range(40)
+    )
+    grown = ShardedUserRepository(SHARDS, previous=THREE)
+    # pas encore déplacés : lus sur l'ancien shard
+    assert all(grown.get_login(f"rb{i}@example.com") for i in range(40))
+    assert not grown.create_if_absent(User(email="rb1@example.com"))
+
+    settings.USERS_SHARDS = SHARDS
+    settings.USERS_SHARDS_PREVIOUS = THREE
+    out = StringIO()
+    call_command("rebalance_shards", "--dry-run", stdout=out)
+    assert rows(SHARDS[3]) == set()
+    call_command("rebalance_shards", "--batch-size", "7", stdout=out)
+
+    shards = ShardMap(SHARDS)
+    emails = {f"rb{i}@example.com" for i in range(40)}
+    assert set().union(*(rows(alias) for alias in SHARDS)) == emails
+    assert rows(SHARDS[3]) == {e for e in emails if shards.for_email(e) == SHARDS[3]}
+    assert rows(SHARDS[3])
+    assert f"-> {SHARDS[3]}" in out.getvalue()
+    assert all(ShardedUserRepository(SHARDS).get_login(e) is not None for e in emails)
+
+
+def test_listing_and_set_active_cover_previous_shards():
+    # retrait du 4e shard : ses utilisateurs n'y sont plus routés, pas encore
+    # déplacés, et l'un est à mi-déplacement (copié, pas encore supprimé)
+    users = ShardedUserRepository(SHARDS).save_many(
+        User(email=email) for email in moving_emails("shrink", 2)
+    )
+    copy = UserModel.objects.using(SHARDS[3]).get(id=users[0].id)
+    target = ShardMap(THREE).for_email(users[0].email)
+    DjangoUserRepository(using=target).save(users[0])
+    UserModel.objects.using(target).filter(id=copy.id).update(
+        created_at=copy.created_at
+    )
+    shrunk = ShardedUserRepository(THREE, previous=SHARDS)
+
+    assert sorted(u.id for u in shrunk.iter_users(batch_size=1)) == sorted(
+        u.id for u in users
+    )
+
+    selection = UserSelection(email_domain="example.com")
+    changed, after = [], None
+    while True:
+        batch = shrunk.set_active(selection, False, limit=1, after=after)
+        changed += [user_id for user_id, _ in batch.changed]
+        if batch.next_after is None:
+            break
+        after = batch.next_after
+    assert set(changed) == {u.id for u in users}
+    assert not UserModel.objects.using(SHARDS[3]).filter(is_active=True).exists()
+
+
+def test_router_keeps_other_apps_out_of_the_shards(settings):
+    settings.USERS_SHARDS = THREE
+    router = UserShardRouter()
+
+    assert router.allow_migrate("users_0", "account", "usermodel")
+    assert not router.allow_migrate("users_0", "auth", "user")
+    assert router.allow_migrate("default", "auth", "user") is None
+
+
+def test_rehash_on_login_during_rebalance_keeps_created_at(hasher):
+    (email,) = moving_emails("login", 1)
+    user = ShardedUserRepository(THREE).save(User(email=email, password=legacy("pw")))
+    created_at = ShardedUserRepository(THREE).get_by_id(user.id).created_at
+
+    grown = ShardedUserRepository(SHARDS, previous=THREE)
+    service = UserService(DjangoUnitOfWork(users=grown), hasher=hasher)
+    service.authenticate(email, "pw")  # hash recalculé : la ligne change de shard
+
+    assert rows(SHARDS[3]) == {email}
+    assert grown.get_by_id(user.id).created_at == created_at
+
+
+def test_async_repository_routes_by_shard(hasher):
+    emails = moving_emails("async", 2)
+    ShardedUserRepository(THREE).save_many(
+        User(email=email, password=legacy("pw")) for email in emails
+    )
+    service = AsyncUserService(
+        AsyncShardedUserRepository(SHARDS, previous=THREE), hasher=hasher
+    )
+
+    async def scenario():
+        await service.register(RegisterUserCommand("fresh@example.com", "Password1@"))
+        for email in emails:
+            await service.authenticate(email, "pw")
+
+    async_to_sync(scenario)()
+
+    assert "fresh@example.com" in rows(ShardMap(SHARDS).for_email("fresh@example.com"))
+    assert rows("default") == set()
+    # pas encore déplacés : hash recalculé sur l'ancien shard
+    for email in emails:
+        alias = ShardMap(THREE).for_email(email)
+        stored = LoginProjection.objects.using(alias).get(email_normalized=email)
+        assert stored.password.startswith("pbkdf2_sha256$")
+
+
+def test_commands_go_through_the_shards(settings, tmp_path):
+    settings.USERS_SHARDS = THREE
+    settings.USERS_PASSWORD_HASHING = {"PBKDF2_ITERATIONS": 1_000}
+    settings.USERS_EMAIL_FILTER = {"CAPACITY": 100, "PATH": str(tmp_path / "bloom")}
+    emails = {f"cmd{i}@example.com" for i in range(6)}
+    path = tmp_path / "users.csv"
+    path.write_text("email,password\n" + "".join(f"{e},Password1@\n" for e in emails))
+    out = StringIO()
+
+    call_command("import_users", str(path), stdout=out)
+    assert set().union(*(rows(alias) for alias in THREE)) == emails
+    assert rows("default") == set()
+
+    call_command("build_email_filter", stdout=out)
+    bloom = BloomFilter.open(str(tmp_path / "bloom"))
+    assert all(email in bloom for email in emails)
+
+    ShardedUserRepository(THREE).save_many(
+        User(email=f"legacy{i}@example.com", password=legacy("pw")) for i in range(4)
+    )
+    call_command("rehash_passwords", "--workers", "1", "--chunk-size", "2", stdout=out)
+    assert "Terminé : 4 lus, 4 réécrits" in out.getvalue()
+    assert f"dernier id {THREE[0]}:" in out.getvalue()
+    with pytest.raises(CommandError):
+        call_command("rehash_passwords", "--after", "default:1", stdout=out)
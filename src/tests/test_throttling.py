@@ -0,0 +1,129 @@
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import Client
+
+from account import views
+from users.adapters.throttling import (
+    CacheWindowStore,
+    LocalWindowStore,
+    LoginThrottle,
+    RateLimit,
+    SketchWindowStore,
+)
+from users.core.exceptions import TooManyAttempts
+
+RATE = RateLimit(limit=3, window=60)
+
+
+@pytest.fixture(
+    params=[
+        LocalWindowStore,
+        SketchWindowStore,
+        lambda: CacheWindowStore(LocMemCache("throttle-tests", {})),
+    ],
+    ids=["local", "sketch", "cache"],
+)
+def store(request):
+    return request.param()
+
+
+def attempt(store, key, now):
+    # comme LoginThrottle : vérification, puis comptage de l'échec
+    if store.exceeded(key, RATE, now):
+        return False
+    store.add(key, RATE, now)
+    return True
+
+
+def test_store_rejects_over_limit_then_slides(store):
+    # début d'une fenêtre : la précédente est vide
+    assert [attempt(store, "k", 600.0) for _ in range(4)] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert attempt(store, "other", 600.0)
+
+    # mi-fenêtre suivante : 3 × 0.5 = 1.5 tentatives encore comptées
+    assert [attempt(store, "k", 690.0) for _ in range(3)] == [True, True, False]
+    # deux fenêtres plus tard, tout est oublié
+    assert store.count("k", RATE, 800.0) == 0
+
+
+def test_local_store_is_bounded():
+    store = LocalWindowStore(max_keys=100)
+    for i in range(1_000):
+        store.add(f"user{i}", RATE, 0.0)
+    assert len(store) == 100
+    # une clé sans échec n'est pas stockée
+    assert store.count("nobody", RATE, 0.0) == 0
+    assert "nobody" not in store._counters
+
+
+def test_throttle_checks_ip_and_normalized_email():
+    now = [0.0]
+    throttle = LoginThrottle(
+        per_email=RateLimit(2, 60), per_ip=RateLimit(3, 60), clock=lambda: now[0]
+    )
+
+    def failed_login(email, ip):
+        throttle.check(email, ip)
+        throttle.failed(email, ip)
+
+    failed_login("Victim@example.com", "10.0.0.1")
+    failed_login("victim@example.com ", "10.0.0.2")
+    with pytest.raises(TooManyAttempts) as excinfo:
+        throttle.check("VICTIM@example.com", "10.0.0.3")
+    assert excinfo.value.retry_after == 60
+
+    failed_login("a@example.com", "10.0.0.9")
+    failed_login("b@example.com", "10.0.0.9")
+    failed_login("c@example.com", "10.0.0.9")
+    with pytest.raises(TooManyAttempts):
+        throttle.check("d@example.com", "10.0.0.9")
+
+
+@pytest.mark.django_db
+def test_login_views_reject_before_authenticating(monkeypatch):
+    calls = []
+
+    class Service:
+        def authenticate(self, email, password):
+            calls.append(email)
+            raise ValueError("Mot de passe incorrect")
+
+    monkeypatch.setattr(views, "get_service", Service)
+    monkeypatch.setattr(
+        views, "throttle", LoginThrottle(RateLimit(2, 60), RateLimit(100, 60))
+    )
+    client = Client()
+    payload = {"email": "target@example.com", "password": "guess"}
+
+    statuses = [
+        client.post(path, payload, "application/json").status_code
+        for path in ("/account/login/", "/account/fast/login/", "/account/login/")
+    ]
+    response = client.post("/account/fast/login/", payload, "application/json")
+
+    assert statuses == [400, 400, 429]
+    assert response.status_code == 429 and int(response["Retry-After"]) > 0
+    assert calls == ["target@example.com"] * 2
+
+
+@pytest.mark.django_db
+def test_successful_logins_are_not_counted(monkeypatch, hasher):
+    monkeypatch.setattr(views, "hasher", hasher)
+    monkeypatch.setattr(
+        views, "throttle", LoginThrottle(RateLimit(2, 60), RateLimit(2, 60))
+    )
+    client = Client()
+    payload = {"email": "busy@example.com", "password": "Password123@#"}
+    client.post("/account/fast/register/", payload, "application/json")
+
+    statuses = {
+        client.post(path, payload, "application/json").status_code
+        for path in ("/account/login/", "/account/fast/login/") * 3
+    }
+
+    assert statuses == {200}
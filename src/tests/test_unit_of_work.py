@@ -0,0 +1,68 @@
+import pytest
+
+from account.models import UserModel
+from users.core.models import User
+from users.services.unit_of_work import DjangoUnitOfWork
+
+pytestmark = pytest.mark.django_db
+
+
+def emails():
+    return set(UserModel.objects.values_list("email", flat=True))
+
+
+def test_writes_are_deferred_and_batched_at_commit(query_budget):
+    uow = DjangoUnitOfWork()
+    with uow:
+        for i in range(3):
+            uow.users.save(User(email=f"batch{i}@example.com", password="h"))
+        assert uow.users.exists("batch0@example.com")
+        assert emails() == set()
+
+        with query_budget("uow.commit"):
+            uow.commit()
+
+    assert len(emails()) == 3
+
+
+def test_exit_without_commit_or_on_error_rolls_back():
+    uow = DjangoUnitOfWork()
+    with uow:
+        uow.users.save(User(email="forgotten@example.com", password="h"))
+
+    with pytest.raises(RuntimeError):
+        with uow:
+            uow.users.save(User(email="failed@example.com", password="h"))
+            uow.commit()
+            raise RuntimeError
+
+    assert emails() == set()
+
+
+def test_nested_unit_of_work_uses_a_savepoint():
+    uow = DjangoUnitOfWork()
+    with uow:
+        uow.users.save(User(email="outer@example.com", password="h"))
+        with pytest.raises(RuntimeError):
+            with uow:
+                uow.users.save(User(email="inner@example.com", password="h"))
+                uow.commit()
+                raise RuntimeError
+        uow.commit()
+
+    assert emails() == {"outer@example.com"}
+
+
+def test_updates_are_flushed_with_bulk_update():
+    uow = DjangoUnitOfWork()
+    with uow:
+        user = uow.users.save(User(email="dirty@example.com", password="h"))
+        uow.commit()
+
+    with uow:
+        user = uow.users.get_by_email("dirty@example.com")
+        user.deactivate()
+        uow.users.update(user)
+        uow.commit()
+
+    assert UserModel.objects.get(email="dirty@example.com").is_active is False
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from users.core.models import User
 from users.core.value_object import Email
 from users.core.exceptions import InvalidEmailException
@@ -10,3 +12,27 @@ def test_user_model():
     print(user)
     assert user.email == "l9v3h@example.com"
     assert user.is_active
+
+
+def test_hydrate_keeps_persisted_identity():
+    created_at = datetime(2025, 1, 1)
+    user = User.hydrate(
+        id="4c8e5c1e-1111-4f2c-9a55-0b8e6a1d2f3c",
+        email="stored@example.com",
+        password="hash",
+        is_active=False,
+        created_at=created_at,
+    )
+
+    assert user.id == "4c8e5c1e-1111-4f2c-9a55-0b8e6a1d2f3c"
+    assert user.email == "stored@example.com"
+    assert user.created_at == created_at
+    assert not user.is_active
+
+
+def test_user_has_no_instance_dict():
+    user = User(email="slots@example.com")
+
+    assert not hasattr(user, "__dict__")
+    with pytest.raises(AttributeError):
+        user.unknown = True
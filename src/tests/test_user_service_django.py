@@ -1,3 +1,5 @@
+import hashlib
+
 import pytest
 from users.services.user_services import UserService
 from users.adapters.django_repository import DjangoUserRepository
@@ -9,18 +11,61 @@ pytestmark = pytest.mark.django_db
 
 
 @pytest.fixture
-def service():
-    return UserService(DjangoUnitOfWork())
+def service(hasher):
+    return UserService(DjangoUnitOfWork(), hasher=hasher)
 
 
-def test_register_user(service):
+def test_register_user(service, query_budget):
     cmd = RegisterUserCommand(email="new@example.com", password="mypassword")
-    user = service.register(cmd)
+    with query_budget("service.register"):
+        user = service.register(cmd)
     assert user.email == "new@example.com"
 
 
-def test_register_duplicate_user(service):
+def test_register_duplicate_user(service, query_budget):
     cmd = RegisterUserCommand(email="dup@example.com", password="secret")
     service.register(cmd)
-    with pytest.raises(UserAlreadyExists):
+    with query_budget("service.register"), pytest.raises(UserAlreadyExists):
         service.register(cmd)
+
+
+def test_register_many_persists_password_hash(service, query_budget):
+    with query_budget("service.register_many"):
+        report = service.register_many(
+            [
+                RegisterUserCommand(email="bulk1@example.com", password="Password123@"),
+                RegisterUserCommand(email="bulk2@example.com", password="Password123@"),
+            ]
+        )
+
+    assert report.created == 2
+    with query_budget("service.authenticate"):
+        user = service.authenticate("bulk1@example.com", "Password123@")
+    assert user.email == "bulk1@example.com"
+
+
+def test_authenticate_rehashes_legacy_password(service, query_budget):
+    user = service.register(
+        RegisterUserCommand(email="legacy@example.com", password="secret")
+    )
+    user.password_hash = hashlib.sha256(b"secret").hexdigest()
+    DjangoUserRepository().update(user)
+
+    with query_budget("service.authenticate.rehash"):
+        service.authenticate("legacy@example.com", "secret")
+
+    stored = DjangoUserRepository().get_by_email("legacy@example.com")
+    assert stored.password_hash.startswith("pbkdf2_sha256$")
+    assert service.authenticate("legacy@example.com", "secret") == user
+
+
+def test_list_users_fetches_one_page(service, query_budget):
+    for i in range(3):
+        service.register(
+            RegisterUserCommand(email=f"page{i}@example.com", password="secret")
+        )
+
+    with query_budget("service.list_users"):
+        users, cursor = service.list_users(limit=2)
+
+    assert len(users) == 2 and cursor is not None
@@ -1,14 +1,18 @@
 import pytest
-from users.core.commands import RegisterUserCommand
-from users.services.user_services import UserService
-from users.core.exceptions import UserAlreadyExists, UserNotFound
+from users.core.commands import (
+    RegisterUserCommand,
+    SetUsersActiveCommand,
+    UserSelection,
+)
+from users.services.user_services import RegistrationStatus, UserService
+from users.core.exceptions import InvalidOperation, UserAlreadyExists, UserNotFound
 from users.adapters.repository import InMemoryRepository
 from users.services.unit_of_work import InMemoryUnitOfWork
 
 
 @pytest.fixture
-def service():
-    return UserService(InMemoryUnitOfWork())
+def service(hasher):
+    return UserService(InMemoryUnitOfWork(), hasher=hasher)
 
 
 def test_register_user(service):
@@ -19,11 +23,15 @@ def test_register_user(service):
     assert hasattr(user, "password_hash")
 
 
-def test_register_duplicate_user(service):
+def test_register_duplicate_user(service, monkeypatch):
     cmd = RegisterUserCommand(email="dup@example.com", password="secret")
     service.register(cmd)
+    hashed = []
+    monkeypatch.setattr(service, "_hash_password", hashed.append)
     with pytest.raises(UserAlreadyExists):
-        service.register(cmd)
+        service.register(RegisterUserCommand(email="DUP@example.com", password="x"))
+    # rejeté avant le hachage
+    assert hashed == []
 
 
 def test_authenticate_success(service):
@@ -43,3 +51,51 @@ def test_authenticate_fail(service):
 
     with pytest.raises(UserNotFound):  # mauvais email
         service.authenticate("notfound@example.com", "whatever")
+
+
+def test_authenticate_rejects_deactivated_users(service):
+    user = service.register(
+        RegisterUserCommand(email="inactive@example.com", password="secret")
+    )
+    service.set_active_many(
+        SetUsersActiveCommand(UserSelection(ids=(user.id,)), is_active=False)
+    )
+
+    with pytest.raises(InvalidOperation):
+        service.authenticate("inactive@example.com", "secret")
+
+
+def test_register_many_reports_each_command(service):
+    service.register(RegisterUserCommand(email="taken@example.com", password="x"))
+
+    report = service.register_many(
+        [
+            RegisterUserCommand(email="a@example.com", password="Password123@"),
+            RegisterUserCommand(email="taken@example.com", password="Password123@"),
+            RegisterUserCommand(email="a@example.com", password="Password123@"),
+            RegisterUserCommand(email="not-an-email", password="Password123@"),
+            RegisterUserCommand(email="b@example.com", password="weak"),
+        ]
+    )
+
+    assert [r.status for r in report.results] == [
+        RegistrationStatus.CREATED,
+        RegistrationStatus.ALREADY_EXISTS,
+        RegistrationStatus.ALREADY_EXISTS,
+        RegistrationStatus.INVALID,
+        RegistrationStatus.INVALID,
+    ]
+    assert (report.created, report.already_exists, report.invalid) == (1, 2, 2)
+    assert (
+        service.authenticate("a@example.com", "Password123@").email == "a@example.com"
+    )
+
+
+def test_register_and_login_ignore_email_case(service):
+    user = service.register(
+        RegisterUserCommand(email="Case@Example.com", password="secret")
+    )
+
+    assert service.authenticate("case@example.com", "secret") == user
+    with pytest.raises(UserAlreadyExists):
+        service.register(RegisterUserCommand(email="CASE@example.com", password="x"))
@@ -0,0 +1,56 @@
+import uuid
+
+import pytest
+
+from users.core.exceptions import InvalidEmailException, InvalidPasswordException
+from users.core.value_object import Email, Password, UserID
+
+
+@pytest.mark.parametrize(
+    "pwd, valid",
+    [
+        ("Password123@", True),
+        ("password123@", False),  # pas de majuscule
+        ("PASSWORD123@", False),  # pas de minuscule
+        ("Password@@@", False),  # pas de chiffre
+        ("Password123", False),  # pas de caractère spécial
+        ("Pa1@", False),  # trop court
+        ("Pass\nword1@", True),
+    ],
+)
+def test_password_policy(pwd, valid):
+    if valid:
+        assert Password(pwd).value == pwd
+    else:
+        with pytest.raises(InvalidPasswordException):
+            Password(pwd)
+
+
+def test_email_rejects_trailing_garbage():
+    with pytest.raises(InvalidEmailException):
+        Email("a@example.com\n")
+
+
+def test_user_id_accepts_non_canonical_uuid_forms():
+    value = uuid.uuid4()
+    assert UserID(str(value)).value == str(value)
+    assert UserID(value.hex.upper()).value == value.hex.upper()
+    with pytest.raises(ValueError):
+        UserID("not-a-uuid")
+
+
+def test_validate_many_reports_errors_by_position():
+    report = Email.validate_many(["a@example.com", "bad", None, "b@example.com"])
+
+    assert [(i, e.value) for i, e in report.valid] == [
+        (0, "a@example.com"),
+        (3, "b@example.com"),
+    ]
+    assert [i for i, _ in report.errors] == [1, 2]
+    assert not report.ok
+
+
+def test_of_interns_email_instances():
+    assert Email.of("hot@example.com") is Email.of("hot@example.com")
+    with pytest.raises(InvalidEmailException):
+        Email.of("bad")
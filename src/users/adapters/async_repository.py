@@ -0,0 +1,82 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+
+from users.adapters.repository import InMemoryRepository
+from users.core.models import User
+from users.core.value_object import normalize_email
+
+
+class AbstractAsyncUserRepository(ABC):
+    """Interface asynchrone du UserRepository (déploiement ASGI)"""
+
+    async def exists(self, email: str) -> bool:
+        return await self._exists(normalize_email(email))
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._get_by_email(normalize_email(email))
+
+    async def get_login(self, email: str) -> Optional[User]:
+        """Voir AbstractUserRepository.get_login."""
+        return await self._get_login(normalize_email(email))
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return await self._get_by_id(user_id)
+
+    async def save(self, user: User) -> User:
+        return await self._save(user)
+
+    async def save_many(self, users: Iterable[User]) -> List[User]:
+        return await self._save_many(list(users))
+
+    async def update(self, user: User) -> User:
+        return await self._update(user)
+
+    async def _get_login(self, email: str) -> Optional[User]:
+        return await self._get_by_email(email)
+
+    @abstractmethod
+    async def _exists(self, email: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def _get_by_email(self, email: str) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def _get_by_id(self, user_id: str) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def _save(self, user: User) -> User:
+        pass
+
+    @abstractmethod
+    async def _save_many(self, users: List[User]) -> List[User]:
+        pass
+
+    @abstractmethod
+    async def _update(self, user: User) -> User:
+        pass
+
+
+class AsyncInMemoryRepository(AbstractAsyncUserRepository):
+    def __init__(self, inner: Optional[InMemoryRepository] = None):
+        self.inner = inner if inner is not None else InMemoryRepository()
+
+    async def _exists(self, email: str) -> bool:
+        return self.inner.exists(email)
+
+    async def _get_by_email(self, email: str) -> Optional[User]:
+        return self.inner.get_by_email(email)
+
+    async def _get_by_id(self, user_id: str) -> Optional[User]:
+        return self.inner.get_by_id(user_id)
+
+    async def _save(self, user: User) -> User:
+        return self.inner.save(user)
+
+    async def _save_many(self, users: List[User]) -> List[User]:
+        return self.inner.save_many(users)
+
+    async def _update(self, user: User) -> User:
+        return self.inner.update(user)
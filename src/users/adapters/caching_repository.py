@@ -0,0 +1,247 @@
+"""
+Repository décorateur avec cache en lecture (read-through).
+
+Deux niveaux :
+  1. un cache local au process, LRU borné avec expiration (TTL) ;
+  2. un backend partagé optionnel, n'importe quel objet offrant l'API du
+     cache Django (get / set / delete_many), ex. `django.core.cache.caches["default"]`.
+
+Les entrées sont indexées par email et par id ; toute écriture passant par le
+repository invalide les deux clés.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from users.adapters.pagination import UserCursor
+from users.adapters.repository import AbstractUserRepository, ActiveUpdate
+from users.core.commands import UserSelection
+from users.core.models import User
+from users.core.value_object import normalize_email
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    backend_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    # incrémentés par tous les threads du process : += n'est pas atomique
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.backend_hits + self.misses
+        return (self.hits + self.backend_hits) / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            counters = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+            return {**counters, "hit_ratio": self.hit_ratio}
+
+
+class LRUCache:
+    """Cache LRU borné à `maxsize` entrées, chacune expirant après `ttl` secondes."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        stats: CacheStats,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = stats
+        self._clock = clock
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.stats.incr("evictions")
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+
+class CachingUserRepository(AbstractUserRepository):
+    def __init__(
+        self,
+        inner: AbstractUserRepository,
+        maxsize: int = 10_000,
+        ttl: float = 60.0,
+        backend: Any = None,
+        backend_ttl: Optional[float] = None,
+        key_prefix: str = "users",
+    ):
+        self.inner = inner
+        self.stats = CacheStats()
+        self.local = LRUCache(maxsize, ttl, self.stats)
+        self.backend = backend
+        self.backend_ttl = backend_ttl if backend_ttl is not None else ttl
+        self.key_prefix = key_prefix
+
+    # --- clés et sérialisation ---
+    def _email_key(self, email: str) -> str:
+        return f"{self.key_prefix}:email:{normalize_email(email)}"
+
+    def _id_key(self, user_id: str) -> str:
+        return f"{self.key_prefix}:id:{user_id}"
+
+    @staticmethod
+    def _dump(user: User) -> tuple:
+        # on cache un instantané : un appelant qui modifie son User sans le
+        # sauvegarder ne doit pas polluer le cache
+        return (user.id, user.email, user.password, user.is_active, user.created_at)
+
+    @staticmethod
+    def _load(snapshot: tuple) -> User:
+        return User.hydrate(*snapshot)
+
+    # --- lecture ---
+    def _lookup(self, key: str, load: Callable[[], Optional[User]]) -> Optional[User]:
+        snapshot = self.local.get(key)
+        if snapshot is not _MISSING:
+            self.stats.incr("hits")
+            return self._load(snapshot)
+        if self.backend is not None:
+            snapshot = self.backend.get(key)
+            if snapshot is not None:
+                self.stats.incr("backend_hits")
+                self.local.set(key, snapshot)
+                return self._load(snapshot)
+        self.stats.incr("misses")
+        user = load()
+        if user is not None:
+            self._store(user)
+        return user
+
+    def _store(self, user: User) -> None:
+        snapshot = self._dump(user)
+        keys = (self._email_key(user.email), self._id_key(user.id))
+        for key in keys:
+            self.local.set(key, snapshot)
+        if self.backend is not None:
+            self.backend.set_many(dict.fromkeys(keys, snapshot), self.backend_ttl)
+
+    def invalidate(self, user: User) -> None:
+        """Retire un utilisateur des deux niveaux, y compris sous son ancien email."""
+        keys = {self._email_key(user.email), self._id_key(user.id)}
+        previous = self.local.get(self._id_key(user.id))
+        if previous is not _MISSING:
+            keys.add(self._email_key(previous[1]))
+        self.local.delete_many(keys)
+        if self.backend is not None:
+            previous = self.backend.get(self._id_key(user.id))
+            if previous is not None:
+                keys.add(self._email_key(previous[1]))
+            self.backend.delete_many(list(keys))
+        self.stats.incr("invalidations")
+
+    def _get_by_email(self, email: str) -> Optional[User]:
+        return self._lookup(
+            self._email_key(email), lambda: self.inner.get_by_email(email)
+        )
+
+    def _get_by_id(self, user_id: str) -> Optional[User]:
+        return self._lookup(
+            self._id_key(user_id), lambda: self.inner.get_by_id(user_id)
+        )
+
+    def _exists(self, email: str) -> bool:
+        if self.local.get(self._email_key(email)) is not _MISSING:
+            self.stats.incr("hits")
+            return True
+        self.stats.incr("misses")
+        return self.inner.exists(email)
+
+    def _exists_many(self, emails: Set[str]) -> Set[str]:
+        return self.inner.exists_many(emails)
+
+    def _list(self) -> List[User]:
+        return self.inner.list()
+
+    def _iter_users(
+        self, batch_size: int, after: Optional[UserCursor]
+    ) -> Iterator[User]:
+        return self.inner.iter_users(batch_size, after=after)
+
+    def _iter_emails(self, batch_size: int, since: Optional[datetime]) -> Iterator[str]:
+        return self.inner.iter_emails(batch_size, since=since)
+
+    # --- écriture ---
+    def _save(self, user: User) -> User:
+        saved = self.inner.save(user)
+        self.invalidate(user)
+        return saved
+
+    def _create_if_absent(self, user: User) -> bool:
+        created = self.inner.create_if_absent(user)
+        if created:
+            self.invalidate(user)
+        return created
+
+    def _update(self, user: User) -> User:
+        updated = self.inner.update(user)
+        self.invalidate(user)
+        return updated
+
+    def _update_many(self, users: List[User]) -> List[User]:
+        updated = self.inner.update_many(users)
+        for user in users:
+            self.invalidate(user)
+        return updated
+
+    def _set_active(
+        self,
+        selection: UserSelection,
+        is_active: bool,
+        limit: int,
+        after: Optional[str],
+    ) -> ActiveUpdate:
+        result = self.inner.set_active(selection, is_active, limit, after)
+        for user_id, email in result.changed:
+            self.invalidate(User.hydrate(user_id, email, None, None, None))
+        return result
+
+    def _save_many(self, users: List[User]) -> List[User]:
+        saved = self.inner.save_many(users)
+        for user in users:
+            self.invalidate(user)
+        return saved
@@ -0,0 +1,78 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+from django.utils import timezone as django_timezone
+
+from account.models import OutboxEvent
+from users.adapters.outbox import AbstractOutbox, Failure, OutboxMessage
+from users.core.events import DomainEvent, event_from_payload
+
+
+def to_rows(events: List[DomainEvent]) -> List[OutboxEvent]:
+    return [OutboxEvent(name=e.name, payload=e.to_payload()) for e in events]
+
+
+class DjangoOutbox(AbstractOutbox):
+    """
+    Outbox dans la table users_outbox. Les workers se partagent les messages
+    avec SELECT ... FOR UPDATE SKIP LOCKED quand la base le permet ; sous
+    SQLite (pas de verrou de ligne, écritures sérialisées), l'UPDATE
+    conditionnel qui pose le bail suffit à ce qu'un message n'ait qu'un
+    seul preneur.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS):
+        self.using = using
+
+    @property
+    def _objects(self):
+        return OutboxEvent.objects.using(self.using)
+
+    def add(self, events: List[DomainEvent]) -> None:
+        if events:
+            self._objects.bulk_create(to_rows(events))
+
+    def claim(self, limit: int, lease: float) -> List[OutboxMessage]:
+        now = django_timezone.now()
+        token = uuid.uuid4().hex
+        with transaction.atomic(using=self.using):
+            pending = self._objects.filter(
+                dispatched_at=None, failed_at=None, available_at__lte=now
+            ).order_by("available_at", "id")
+            if connections[self.using].features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            ids = list(pending.values_list("id", flat=True)[:limit])
+            if not ids:
+                return []
+            self._objects.filter(
+                id__in=ids, dispatched_at=None, available_at__lte=now
+            ).update(claimed_by=token, available_at=now + timedelta(seconds=lease))
+        rows = self._objects.filter(id__in=ids, claimed_by=token).values_list(
+            "id", "name", "payload", "attempts"
+        )
+        return [
+            OutboxMessage(pk, event_from_payload(name, payload), attempts)
+            for pk, name, payload, attempts in rows
+        ]
+
+    def mark_dispatched(self, messages: List[OutboxMessage]) -> None:
+        if messages:
+            self._objects.filter(id__in=[m.id for m in messages]).update(
+                dispatched_at=django_timezone.now(), last_error=""
+            )
+
+    def mark_failed(self, failures: List[Failure]) -> None:
+        now = django_timezone.now()
+        with transaction.atomic(using=self.using):
+            for failure in failures:
+                changes = {"attempts": F("attempts") + 1, "last_error": failure.error}
+                if failure.retry_at is None:
+                    changes["failed_at"] = now
+                else:
+                    changes["available_at"] = datetime.fromtimestamp(
+                        failure.retry_at, tz=timezone.utc
+                    )
+                self._objects.filter(id=failure.message.id).update(**changes)
@@ -1,28 +1,438 @@
+import contextlib
+import uuid
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+from django.db.models import Q
+from users.core.exceptions import UserAlreadyExists
 from users.core.models import User
-from account.models import UserModel
-from users.adapters.repository import AbstractUserRepository
-from typing import Optional, List
+from users.core.value_object import normalize_email
+from account.models import LoginProjection, OutboxEvent, UserModel
+from users.adapters.async_repository import AbstractAsyncUserRepository
+from users.adapters.django_outbox import to_rows
+from users.adapters.pagination import UserCursor
+from users.adapters.repository import AbstractUserRepository, ActiveUpdate
+from users.core.commands import UserSelection
+from users.instrumentation import instrumented
+from typing import Iterable, Iterator, Optional, List, Set, Tuple
+
+
+# colonnes lues pour hydrater un User sans instancier de UserModel
+USER_FIELDS = ("id", "email", "password", "is_active", "created_at")
+
+
+# colonnes de la projection de login, dans l'ordre de User.hydrate
+LOGIN_FIELDS = ("user_id", "email", "password", "is_active")
+PROJECTED_FIELDS = ["email_normalized", "email", "password", "is_active"]
+
+
+def hydrate(row: tuple) -> User:
+    user_id, email, password, is_active, created_at = row
+    return User.hydrate(str(user_id), email, password, is_active, created_at)
+
+
+def hydrate_login(row: tuple) -> User:
+    user_id, email, password, is_active = row
+    return User.hydrate(str(user_id), email, password, is_active, None)
+
+
+def project(
+    users: List[User],
+    batch_size: Optional[int] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Reporte les utilisateurs dans la projection de login (upsert par id)."""
+    LoginProjection.objects.using(using).bulk_create(
+        [LoginProjection.from_domain(user) for user in users],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=PROJECTED_FIELDS,
+    )
 
 
 class DjangoUserRepository(AbstractUserRepository):
-    def exists(self, email: str) -> bool:
-        return UserModel.objects.filter(email=email).exists()
+    def __init__(self, batch_size: int = 1000, using: str = DEFAULT_DB_ALIAS):
+        # taille des lots pour les requêtes IN et les bulk_create
+        self.batch_size = batch_size
+        # base de données (alias) : un shard dans ShardedUserRepository
+        self.using = using
+        self._users = UserModel.objects.db_manager(using)
+        self._logins = LoginProjection.objects.db_manager(using)
 
+    @instrumented("repository.get_by_email")
     def _get_by_email(self, email: str) -> Optional[User]:
-        obj = UserModel.objects.filter(email=email).first()
+        obj = self._users.filter(email_normalized=email).first()
         return obj.to_domain() if obj else None
 
+    @instrumented("repository.get_by_id")
     def _get_by_id(self, user_id: str) -> Optional[User]:
-        obj = UserModel.objects.filter(id=user_id).first()
+        obj = self._users.filter(id=user_id).first()
         return obj.to_domain() if obj else None
 
+    @instrumented("repository.get_login")
+    def _get_login(self, email: str) -> Optional[User]:
+        # une ligne de la projection, sans instancier de modèle
+        rows = self._logins.filter(email_normalized=email).values_list(*LOGIN_FIELDS)[
+            :1
+        ]
+        return next(map(hydrate_login, rows), None)
+
     def _list(self) -> List[User]:
-        return [u.to_domain() for u in UserModel.objects.all()]
+        return list(self.iter_users(self.batch_size))
+
+    def _iter_users(
+        self, batch_size: int, after: Optional[UserCursor]
+    ) -> Iterator[User]:
+        # une requête par page, bornée par l'index (created_at, id) : pas d'OFFSET
+        # et pas de liste complète en mémoire
+        queryset = self._users.order_by("created_at", "id")
+        while True:
+            page = queryset
+            if after is not None:
+                page = page.filter(
+                    Q(created_at__gt=after.created_at)
+                    | Q(created_at=after.created_at, id__gt=after.id)
+                )
+            count = 0
+            rows = page[:batch_size].values_list(*USER_FIELDS)
+            for row in rows.iterator(chunk_size=batch_size):
+                count += 1
+                user = hydrate(row)
+                yield user
+            if count < batch_size:
+                return
+            after = UserCursor.after(user)
+
+    @instrumented("repository.iter_emails")
+    def _iter_emails(self, batch_size: int, since: Optional[datetime]) -> Iterator[str]:
+        # une colonne, par pages keyset sur (created_at, id)
+        queryset = self._users.order_by("created_at", "id")
+        if since is not None:
+            queryset = queryset.filter(created_at__gte=since)
+        after = None
+        while True:
+            page = queryset
+            if after is not None:
+                page = page.filter(
+                    Q(created_at__gt=after[0]) | Q(created_at=after[0], id__gt=after[1])
+                )
+            rows = list(
+                page[:batch_size].values_list("created_at", "id", "email_normalized")
+            )
+            for row in rows:
+                yield row[2]
+            if len(rows) < batch_size:
+                return
+            after = rows[-1]
 
+    @instrumented("repository.save")
     def _save(self, user: User) -> User:
         obj = UserModel.from_domain(user)
-        obj.save()
+        with transaction.atomic(using=self.using):
+            # bulk_create : pas de post_save (account.signals), la projection
+            # est écrite ici
+            self._users.bulk_create([obj])
+            project([user], using=self.using)
         return obj.to_domain()
 
+    @instrumented("repository.update")
+    def _update(self, user: User) -> User:
+        # UPDATE ciblé : save() sur une instance neuve ferait un INSERT
+        with transaction.atomic(using=self.using):
+            self._users.filter(id=user.id).update(
+                email=user.email,
+                email_normalized=normalize_email(user.email),
+                password=user.password,
+                is_active=user.is_active,
+            )
+            project([user], using=self.using)
+        return user
+
+    @instrumented("repository.exists")
     def _exists(self, email: str) -> bool:
-        return self.exists(email)
+        return self._users.filter(email_normalized=email).exists()
+
+    @instrumented("repository.create_if_absent")
+    def _create_if_absent(self, user: User) -> bool:
+        with transaction.atomic(using=self.using):
+            created = self._insert_if_absent(user)
+            if created:
+                project([user], using=self.using)
+        return created
+
+    def _insert_if_absent(self, user: User) -> bool:
+        obj = UserModel.from_domain(user)
+        connection = connections[self.using]
+        if connection.vendor not in ("sqlite", "postgresql"):
+            # pas d'ON CONFLICT portable : insertion dans un savepoint
+            try:
+                with transaction.atomic(using=connection.alias):
+                    self._users.bulk_create([obj])
+            except IntegrityError:
+                return False
+            return True
+
+        # une seule requête : pas de fenêtre entre la vérification et l'insert
+        fields = UserModel._meta.concrete_fields
+        qn = connection.ops.quote_name
+        sql = (
+            "INSERT INTO {} ({}) VALUES ({}) ON CONFLICT DO NOTHING RETURNING {}"
+        ).format(
+            qn(UserModel._meta.db_table),
+            ", ".join(qn(f.column) for f in fields),
+            ", ".join(["%s"] * len(fields)),
+            qn(UserModel._meta.pk.column),
+        )
+        params = [
+            f.get_db_prep_save(f.pre_save(obj, add=True), connection) for f in fields
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone() is not None
+
+    @instrumented("repository.set_active")
+    def _set_active(
+        self,
+        selection: UserSelection,
+        is_active: bool,
+        limit: int,
+        after: Optional[str],
+    ) -> ActiveUpdate:
+        queryset = self._users.order_by("id")
+        if selection.ids is not None:
+            # lot pris dans la liste d'ids : pas de IN géant à chaque requête
+            ids = sorted({str(uuid.UUID(str(i))) for i in selection.ids})
+            remaining = [i for i in ids if after is None or i > after]
+            window = remaining[:limit]
+            queryset = queryset.filter(id__in=window)
+            next_after = window[-1] if len(remaining) > limit else None
+        elif after is not None:
+            queryset = queryset.filter(id__gt=after)
+        if selection.email_suffix is not None:
+            queryset = queryset.filter(
+                email_normalized__endswith=selection.email_suffix
+            )
+        if selection.created_from is not None:
+            queryset = queryset.filter(created_at__gte=selection.created_from)
+        if selection.created_to is not None:
+            queryset = queryset.filter(created_at__lt=selection.created_to)
+
+        rows = queryset.exclude(is_active=is_active).values_list(
+            "id", "email_normalized"
+        )
+        if selection.ids is None:
+            rows = rows[:limit]
+        changed = [(str(pk), email) for pk, email in rows]
+        if selection.ids is None:
+            next_after = changed[-1][0] if len(changed) == limit else None
+
+        if changed:
+            ids = [pk for pk, _ in changed]
+            with transaction.atomic(using=self.using):
+                self._users.filter(id__in=ids).update(is_active=is_active)
+                self._logins.filter(user_id__in=ids).update(is_active=is_active)
+        return ActiveUpdate(changed, next_after)
+
+    @instrumented("repository.exists_many")
+    def _exists_many(self, emails: Set[str]) -> Set[str]:
+        found = set()
+        pending = list(emails)
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start : start + self.batch_size]
+            found.update(
+                self._users.filter(email_normalized__in=chunk).values_list(
+                    "email_normalized", flat=True
+                )
+            )
+        return found
+
+    @instrumented("repository.save_many")
+    def _save_many(self, users: List[User]) -> List[User]:
+        with transaction.atomic(using=self.using):
+            objs = self._users.bulk_create(
+                [UserModel.from_domain(user) for user in users],
+                batch_size=self.batch_size,
+            )
+            project(users, self.batch_size, self.using)
+        return [obj.to_domain() for obj in objs]
+
+    @instrumented("repository.update_many")
+    def _update_many(self, users: List[User]) -> List[User]:
+        with transaction.atomic(using=self.using):
+            self._users.bulk_update(
+                [UserModel.from_domain(user) for user in users],
+                ["email", "email_normalized", "password", "is_active"],
+                batch_size=self.batch_size,
+            )
+            project(users, self.batch_size, self.using)
+        return users
+
+    # --- déplacements entre shards (users.adapters.sharding) ---
+    def existing_ids(self, user_ids: Iterable[str]) -> Set[str]:
+        """Ids présents dans cette base."""
+        return {
+            str(pk)
+            for pk in self._users.filter(id__in=list(user_ids)).values_list(
+                "id", flat=True
+            )
+        }
+
+    def restore_many(self, users: List[User]) -> None:
+        """
+        Insère des utilisateurs venus d'une autre base en gardant leur
+        created_at ; les lignes déjà présentes sont ignorées (reprise).
+        """
+        with transaction.atomic(using=self.using):
+            self._users.bulk_create(
+                [UserModel.from_domain(user) for user in users],
+                batch_size=self.batch_size,
+                ignore_conflicts=True,
+            )
+            # auto_now_add a remplacé created_at ; bulk_update ne l'applique pas
+            self._users.bulk_update(
+                [
+                    UserModel(id=user.id, created_at=user.created_at)
+                    for user in users
+                    if user.created_at is not None
+                ],
+                ["created_at"],
+                batch_size=self.batch_size,
+            )
+            project(users, self.batch_size, self.using)
+
+    def delete_many(self, user_ids: Iterable[str]) -> int:
+        """Supprime des utilisateurs (et leur ligne de projection) de cette base."""
+        with transaction.atomic(using=self.using):
+            _, deleted = self._users.filter(id__in=list(user_ids)).delete()
+        return deleted.get(UserModel._meta.label, 0)
+
+    # --- maintenance des hash (manage.py rehash_passwords) ---
+    def iter_password_hashes(
+        self, pattern: str, batch_size: int, after: Optional[str] = None
+    ) -> Iterator[List[Tuple[str, str]]]:
+        """
+        Lots de (id, hash) dont le hash correspond à l'expression régulière
+        `pattern`, par id croissant strictement après `after` : une requête
+        par lot, à relancer d'où l'on veut.
+        """
+        queryset = self._users.filter(password__regex=pattern).order_by("id")
+        while True:
+            page = queryset if after is None else queryset.filter(id__gt=after)
+            rows = [
+                (str(pk), password)
+                for pk, password in page[:batch_size].values_list("id", "password")
+            ]
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
+
+    @instrumented("repository.replace_password_hashes")
+    def replace_password_hashes(self, changes: List[Tuple[str, str, str]]) -> int:
+        """
+        Applique des (id, ancien hash, nouveau hash) par bulk_update, sur les
+        utilisateurs et la projection de login ; un hash modifié depuis sa
+        lecture (login entre-temps) est laissé tel quel. Retourne le nombre
+        de hash remplacés.
+        """
+        with transaction.atomic(using=self.using):
+            current = {
+                str(pk): password
+                for pk, password in self._users.select_for_update()
+                .filter(id__in=[pk for pk, _, _ in changes])
+                .values_list("id", "password")
+            }
+            changes = [c for c in changes if current.get(c[0]) == c[1]]
+            self._users.bulk_update(
+                [UserModel(id=pk, password=new) for pk, _, new in changes],
+                ["password"],
+                batch_size=self.batch_size,
+            )
+            self._logins.bulk_update(
+                [LoginProjection(user_id=pk, password=new) for pk, _, new in changes],
+                ["password"],
+                batch_size=self.batch_size,
+            )
+        return len(changes)
+
+
+class AsyncDjangoUserRepository(AbstractAsyncUserRepository):
+    """
+    Même stockage que DjangoUserRepository via l'ORM asynchrone de Django.
+    Les lectures passent par l'ORM asynchrone. L'ORM async n'a pas de
+    transaction.atomic : les écritures (utilisateur, projection de login,
+    outbox) sont faites ensemble dans une transaction, en sync_to_async.
+    """
+
+    def __init__(self, batch_size: int = 1000, using: str = DEFAULT_DB_ALIAS):
+        self.batch_size = batch_size
+        # base de données (alias) : un shard dans AsyncShardedUserRepository ;
+        # l'outbox reste dans "default"
+        self.using = using
+        self._users = UserModel.objects.db_manager(using)
+        self._logins = LoginProjection.objects.db_manager(using)
+
+    async def _exists(self, email: str) -> bool:
+        return await self._users.filter(email_normalized=email).aexists()
+
+    async def _get_by_email(self, email: str) -> Optional[User]:
+        obj = await self._users.filter(email_normalized=email).afirst()
+        return obj.to_domain() if obj else None
+
+    async def _get_by_id(self, user_id: str) -> Optional[User]:
+        obj = await self._users.filter(id=user_id).afirst()
+        return obj.to_domain() if obj else None
+
+    async def _get_login(self, email: str) -> Optional[User]:
+        rows = self._logins.filter(email_normalized=email).values_list(*LOGIN_FIELDS)[
+            :1
+        ]
+        async for row in rows:
+            return hydrate_login(row)
+        return None
+
+    def _write(self, users: List[User], insert: bool) -> List[User]:
+        # utilisateurs, projection et outbox dans une transaction : un échec
+        # en cours de route ne laisse pas d'utilisateur sans ligne de login
+        with contextlib.ExitStack() as stack:
+            for alias in dict.fromkeys([self.using, DEFAULT_DB_ALIAS]):
+                stack.enter_context(transaction.atomic(using=alias))
+            if insert:
+                objs = self._users.bulk_create(
+                    [UserModel.from_domain(user) for user in users],
+                    batch_size=self.batch_size,
+                )
+            else:
+                for user in users:
+                    self._users.filter(id=user.id).update(
+                        email=user.email,
+                        email_normalized=normalize_email(user.email),
+                        password=user.password,
+                        is_active=user.is_active,
+                    )
+            project(users, self.batch_size, self.using)
+            events = [event for user in users for event in user.pull_events()]
+            if events:
+                OutboxEvent.objects.bulk_create(to_rows(events))
+        return [obj.to_domain() for obj in objs] if insert else users
+
+    async def _save(self, user: User) -> User:
+        try:
+            (saved,) = await sync_to_async(self._write)([user], insert=True)
+        except IntegrityError:
+            # inscription concurrente du même email : exists() puis save() ne
+            # sont pas dans une même transaction, la contrainte unique tranche
+            raise UserAlreadyExists(
+                f"Un utilisateur avec l'email {user.email} existe déjà."
+            )
+        return saved
+
+    async def _save_many(self, users: List[User]) -> List[User]:
+        return await sync_to_async(self._write)(users, insert=True)
+
+    async def _update(self, user: User) -> User:
+        (updated,) = await sync_to_async(self._write)([user], insert=False)
+        return updated
@@ -0,0 +1,491 @@
+"""
+Filtre de Bloom des emails enregistrés, devant le repository.
+
+La plupart des logins ratés visent des emails inconnus : le filtre répond
+« absent » sans requête quand l'email n'a jamais été ajouté. Il ne connaît
+pas de faux négatifs pour ce que ce process a vu, seulement des faux
+positifs (taux réglable), qui retombent sur le repository.
+
+- chargé au premier usage, par un parcours en flux des emails normalisés
+  (iter_emails) ; les écritures passant par le repository l'alimentent ;
+- persistable dans un fichier projeté en mémoire (mmap, copie privée) : un
+  worker qui démarre rattrape seulement les utilisateurs créés depuis ;
+- avec un cache partagé (`backend`, API du cache Django), chaque écriture
+  passant par le filtre incrémente un compteur de génération et publie ses
+  emails sous cette génération (journal) ; lors d'un « absent », un worker
+  en retard rejoue les entrées manquantes, changements d'email compris.
+  Un « absent » est alors définitif pour tout ce qui a été validé ;
+- les écritures qui contournent le filtre (service asynchrone, commandes)
+  et les entrées du journal expirées sont rattrapées par un parcours sur
+  created_at, au plus tard `refresh_interval` secondes après.
+
+Pas de suppression : un email retiré reste un faux positif. exists_many
+confirme les « absents » auprès du repository tant qu'un autre process
+peut écrire : une insertion groupée ne doit pas buter sur l'unicité.
+"""
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set
+
+from users.adapters.pagination import UserCursor
+from users.adapters.repository import AbstractUserRepository, ActiveUpdate
+from users.core.commands import UserSelection
+from users.core.models import User
+from users.core.value_object import normalize_email
+from users.instrumentation import instrumented
+
+logger = logging.getLogger(__name__)
+
+# magic, version, nombre de hachages, nombre de bits, emails ajoutés,
+# date du dernier parcours (epoch)
+_HEADER = struct.Struct("<8sIIQQd")
+_MAGIC = b"USRBLOOM"
+_VERSION = 1
+
+
+class BloomFilter:
+    """
+    Tableau de `bits` bits et `hashes` positions par élément, obtenues par
+    double hachage d'un blake2b (stable d'un process à l'autre, contrairement
+    à hash()).
+    """
+
+    def __init__(self, bits: int, hashes: int, buffer=None):
+        self.bits = bits
+        self.hashes = hashes
+        self.count = 0
+        self.scanned_until = 0.0
+        size = _HEADER.size + (bits + 7) // 8
+        # en-tête puis bits : même disposition en mémoire et dans le fichier
+        self._buffer = buffer if buffer is not None else bytearray(size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        """Filtre dimensionné pour `capacity` emails au taux de faux positifs visé."""
+        capacity = max(capacity, 1)
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, key: str) -> None:
+        offset = _HEADER.size
+        buffer = self._buffer
+        added = False
+        # |= n'est pas atomique : deux ajouts concurrents perdraient un bit
+        with self._lock:
+            for position in self._positions(key):
+                index, mask = offset + (position >> 3), 1 << (position & 7)
+                if not buffer[index] & mask:
+                    buffer[index] |= mask
+                    added = True
+            if added:
+                self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        offset = _HEADER.size
+        buffer = self._buffer
+        return all(
+            buffer[offset + (position >> 3)] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def error_rate(self) -> float:
+        """Taux de faux positifs estimé pour le nombre d'emails ajoutés."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    # --- persistance ---
+    def save(self, path: str) -> None:
+        """Écrit le filtre (remplacement atomique du fichier)."""
+        _HEADER.pack_into(
+            self._buffer,
+            0,
+            _MAGIC,
+            _VERSION,
+            self.hashes,
+            self.bits,
+            self.count,
+            self.scanned_until,
+        )
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(self._buffer)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path: str) -> "BloomFilter":
+        """
+        Projette le fichier en mémoire en copie privée : les pages sont
+        partagées entre workers tant qu'ils n'y écrivent pas, et les ajouts
+        restent propres au process.
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(buffer) < _HEADER.size:
+            raise ValueError(f"Filtre d'emails invalide : {path}")
+        magic, version, hashes, bits, count, scanned_until = _HEADER.unpack_from(buffer)
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or len(buffer) != _HEADER.size + (bits + 7) // 8
+        ):
+            raise ValueError(f"Filtre d'emails invalide : {path}")
+        bloom = cls(bits, hashes, buffer)
+        bloom.count = count
+        bloom.scanned_until = scanned_until
+        return bloom
+
+
+@dataclass
+class FilterStats:
+    checks: int = 0
+    negatives: int = 0  # requêtes évitées
+    false_positives: int = 0  # « peut-être » suivi d'un utilisateur introuvable
+    refreshes: int = 0
+    replays: int = 0  # rattrapages par le journal de génération
+    emails: int = 0
+    error_rate: float = 0.0
+    bytes: int = 0
+    # incrémentés par tous les threads du process : += n'est pas atomique
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    @property
+    def negative_ratio(self) -> float:
+        return self.negatives / self.checks if self.checks else 0.0
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            counters = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+            return {**counters, "negative_ratio": self.negative_ratio}
+
+
+class EmailFilterRepository(AbstractUserRepository):
+    # marge de relecture : une transaction validée après le parcours peut
+    # porter un created_at antérieur
+    overlap = 60.0
+
+    def __init__(
+        self,
+        inner: AbstractUserRepository,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.01,
+        path: Optional[str] = None,
+        refresh_interval: Optional[float] = 5.0,
+        batch_size: int = 10_000,
+        clock: Callable[[], float] = time.time,
+        backend: Any = None,
+        key_prefix: str = "users:email_filter",
+        journal_ttl: float = 24 * 3600,
+        max_replay: int = 1000,
+    ):
+        self.inner = inner
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.batch_size = batch_size
+        self.clock = clock
+        self.backend = backend
+        self.key_prefix = key_prefix
+        self.journal_ttl = journal_ttl
+        self.max_replay = max_replay  # au-delà : parcours plutôt que rejeu
+        self.stats = FilterStats()
+        self._bloom: Optional[BloomFilter] = None
+        self._refreshed_at = 0.0
+        self._generation = 0  # dernière génération partagée intégrée
+        self._lock = threading.Lock()
+
+    # --- chargement ---
+    @property
+    def bloom(self) -> BloomFilter:
+        if self._bloom is None:
+            with self._lock:
+                if self._bloom is None:
+                    # lue avant le parcours : ce qui est publié pendant sera rejoué
+                    generation = self._shared_generation()
+                    self._bloom = self._load()
+                    self._refreshed_at = self.clock()
+                    self._generation = generation
+        return self._bloom
+
+    @instrumented("email_filter.load")
+    def _load(self) -> BloomFilter:
+        if self.path and os.path.exists(self.path):
+            try:
+                bloom = BloomFilter.open(self.path)
+            except (OSError, ValueError):
+                logger.warning("Filtre d'emails illisible : %s", self.path)
+            else:
+                expected = BloomFilter.for_capacity(self.capacity, self.error_rate)
+                if (bloom.bits, bloom.hashes) == (expected.bits, expected.hashes):
+                    self._scan(bloom, since=bloom.scanned_until - self.overlap)
+                    return bloom
+        return self._build()
+
+    def _build(self) -> BloomFilter:
+        bloom = BloomFilter.for_capacity(self.capacity, self.error_rate)
+        scanned = self._scan(bloom)
+        if scanned > self.capacity:
+            # capacité dépassée : taux de faux positifs au-delà de la cible
+            self.capacity = 2 * scanned
+            bloom = BloomFilter.for_capacity(self.capacity, self.error_rate)
+            self._scan(bloom)
+        if self.path:
+            bloom.save(self.path)
+        return bloom
+
+    def rebuild(self) -> BloomFilter:
+        """Parcours complet, sans relire le fichier, puis réécriture de celui-ci."""
+        with self._lock:
+            generation = self._shared_generation()
+            self._bloom = self._build()
+            self._refreshed_at = self.clock()
+            self._generation = generation
+        return self._bloom
+
+    def _scan(self, bloom: BloomFilter, since: Optional[float] = None) -> int:
+        """Ajoute les emails lus ; retourne leur nombre."""
+        started = self.clock()
+        after = datetime.fromtimestamp(since, timezone.utc) if since else None
+        scanned = 0
+        for email in self.inner.iter_emails(self.batch_size, since=after):
+            bloom.add(email)
+            scanned += 1
+        bloom.scanned_until = started
+        self._update_stats(bloom)
+        return scanned
+
+    def _update_stats(self, bloom: BloomFilter) -> None:
+        self.stats.emails = bloom.count
+        self.stats.error_rate = bloom.error_rate
+        self.stats.bytes = bloom.nbytes
+
+    def refresh(self) -> None:
+        """
+        Ajoute les utilisateurs créés depuis le dernier parcours, par d'autres
+        process compris.
+        """
+        bloom = self.bloom
+        self._refreshed_at = self.clock()
+        self._scan(bloom, since=bloom.scanned_until - self.overlap)
+        self.stats.incr("refreshes")
+
+    # --- génération partagée ---
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.key_prefix}:generation"
+
+    def _shared_generation(self) -> int:
+        if self.backend is None:
+            return 0
+        return self.backend.get(self._generation_key) or 0
+
+    def _publish(self, emails: List[str]) -> None:
+        """Nouvelle génération portant `emails`, pour les autres process."""
+        if self.backend is None or not emails:
+            return
+        try:
+            generation = self.backend.incr(self._generation_key)
+        except ValueError:  # clé absente (premier écrit, ou expulsée)
+            self.backend.add(self._generation_key, 0, None)
+            generation = self.backend.incr(self._generation_key)
+        self.backend.set(f"{self.key_prefix}:{generation}", emails, self.journal_ttl)
+
+    def _replay(self) -> bool:
+        """
+        Rejoue les générations publiées depuis la dernière intégrée ; faux
+        si le filtre était à jour.
+        """
+        shared = self._shared_generation()
+        if shared <= self._generation:
+            return False
+        bloom = self.bloom
+        keys = [
+            f"{self.key_prefix}:{generation}"
+            for generation in range(self._generation + 1, shared + 1)
+        ]
+        entries = self.backend.get_many(keys) if len(keys) <= self.max_replay else {}
+        for emails in entries.values():
+            for email in emails:
+                bloom.add(email)
+        if len(entries) < len(keys):
+            # entrées expirées ou pas encore écrites : les inscriptions au
+            # moins sont relues en base
+            self.refresh()
+        self._update_stats(bloom)
+        self._generation = shared
+        self.stats.incr("replays")
+        return True
+
+    def persist(self) -> None:
+        """Réécrit le fichier du filtre, avec les emails ajoutés depuis."""
+        if self.path:
+            self.bloom.save(self.path)
+
+    def might_exist(self, email: str) -> bool:
+        """Faux : l'email (normalisé) n'est pas enregistré."""
+        bloom = self.bloom
+        self.stats.incr("checks")
+        if email in bloom:
+            return True
+        if self.backend is not None and self._replay() and email in bloom:
+            return True
+        if (
+            self.refresh_interval is not None
+            and self.clock() - self._refreshed_at >= self.refresh_interval
+        ):
+            self.refresh()
+            if email in bloom:
+                return True
+        self.stats.incr("negatives")
+        return False
+
+    def _remember(self, users: Iterable[User]) -> List[str]:
+        bloom = self.bloom
+        emails = [normalize_email(user.email) for user in users]
+        for email in emails:
+            bloom.add(email)
+        self._update_stats(bloom)
+        return emails
+
+    def _confirm(self, user: Optional[User]) -> Optional[User]:
+        if user is None:
+            self.stats.incr("false_positives")
+        return user
+
+    def invalidate(self, user: User) -> None:
+        """
+        Appelée par DjangoUnitOfWork après commit : republie l'email, cette
+        fois visible des autres process, et purge le cache décoré.
+        """
+        self._publish([normalize_email(user.email)])
+        invalidate = getattr(self.inner, "invalidate", None)
+        if invalidate is not None:
+            invalidate(user)
+
+    # --- lecture ---
+    def _exists(self, email: str) -> bool:
+        return self.might_exist(email) and self.inner.exists(email)
+
+    def _exists_many(self, emails: Set[str]) -> Set[str]:
+        if self.refresh_interval is not None:
+            # d'autres process écrivent : un « absent » peut dater et
+            # l'insertion groupée qui suit buterait sur l'unicité
+            return self.inner.exists_many(emails)
+        candidates = {email for email in emails if self.might_exist(email)}
+        return self.inner.exists_many(candidates) if candidates else set()
+
+    def _get_by_email(self, email: str) -> Optional[User]:
+        if not self.might_exist(email):
+            return None
+        return self._confirm(self.inner.get_by_email(email))
+
+    def _get_login(self, email: str) -> Optional[User]:
+        if not self.might_exist(email):
+            return None
+        return self._confirm(self.inner.get_login(email))
+
+    def _get_by_id(self, user_id: str) -> Optional[User]:
+        return self.inner.get_by_id(user_id)
+
+    def _list(self) -> List[User]:
+        return self.inner.list()
+
+    def _iter_users(
+        self, batch_size: int, after: Optional[UserCursor]
+    ) -> Iterator[User]:
+        return self.inner.iter_users(batch_size, after=after)
+
+    def _iter_emails(self, batch_size: int, since: Optional[datetime]) -> Iterator[str]:
+        return self.inner.iter_emails(batch_size, since=since)
+
+    # --- écriture ---
+    # ajout avant l'écriture : un lecteur concurrent ne doit jamais voir
+    # l'utilisateur en base et « absent » dans le filtre ; publication après,
+    # et de nouveau au commit (invalidate) si une transaction est ouverte
+    def _save(self, user: User) -> User:
+        emails = self._remember([user])
+        saved = self.inner.save(user)
+        self._publish(emails)
+        return saved
+
+    def _create_if_absent(self, user: User) -> bool:
+        emails = self._remember([user])
+        created = self.inner.create_if_absent(user)
+        if created:
+            self._publish(emails)
+        return created
+
+    def _update(self, user: User) -> User:
+        emails = self._remember([user])
+        updated = self.inner.update(user)
+        self._publish(emails)
+        return updated
+
+    def _update_many(self, users: List[User]) -> List[User]:
+        emails = self._remember(users)
+        updated = self.inner.update_many(users)
+        self._publish(emails)
+        return updated
+
+    def _save_many(self, users: List[User]) -> List[User]:
+        emails = self._remember(users)
+        saved = self.inner.save_many(users)
+        self._publish(emails)
+        return saved
+
+    def _set_active(
+        self,
+        selection: UserSelection,
+        is_active: bool,
+        limit: int,
+        after: Optional[str],
+    ) -> ActiveUpdate:
+        return self.inner.set_active(selection, is_active, limit, after)
+
+
+def build_email_filter(
+    config: Optional[dict], inner: AbstractUserRepository, backend: Any = None
+) -> AbstractUserRepository:
+    """
+    Place le filtre devant `inner` selon un dictionnaire de réglages (voir
+    settings.USERS_EMAIL_FILTER) ; None le désactive et retourne `inner`.
+    `backend` est le cache partagé désigné par config["BACKEND"].
+    """
+    if not config:
+        return inner
+    return EmailFilterRepository(
+        inner,
+        capacity=config.get("CAPACITY", 1_000_000),
+        error_rate=config.get("ERROR_RATE", 0.01),
+        path=config.get("PATH"),
+        refresh_interval=config.get("REFRESH_INTERVAL", 5.0),
+        backend=backend,
+    )
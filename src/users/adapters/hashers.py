@@ -0,0 +1,264 @@
+"""
+Hachage des mots de passe.
+
+Format versionné : `<algorithme>$<paramètres>$<sel>$<hash>`. L'algorithme et
+ses paramètres de coût voyagent avec chaque hash, ce qui permet de changer de
+réglage sans invalider les comptes existants : un hash produit avec d'autres
+paramètres que ceux du hasher préféré est recalculé à la prochaine connexion.
+
+Les anciens hash SHA-256 non salés (64 caractères hexadécimaux) restent
+vérifiables via SHA256LegacyPasswordHasher. Sans le mot de passe, on ne peut
+que les envelopper dans un KDF (`sha256+<hash du KDF>`, voir
+WrappedSHA256PasswordHasher et manage.py rehash_passwords) ; le hash est
+remplacé par un hash direct à la connexion suivante.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import re
+import secrets
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from users.instrumentation import instrumented
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _salt() -> str:
+    return secrets.token_urlsafe(16)
+
+
+class PasswordHasher(ABC):
+    algorithm: str
+
+    @abstractmethod
+    def encode(self, password: str, salt: Optional[str] = None) -> str:
+        pass
+
+    @abstractmethod
+    def must_update(self, encoded: str) -> bool:
+        """Vrai si le hash n'a pas été produit avec les paramètres courants."""
+
+    @abstractmethod
+    def verify(self, password: str, encoded: str) -> bool:
+        pass
+
+    def handles(self, encoded: str) -> bool:
+        return encoded.startswith(f"{self.algorithm}$")
+
+
+class PBKDF2PasswordHasher(PasswordHasher):
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, iterations: int = 600_000):
+        self.iterations = iterations
+
+    def encode(self, password: str, salt: Optional[str] = None) -> str:
+        salt = salt or _salt()
+        digest = hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), salt.encode(), self.iterations
+        )
+        return f"{self.algorithm}${self.iterations}${salt}${_b64(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        _, iterations, salt, _ = encoded.split("$", 3)
+        # on vérifie avec les paramètres du hash, pas ceux du hasher courant
+        return hmac.compare_digest(
+            PBKDF2PasswordHasher(int(iterations)).encode(password, salt), encoded
+        )
+
+    def must_update(self, encoded: str) -> bool:
+        return encoded.split("$", 2)[1] != str(self.iterations)
+
+
+class ScryptPasswordHasher(PasswordHasher):
+    algorithm = "scrypt"
+
+    def __init__(self, n: int = 2**14, r: int = 8, p: int = 1):
+        self.n, self.r, self.p = n, r, p
+
+    @property
+    def params(self) -> str:
+        return f"{self.n},{self.r},{self.p}"
+
+    def encode(self, password: str, salt: Optional[str] = None) -> str:
+        salt = salt or _salt()
+        digest = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=self.n,
+            r=self.r,
+            p=self.p,
+            maxmem=256 * self.n * self.r + 1024 * 1024,
+        )
+        return f"{self.algorithm}${self.params}${salt}${_b64(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        _, params, salt, _ = encoded.split("$", 3)
+        n, r, p = (int(v) for v in params.split(","))
+        return hmac.compare_digest(
+            ScryptPasswordHasher(n, r, p).encode(password, salt), encoded
+        )
+
+    def must_update(self, encoded: str) -> bool:
+        return encoded.split("$", 2)[1] != self.params
+
+
+class SHA256LegacyPasswordHasher(PasswordHasher):
+    """Hash historique non salé : vérification uniquement, toujours à recalculer."""
+
+    algorithm = "sha256_legacy"
+    _pattern = re.compile(r"[0-9a-f]{64}")
+
+    def handles(self, encoded: str) -> bool:
+        return self._pattern.fullmatch(encoded) is not None
+
+    def encode(self, password: str, salt: Optional[str] = None) -> str:
+        return _sha256(password)
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return hmac.compare_digest(self.encode(password), encoded)
+
+    def must_update(self, encoded: str) -> bool:
+        return True
+
+
+def _sha256(password: str) -> str:
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+class WrappedSHA256PasswordHasher(PasswordHasher):
+    """
+    Ancien hash SHA-256 passé hors ligne dans un KDF : KDF(sha256(mot de
+    passe)). Vérification uniquement, toujours à recalculer.
+    """
+
+    prefix = "sha256+"
+
+    def __init__(self, kdf: PasswordHasher):
+        self.kdf = kdf
+        self.algorithm = self.prefix + kdf.algorithm
+
+    def encode(self, password: str, salt: Optional[str] = None) -> str:
+        return self.wrap(_sha256(password), salt)
+
+    def wrap(self, legacy_hash: str, salt: Optional[str] = None) -> str:
+        return self.prefix + self.kdf.encode(legacy_hash, salt)
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return self.kdf.verify(_sha256(password), encoded[len(self.prefix) :])
+
+    def must_update(self, encoded: str) -> bool:
+        return True
+
+
+def wrap_legacy_hashes(kdf: PasswordHasher, legacy_hashes: List[str]) -> List[str]:
+    """Enveloppe un lot de hash SHA-256 (picklable : exécutée dans un process)."""
+    wrapper = WrappedSHA256PasswordHasher(kdf)
+    return [wrapper.wrap(legacy_hash) for legacy_hash in legacy_hashes]
+
+
+class PasswordHashingEngine:
+    """
+    Choisit le hasher d'un hash existant et hache avec le hasher préféré
+    (le premier de la liste).
+
+    Avec un `executor` (ThreadPoolExecutor ou ProcessPoolExecutor), le calcul
+    est exécuté dans le pool : le nombre de hachages simultanés est borné par
+    la taille du pool et, avec des process, le coût ne se partage plus le GIL.
+    """
+
+    def __init__(
+        self, hashers: List[PasswordHasher], executor: Optional[Executor] = None
+    ):
+        if not hashers:
+            raise ValueError("Au moins un hasher est requis")
+        self.hashers = hashers
+        self.executor = executor
+
+    @property
+    def preferred(self) -> PasswordHasher:
+        return self.hashers[0]
+
+    def hasher_for(self, encoded: str) -> Optional[PasswordHasher]:
+        return next((h for h in self.hashers if h.handles(encoded)), None)
+
+    @instrumented("hashing.hash")
+    def hash(self, password: str) -> str:
+        return self._run(self.preferred.encode, password)
+
+    @instrumented("hashing.hash_many")
+    def hash_many(self, passwords: Iterable[str]) -> List[str]:
+        if self.executor is None:
+            return [self.preferred.encode(p) for p in passwords]
+        passwords = list(passwords)
+        # avec des process, un envoi par mot de passe coûterait plus que
+        # le hachage d'un KDF peu coûteux : envoi par paquets
+        chunksize = max(1, len(passwords) // 64)
+        return list(
+            self.executor.map(self.preferred.encode, passwords, chunksize=chunksize)
+        )
+
+    @instrumented("hashing.verify")
+    def verify(self, password: str, encoded: Optional[str]) -> Tuple[bool, bool]:
+        """(mot de passe correct, hash à recalculer avec les réglages courants)."""
+        hasher = self.hasher_for(encoded or "")
+        if hasher is None or not self._run(hasher.verify, password, encoded):
+            return False, False
+        return True, hasher is not self.preferred or hasher.must_update(encoded)
+
+    # --- variantes asynchrones : le calcul ne bloque jamais la boucle ---
+    async def ahash(self, password: str) -> str:
+        return await self._arun(self.preferred.encode, password)
+
+    async def averify(self, password: str, encoded: Optional[str]) -> Tuple[bool, bool]:
+        hasher = self.hasher_for(encoded or "")
+        if hasher is None or not await self._arun(hasher.verify, password, encoded):
+            return False, False
+        return True, hasher is not self.preferred or hasher.must_update(encoded)
+
+    async def _arun(self, fn, *args):
+        # sans pool dédié, le pool de threads par défaut de la boucle
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+    def _run(self, fn, *args):
+        if self.executor is None:
+            return fn(*args)
+        return self.executor.submit(fn, *args).result()
+
+
+def build_engine(config: Optional[dict] = None) -> PasswordHashingEngine:
+    """
+    Construit le moteur à partir d'un dictionnaire de réglages (voir
+    USERS_PASSWORD_HASHING dans settings.py). Clés absentes = valeurs par défaut.
+    """
+    config = config or {}
+    pbkdf2 = PBKDF2PasswordHasher(config.get("PBKDF2_ITERATIONS", 600_000))
+    scrypt = ScryptPasswordHasher(*config.get("SCRYPT", (2**14, 8, 1)))
+    preferred, other = (
+        (scrypt, pbkdf2) if config.get("ALGORITHM") == "scrypt" else (pbkdf2, scrypt)
+    )
+
+    executor = None
+    if config.get("POOL") == "thread":
+        executor = ThreadPoolExecutor(config.get("WORKERS"))
+    elif config.get("POOL") == "process":
+        executor = ProcessPoolExecutor(config.get("WORKERS"))
+
+    return PasswordHashingEngine(
+        [
+            preferred,
+            other,
+            WrappedSHA256PasswordHasher(preferred),
+            WrappedSHA256PasswordHasher(other),
+            SHA256LegacyPasswordHasher(),
+        ],
+        executor=executor,
+    )
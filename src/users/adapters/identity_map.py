@@ -0,0 +1,96 @@
+"""
+Identity map de la unit of work : un utilisateur chargé une fois l'est sous
+une seule instance pour toute la transaction, quel que soit le chemin
+(id ou email) qui y mène, et sans nouvelle requête.
+
+Une écriture retire l'utilisateur de la map : la lecture suivante repasse
+par les écritures en attente ou par la base. Les compteurs sont cumulés pour tout
+le process dans `stats` (sous verrou : une map par thread, des compteurs
+communs), exposé à l'instrumentation.
+"""
+
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Dict, Iterable, Optional, Tuple
+
+from users.core.models import User
+from users.core.value_object import normalize_email
+
+
+@dataclass
+class IdentityMapStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    # partagé par les unit of work de tous les threads : += n'est pas atomique
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            counters = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+            return {**counters, "hit_ratio": self.hit_ratio}
+
+
+stats = IdentityMapStats()
+
+
+class IdentityMap:
+    def __init__(self, stats: IdentityMapStats = stats):
+        self.stats = stats
+        # id -> (instance, email normalisé au chargement)
+        self._by_id: Dict[str, Tuple[User, str]] = {}
+        self._ids_by_email: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get_by_id(self, user_id: str) -> Optional[User]:
+        entry = self._by_id.get(user_id)
+        return self._count(entry[0] if entry is not None else None)
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        """`email` est déjà normalisé."""
+        return self.get_by_id(self._ids_by_email.get(email))
+
+    def _count(self, user: Optional[User]) -> Optional[User]:
+        self.stats.incr("misses" if user is None else "hits")
+        return user
+
+    def add(self, user: Optional[User]) -> Optional[User]:
+        """
+        Enregistre un utilisateur lu en base ; si son id est déjà connu,
+        retourne l'instance déjà en circulation.
+        """
+        if user is None:
+            return None
+        known = self._by_id.get(user.id)
+        if known is not None:
+            return known[0]
+        email = normalize_email(user.email)
+        self._by_id[user.id] = (user, email)
+        self._ids_by_email[email] = user.id
+        return user
+
+    def discard(self, user_ids: Iterable[str]) -> None:
+        for user_id in user_ids:
+            entry = self._by_id.pop(user_id, None)
+            if entry is None:
+                continue
+            # clé d'entrée : l'instance a pu changer d'email depuis
+            self._ids_by_email.pop(entry[1], None)
+            self.stats.incr("invalidations")
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._ids_by_email.clear()
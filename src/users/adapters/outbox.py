@@ -0,0 +1,100 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from users.core.events import DomainEvent
+
+
+@dataclass
+class OutboxMessage:
+    id: int
+    event: DomainEvent
+    attempts: int = 0
+
+
+@dataclass
+class Failure:
+    message: OutboxMessage
+    error: str
+    retry_at: Optional[float]  # timestamp ; None : abandonné
+
+
+class AbstractOutbox(ABC):
+    """
+    Table d'événements à publier. Écrite par la unit of work dans la
+    transaction du commit, vidée par un worker (EventDispatcher).
+    """
+
+    @abstractmethod
+    def add(self, events: List[DomainEvent]) -> None:
+        pass
+
+    @abstractmethod
+    def claim(self, limit: int, lease: float) -> List[OutboxMessage]:
+        """
+        Réserve jusqu'à `limit` messages disponibles pendant `lease` secondes :
+        un autre worker ne les reprend qu'après expiration du bail.
+        """
+
+    @abstractmethod
+    def mark_dispatched(self, messages: List[OutboxMessage]) -> None:
+        pass
+
+    @abstractmethod
+    def mark_failed(self, failures: List[Failure]) -> None:
+        pass
+
+
+class InMemoryOutbox(AbstractOutbox):
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._ids = 0
+        # id -> [message, disponible à partir de, publié, abandonné]
+        self.records: Dict[int, list] = {}
+
+    @property
+    def events(self) -> List[DomainEvent]:
+        return [record[0].event for record in self.records.values()]
+
+    def add(self, events: List[DomainEvent]) -> None:
+        with self._lock:
+            for event in events:
+                self._ids += 1
+                self.records[self._ids] = [
+                    OutboxMessage(self._ids, event),
+                    0.0,
+                    False,
+                    False,
+                ]
+
+    def claim(self, limit: int, lease: float) -> List[OutboxMessage]:
+        now = self.clock()
+        claimed = []
+        with self._lock:
+            for record in self.records.values():
+                if len(claimed) >= limit:
+                    break
+                message, available_at, dispatched, failed = record
+                if dispatched or failed or available_at > now:
+                    continue
+                record[1] = now + lease
+                claimed.append(message)
+        return claimed
+
+    def mark_dispatched(self, messages: List[OutboxMessage]) -> None:
+        with self._lock:
+            for message in messages:
+                self.records[message.id][2] = True
+
+    def mark_failed(self, failures: List[Failure]) -> None:
+        with self._lock:
+            for failure in failures:
+                record = self.records[failure.message.id]
+                failure.message.attempts += 1
+                if failure.retry_at is None:
+                    record[3] = True
+                else:
+                    record[1] = failure.retry_at
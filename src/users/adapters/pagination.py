@@ -0,0 +1,33 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import NamedTuple
+
+from users.core.models import User
+
+
+class UserCursor(NamedTuple):
+    """Position de pagination par clé (keyset) sur (created_at, id)."""
+
+    created_at: datetime
+    id: str
+
+    @classmethod
+    def after(cls, user: User) -> "UserCursor":
+        return cls(user.created_at, str(user.id))
+
+
+def encode_cursor(cursor: UserCursor) -> str:
+    """Curseur opaque pour les clients de l'API."""
+    raw = json.dumps([cursor.created_at.isoformat(), cursor.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> UserCursor:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, user_id = json.loads(raw)
+        return UserCursor(datetime.fromisoformat(created_at), str(user_id))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Curseur de pagination invalide")
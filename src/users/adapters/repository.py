@@ -1,20 +1,54 @@
+from datetime import datetime
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    List,
+    Set,
+    Tuple,
+)
+from users.core.commands import UserSelection
 from users.core.models import User
-from typing import Optional, List
+from users.core.value_object import normalize_email
+from users.adapters.pagination import UserCursor
+
+
+class ActiveUpdate(NamedTuple):
+    """Un lot de set_active."""
+
+    changed: List[Tuple[str, str]]  # (id, email normalisé) modifiés
+    next_after: Optional[str]  # id à passer au lot suivant ; None : terminé
 
 
 class AbstractUserRepository(ABC):
-    """Interface du UserRepository dans le domaine"""
+    """
+    Interface du UserRepository dans le domaine.
+
+    Les emails sont comparés sous leur forme normalisée (normalize_email) :
+    les méthodes _privées reçoivent toujours des emails déjà normalisés.
+    """
 
     def exists(self, email: str) -> bool:
-        return self._exists(email)
+        return self._exists(normalize_email(email))
 
     def get_by_email(self, email: str) -> Optional[User]:
-        return self._get_by_email(email)
+        return self._get_by_email(normalize_email(email))
+
+    def get_login(self, email: str) -> Optional[User]:
+        """
+        Utilisateur réduit à ce que le login lit (id, email, hash, is_active),
+        depuis un modèle de lecture quand l'adapter en a un ; created_at peut
+        y manquer.
+        """
+        return self._get_login(normalize_email(email))
 
     def update(self, user: User) -> User:
-        return self._save(user)
+        return self._update(user)
 
     def get_by_id(self, user_id: str) -> Optional[User]:
         return self._get_by_id(user_id)
@@ -22,9 +56,112 @@ class AbstractUserRepository(ABC):
     def list(self) -> List[User]:
         return self._list()
 
+    def iter_users(
+        self, batch_size: int = 1000, after: Optional[UserCursor] = None
+    ) -> Iterator[User]:
+        """
+        Parcourt les utilisateurs par ordre (created_at, id), strictement après
+        `after`, en lisant `batch_size` lignes à la fois.
+        """
+        return self._iter_users(batch_size, after)
+
+    def iter_emails(
+        self, batch_size: int = 1000, since: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """
+        Emails normalisés des utilisateurs, en flux. `since` est une
+        indication : au moins les utilisateurs créés depuis, éventuellement
+        davantage.
+        """
+        return self._iter_emails(batch_size, since)
+
     def save(self, user: User) -> User:
         return self._save(user)
 
+    def exists_many(self, emails: Iterable[str]) -> Set[str]:
+        """Sous-ensemble des emails (tels que fournis) déjà enregistrés."""
+        by_key: Dict[str, List[str]] = {}
+        for email in emails:
+            by_key.setdefault(normalize_email(email), []).append(email)
+        found = self._exists_many(set(by_key))
+        return {email for key in found for email in by_key[key]}
+
+    def save_many(self, users: Iterable[User]) -> List[User]:
+        return self._save_many(list(users))
+
+    def update_many(self, users: Iterable[User]) -> List[User]:
+        return self._update_many(list(users))
+
+    def create_if_absent(self, user: User) -> bool:
+        """Insère l'utilisateur si son email est libre ; vrai s'il a été créé."""
+        return self._create_if_absent(user)
+
+    def set_active(
+        self,
+        selection: UserSelection,
+        is_active: bool,
+        limit: int = 1000,
+        after: Optional[str] = None,
+    ) -> ActiveUpdate:
+        """
+        Passe is_active à la valeur demandée sur un lot de la sélection,
+        parcourue par id croissant à partir de `after` ; seuls les
+        utilisateurs dont l'état change sont écrits et retournés.
+        """
+        return self._set_active(selection, is_active, limit, after)
+
+    # Implémentations par défaut, à surcharger par les adapters capables
+    # de travailler par lots.
+    def _get_login(self, email: str) -> Optional[User]:
+        return self._get_by_email(email)
+
+    def _iter_emails(self, batch_size: int, since: Optional[datetime]) -> Iterator[str]:
+        return (normalize_email(u.email) for u in self._iter_users(batch_size, None))
+
+    def _update(self, user: User) -> User:
+        return self._save(user)
+
+    def _exists_many(self, emails: Set[str]) -> Set[str]:
+        return {email for email in emails if self._exists(email)}
+
+    def _save_many(self, users: List[User]) -> List[User]:
+        return [self._save(user) for user in users]
+
+    def _update_many(self, users: List[User]) -> List[User]:
+        return [self._update(user) for user in users]
+
+    def _set_active(
+        self,
+        selection: UserSelection,
+        is_active: bool,
+        limit: int,
+        after: Optional[str],
+    ) -> ActiveUpdate:
+        candidates = sorted(
+            (
+                u
+                for u in self._iter_users(1000, None)
+                if (after is None or u.id > after) and selection.matches(u)
+            ),
+            key=lambda u: u.id,
+        )
+        batch = candidates[:limit]
+        changed = [u for u in batch if u.is_active != is_active]
+        for user in changed:
+            user.is_active = is_active
+        self._update_many(changed)
+        next_after = batch[-1].id if len(candidates) > limit else None
+        return ActiveUpdate(
+            [(u.id, normalize_email(u.email)) for u in changed], next_after
+        )
+
+    def _create_if_absent(self, user: User) -> bool:
+        # non atomique : les adapters avec une base font mieux en une requête
+        if self._exists(normalize_email(user.email)):
+            return False
+        self._save(user)
+        return True
+
     @abstractmethod
     def _get_by_email(self, email: str) -> Optional[User]:
         pass
@@ -37,6 +174,12 @@ class AbstractUserRepository(ABC):
     def _list(self) -> List[User]:
         pass
 
+    @abstractmethod
+    def _iter_users(
+        self, batch_size: int, after: Optional[UserCursor]
+    ) -> Iterator[User]:
+        pass
+
     @abstractmethod
     def _save(self, user: User) -> User:
         pass
@@ -47,21 +190,88 @@ class AbstractUserRepository(ABC):
 
 
 class InMemoryRepository(AbstractUserRepository):
-    def __init__(self):
-        self._users = []
+    """
+    Repository en mémoire indexé par hash : index uniques sur l'id et l'email,
+    plus des index secondaires optionnels (ex. is_active, jour de created_at).
+
+    `secondary_indexes` associe un nom d'index à une fonction qui calcule la
+    clé d'un utilisateur :
+
+        InMemoryRepository(secondary_indexes={
+            "is_active": lambda u: u.is_active,
+            "created_on": lambda u: u.created_at.date(),
+        })
+    """
+
+    def __init__(
+        self, secondary_indexes: Optional[Dict[str, Callable[[User], Hashable]]] = None
+    ):
+        self._by_id: Dict[str, User] = {}
+        self._by_email: Dict[str, User] = {}
+        self._index_keys = dict(secondary_indexes or {})
+        self._indexes: Dict[str, Dict[Hashable, Dict[str, User]]] = {
+            name: {} for name in self._index_keys
+        }
+        # clés indexées au dernier save, pour désindexer sans recalculer
+        self._indexed: Dict[str, Tuple[str, Dict[str, Hashable]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def find_by(self, index: str, key: Hashable) -> List[User]:
+        """Utilisateurs dont la clé d'index secondaire vaut `key`."""
+        if index not in self._indexes:
+            raise KeyError(f"Index inconnu : {index}")
+        return list(self._indexes[index].get(key, {}).values())
 
     def _exists(self, email: str) -> bool:
-        return any(user.email == email for user in self._users)
+        return email in self._by_email
+
+    def _exists_many(self, emails: Set[str]) -> Set[str]:
+        return emails & self._by_email.keys()
 
     def _get_by_email(self, email: str) -> Optional[User]:
-        return next((user for user in self._users if user.email == email), None)
+        return self._by_email.get(email)
 
     def _get_by_id(self, user_id: str) -> Optional[User]:
-        return next((user for user in self._users if user.id == user_id), None)
+        return self._by_id.get(user_id)
 
     def _list(self) -> List[User]:
-        return self._users
+        return list(self._by_id.values())
+
+    def _iter_users(
+        self, batch_size: int, after: Optional[UserCursor]
+    ) -> Iterator[User]:
+        users = sorted(self._by_id.values(), key=UserCursor.after)
+        if after is not None:
+            users = (u for u in users if UserCursor.after(u) > after)
+        return iter(users)
+
+    def _iter_emails(self, batch_size: int, since: Optional[datetime]) -> Iterator[str]:
+        return iter(list(self._by_email))
 
     def _save(self, user: User) -> User:
-        self._users.append(user)
+        self._unindex(user.id)
+        email = normalize_email(user.email)
+        keys = {name: key(user) for name, key in self._index_keys.items()}
+        self._by_id[user.id] = user
+        self._by_email[email] = user
+        for name, value in keys.items():
+            self._indexes[name].setdefault(value, {})[user.id] = user
+        self._indexed[user.id] = (email, keys)
         return user
+
+    def _unindex(self, user_id: str) -> None:
+        previous = self._indexed.pop(user_id, None)
+        if previous is None:
+            return
+        email, keys = previous
+        # update() peut avoir changé l'email : on retire l'ancienne clé
+        if self._by_email.get(email) is self._by_id.get(user_id):
+            del self._by_email[email]
+        for name, value in keys.items():
+            bucket = self._indexes[name][value]
+            bucket.pop(user_id, None)
+            if not bucket:
+                del self._indexes[name][value]
+        del self._by_id[user_id]
@@ -0,0 +1,373 @@
+"""
+Répartition des utilisateurs sur plusieurs bases (shards) selon l'email
+normalisé.
+
+Le shard d'un email est choisi par jump consistent hash (Lamping et Veach)
+sur un blake2b de l'email : stable d'un process à l'autre et, quand on
+ajoute un shard en fin de liste, seuls ~1/N des utilisateurs changent de
+shard, tous vers le nouveau. Les shards s'ajoutent (ou se retirent) donc
+en fin de liste ; `manage.py rebalance_shards` déplace ensuite les lignes
+mal placées.
+
+Chaque shard est une base Django (alias de DATABASES) servie par un
+DjangoUserRepository. Les écritures sont atomiques par shard, pas entre
+shards : la transaction de la unit of work ne couvre que la base par
+défaut (outbox).
+"""
+
+import hashlib
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from users.adapters.async_repository import AbstractAsyncUserRepository
+from users.adapters.django_repository import (
+    AsyncDjangoUserRepository,
+    DjangoUserRepository,
+)
+from users.adapters.pagination import UserCursor
+from users.adapters.repository import AbstractUserRepository, ActiveUpdate
+from users.core.commands import UserSelection
+from users.core.models import User
+from users.core.value_object import normalize_email
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Jump consistent hash : numéro de bucket dans [0, buckets)."""
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (1 << 31) / ((key >> 33) + 1))
+    return b
+
+
+def shard_key(email: str) -> int:
+    """`email` est déjà normalisé."""
+    digest = hashlib.blake2b(email.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class ShardMap:
+    def __init__(self, aliases: Sequence[str]):
+        if not aliases:
+            raise ValueError("Au moins un shard est requis")
+        self.aliases = tuple(aliases)
+
+    def __len__(self) -> int:
+        return len(self.aliases)
+
+    def for_email(self, email: str) -> str:
+        """Alias du shard d'un email normalisé."""
+        return self.aliases[jump_hash(shard_key(email), len(self.aliases))]
+
+    def group(self, users: List[User]) -> Dict[str, List[User]]:
+        """Utilisateurs regroupés par shard de leur email."""
+        groups: Dict[str, List[User]] = defaultdict(list)
+        for user in users:
+            groups[self.for_email(normalize_email(user.email))].append(user)
+        return groups
+
+
+class ShardedUserRepository(AbstractUserRepository):
+    """
+    Route chaque opération vers le shard de l'email. Les lectures par id,
+    les listes et set_active interrogent tous les shards, anciens compris.
+
+    `previous` est la liste de shards d'avant un changement : tant que
+    rebalance_shards n'a pas fini, une lecture par email qui échoue sur le
+    nouveau shard est retentée sur l'ancien.
+    """
+
+    def __init__(
+        self,
+        aliases: Sequence[str],
+        batch_size: int = 1000,
+        previous: Optional[Sequence[str]] = None,
+    ):
+        self.shards = ShardMap(aliases)
+        self.previous = ShardMap(previous) if previous else None
+        self.batch_size = batch_size
+        # shards courants puis anciens, dans l'ordre des listes
+        self.repositories: Dict[str, DjangoUserRepository] = {
+            alias: DjangoUserRepository(batch_size, using=alias)
+            for alias in dict.fromkeys([*aliases, *(previous or ())])
+        }
+
+    @property
+    def databases(self) -> Tuple[str, ...]:
+        return self.shards.aliases
+
+    def shard_for(self, email: str) -> DjangoUserRepository:
+        return self.repositories[self.shards.for_email(normalize_email(email))]
+
+    def _by_shard(self, users: List[User]) -> Dict[str, List[User]]:
+        return self.shards.group(users)
+
+    def _read(self, email: str, method: str):
+        result = getattr(self.shard_for(email), method)(email)
+        if result or self.previous is None:
+            return result
+        alias = self.previous.for_email(email)
+        if alias == self.shards.for_email(email):
+            return result
+        # pas encore déplacé par rebalance_shards
+        return getattr(self.repositories[alias], method)(email)
+
+    # --- lecture ---
+    def _get_by_email(self, email: str) -> Optional[User]:
+        return self._read(email, "get_by_email")
+
+    def _get_login(self, email: str) -> Optional[User]:
+        return self._read(email, "get_login")
+
+    def _exists(self, email: str) -> bool:
+        return self._read(email, "exists")
+
+    def _exists_many(self, emails: Set[str]) -> Set[str]:
+        groups: Dict[str, Set[str]] = defaultdict(set)
+        for email in emails:
+            groups[self.shards.for_email(email)].add(email)
+        found = set()
+        for alias, group in groups.items():
+            found |= self.repositories[alias].exists_many(group)
+        if self.previous is not None and emails - found:
+            for email in emails - found:
+                if self._read(email, "exists"):
+                    found.add(email)
+        return found
+
+    def _get_by_id(self, user_id: str) -> Optional[User]:
+        # l'id ne dit pas le shard : premier shard qui l'a
+        for repository in self.repositories.values():
+            user = repository.get_by_id(user_id)
+            if user is not None:
+                return user
+        return None
+
+    def _list(self) -> List[User]:
+        return list(self._iter_users(self.batch_size, None))
+
+    def _iter_users(
+        self, batch_size: int, after: Optional[UserCursor]
+    ) -> Iterator[User]:
+        # fusion des flux keyset de chaque shard, déjà triés sur (created_at, id) :
+        # une page par shard en mémoire au plus. Anciens shards compris ; un
+        # utilisateur en cours de déplacement, présent dans deux bases sous la
+        # même clé, sort deux fois de suite et n'est gardé qu'une fois
+        merged = heapq.merge(
+            *(
+                repository.iter_users(batch_size, after=after)
+                for repository in self.repositories.values()
+            ),
+            key=UserCursor.after,
+        )
+        return (
+            next(duplicates)
+            for _, duplicates in itertools.groupby(merged, key=lambda u: u.id)
+        )
+
+    def _iter_emails(self, batch_size: int, since: Optional[datetime]) -> Iterator[str]:
+        # anciens shards compris : un email pas encore déplacé doit rester
+        # connu du filtre de Bloom (un doublon ne coûte rien)
+        return itertools.chain.from_iterable(
+            repository.iter_emails(batch_size, since=since)
+            for repository in self.repositories.values()
+        )
+
+    # --- écriture ---
+    def _save(self, user: User) -> User:
+        return self.shard_for(user.email).save(user)
+
+    def _create_if_absent(self, user: User) -> bool:
+        # l'unicité de l'email est garantie par le shard : un email n'a qu'un shard
+        email = normalize_email(user.email)
+        if self.previous is not None and (
+            self.previous.for_email(email) != self.shards.for_email(email)
+            and self.repositories[self.previous.for_email(email)].exists(email)
+        ):
+            return False  # encore sur son ancien shard
+        return self.shard_for(email).create_if_absent(user)
+
+    def _save_many(self, users: List[User]) -> List[User]:
+        saved: Dict[str, User] = {}
+        for alias, group in self._by_shard(users).items():
+            saved.update((u.id, u) for u in self.repositories[alias].save_many(group))
+        return [saved[user.id] for user in users]
+
+    def _update(self, user: User) -> User:
+        return self._update_many([user])[0]
+
+    def _update_many(self, users: List[User]) -> List[User]:
+        for alias, group in self._by_shard(users).items():
+            repository = self.repositories[alias]
+            present = repository.existing_ids(u.id for u in group)
+            moved = [u for u in group if u.id not in present]
+            if len(moved) < len(group):
+                repository.update_many([u for u in group if u.id in present])
+            if moved:
+                # email modifié (ou shards changés) : la ligne change de shard,
+                # avec le created_at stocké (absent des users de get_login)
+                moved = [self._with_created_at(u) for u in moved]
+                repository.restore_many(moved)
+                for other in self.repositories.values():
+                    if other is not repository:
+                        other.delete_many(u.id for u in moved)
+        return users
+
+    def _with_created_at(self, user: User) -> User:
+        if user.created_at is not None:
+            return user
+        stored = self._get_by_id(user.id)
+        if stored is None:
+            return user
+        return User.hydrate(
+            user.id, user.email, user.password_hash, user.is_active, stored.created_at
+        )
+
+    def _set_active(
+        self,
+        selection: UserSelection,
+        is_active: bool,
+        limit: int,
+        after: Optional[str],
+    ) -> ActiveUpdate:
+        # curseur "<numéro de base>:<id>" : les bases (anciens shards compris)
+        # sont parcourues à la suite
+        repositories = list(self.repositories.values())
+        index, _, shard_after = (after or "0:").partition(":")
+        index = int(index)
+        result = repositories[index].set_active(
+            selection, is_active, limit, shard_after or None
+        )
+        if result.next_after is not None:
+            next_after = f"{index}:{result.next_after}"
+        elif index + 1 < len(repositories):
+            next_after = f"{index + 1}:"
+        else:
+            next_after = None
+        return ActiveUpdate(result.changed, next_after)
+
+
+class AsyncShardedUserRepository(AbstractAsyncUserRepository):
+    """
+    Pendant asynchrone de ShardedUserRepository (vues ASGI) : même routage
+    par email et même repli sur `previous`. Pas de déplacement entre shards :
+    une mise à jour s'applique dans la base qui détient l'utilisateur,
+    rebalance_shards le replace ensuite si besoin.
+    """
+
+    def __init__(
+        self,
+        aliases: Sequence[str],
+        batch_size: int = 1000,
+        previous: Optional[Sequence[str]] = None,
+    ):
+        self.shards = ShardMap(aliases)
+        self.previous = ShardMap(previous) if previous else None
+        self.repositories: Dict[str, AsyncDjangoUserRepository] = {
+            alias: AsyncDjangoUserRepository(batch_size, using=alias)
+            for alias in dict.fromkeys([*aliases, *(previous or ())])
+        }
+
+    def shard_for(self, email: str) -> AsyncDjangoUserRepository:
+        return self.repositories[self.shards.for_email(normalize_email(email))]
+
+    async def _read(self, email: str, method: str):
+        result = await getattr(self.shard_for(email), method)(email)
+        if result or self.previous is None:
+            return result
+        alias = self.previous.for_email(email)
+        if alias == self.shards.for_email(email):
+            return result
+        return await getattr(self.repositories[alias], method)(email)
+
+    async def _exists(self, email: str) -> bool:
+        return await self._read(email, "exists")
+
+    async def _get_by_email(self, email: str) -> Optional[User]:
+        return await self._read(email, "get_by_email")
+
+    async def _get_login(self, email: str) -> Optional[User]:
+        return await self._read(email, "get_login")
+
+    async def _get_by_id(self, user_id: str) -> Optional[User]:
+        for repository in self.repositories.values():
+            user = await repository.get_by_id(user_id)
+            if user is not None:
+                return user
+        return None
+
+    async def _save(self, user: User) -> User:
+        return await self.shard_for(user.email).save(user)
+
+    async def _save_many(self, users: List[User]) -> List[User]:
+        saved: Dict[str, User] = {}
+        for alias, group in self.shards.group(users).items():
+            for user in await self.repositories[alias].save_many(group):
+                saved[user.id] = user
+        return [saved[user.id] for user in users]
+
+    async def _update(self, user: User) -> User:
+        # shard de l'email, puis l'ancien (pas encore déplacé), puis les autres
+        email = normalize_email(user.email)
+        aliases = [self.shards.for_email(email)]
+        if self.previous is not None:
+            aliases.append(self.previous.for_email(email))
+        for alias in dict.fromkeys([*aliases, *self.repositories]):
+            repository = self.repositories[alias]
+            if await repository.get_by_id(user.id) is not None:
+                return await repository.update(user)
+        return user
+
+
+@dataclass
+class RebalanceReport:
+    scanned: int = 0
+    moved: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def total_moved(self) -> int:
+        return sum(self.moved.values())
+
+
+def rebalance(
+    repository: ShardedUserRepository,
+    sources: Optional[Sequence[str]] = None,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    on_batch: Optional[Callable[[RebalanceReport], None]] = None,
+) -> RebalanceReport:
+    """
+    Déplace vers leur shard les utilisateurs mal placés des bases `sources`
+    (par défaut tous les shards connus du repository, anciens compris).
+    Copie puis suppression, lot par lot : une interruption laisse au pire
+    des doublons, qu'une nouvelle exécution résorbe.
+    """
+    report = RebalanceReport()
+    started = time.perf_counter()
+    for alias in sources or list(repository.repositories):
+        source = repository.repositories.get(alias) or DjangoUserRepository(
+            batch_size, using=alias
+        )
+        for batch in itertools.batched(source.iter_users(batch_size), batch_size):
+            report.scanned += len(batch)
+            for target, users in repository._by_shard(list(batch)).items():
+                if target == alias:
+                    continue
+                if not dry_run:
+                    repository.repositories[target].restore_many(users)
+                    source.delete_many(user.id for user in users)
+                report.moved[alias, target] = report.moved.get(
+                    (alias, target), 0
+                ) + len(users)
+            report.elapsed = time.perf_counter() - started
+            if on_batch is not None:
+                on_batch(report)
+    report.elapsed = time.perf_counter() - started
+    return report
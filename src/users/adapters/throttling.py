@@ -0,0 +1,244 @@
+"""
+Limitation des tentatives de login par email et par IP, vérifiée avant
+toute lecture en base ou hachage.
+
+Compteurs à fenêtre glissante approchée : le compte de la fenêtre courante
+plus celui de la précédente, pondéré par la part de celle-ci encore dans la
+fenêtre. Trois stockages :
+
+- LocalWindowStore : exact par clé, borné en nombre de clés (LRU) ;
+- SketchWindowStore : count-min sketch de taille fixe, pour les IP dont le
+  nombre n'est pas borné (surestime parfois, ne sous-estime jamais) ;
+- CacheWindowStore : cache Django partagé entre process (incr atomique).
+
+Seuls les échecs sont comptés (LoginThrottle.failed) : les logins réussis,
+même nombreux derrière une même IP, ne bloquent personne. Une tentative
+refusée n'est pas comptée non plus : le blocage cesse dès que le débit
+d'échecs repasse sous la limite.
+
+La vérification (check) précède l'authentification et le comptage (failed)
+la suit : des échecs concurrents peuvent dépasser la limite d'autant de
+requêtes en cours, acceptable pour un throttle.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from users.core.exceptions import TooManyAttempts
+from users.core.value_object import normalize_email
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int  # tentatives acceptées
+    window: float  # par fenêtre de `window` secondes
+
+
+def _sliding(previous: float, current: float, window: float, now: float) -> float:
+    elapsed = (now % window) / window
+    return previous * (1 - elapsed) + current
+
+
+class WindowStore(ABC):
+    @abstractmethod
+    def count(self, key: str, rate: RateLimit, now: float) -> float:
+        """Tentatives comptées pour `key` sur la fenêtre glissante."""
+
+    @abstractmethod
+    def add(self, key: str, rate: RateLimit, now: float) -> None:
+        """Compte une tentative pour `key`."""
+
+    def exceeded(self, key: str, rate: RateLimit, now: float) -> bool:
+        return self.count(key, rate, now) >= rate.limit
+
+
+class LocalWindowStore(WindowStore):
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # clé -> [indice de fenêtre, compte précédent, compte courant]
+        self._counters: "OrderedDict[str, list]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _counter(self, key: str, index: int) -> Optional[list]:
+        counter = self._counters.get(key)
+        if counter is not None and counter[0] != index:
+            # fenêtre suivante : la courante devient la précédente
+            counter[1] = counter[2] if counter[0] == index - 1 else 0
+            counter[2] = 0
+            counter[0] = index
+        return counter
+
+    def count(self, key: str, rate: RateLimit, now: float) -> float:
+        with self._lock:
+            # lecture seule : une clé sans échec n'occupe pas de place
+            counter = self._counter(key, int(now // rate.window))
+            if counter is None:
+                return 0.0
+            return _sliding(counter[1], counter[2], rate.window, now)
+
+    def add(self, key: str, rate: RateLimit, now: float) -> None:
+        index = int(now // rate.window)
+        with self._lock:
+            counter = self._counter(key, index)
+            if counter is None:
+                counter = self._counters[key] = [index, 0, 0]
+                if len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+            counter[2] += 1
+
+
+class CountMinSketch:
+    """`depth` lignes de `width` compteurs ; estimation = minimum des lignes."""
+
+    def __init__(self, width: int = 4096, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def _cells(self, key: str):
+        return [hash((seed, key)) % self.width for seed in range(self.depth)]
+
+    def estimate(self, key: str) -> int:
+        return min(row[cell] for row, cell in zip(self.rows, self._cells(key)))
+
+    def add(self, key: str) -> None:
+        for row, cell in zip(self.rows, self._cells(key)):
+            row[cell] += 1
+
+    def clear(self) -> None:
+        for row in self.rows:
+            row[:] = array("I", bytes(4 * self.width))
+
+
+class SketchWindowStore(WindowStore):
+    """Mémoire fixe (2 × width × depth compteurs) quel que soit le nombre de clés."""
+
+    def __init__(self, width: int = 4096, depth: int = 4):
+        self._lock = threading.Lock()
+        self._index = None
+        self._previous = CountMinSketch(width, depth)
+        self._current = CountMinSketch(width, depth)
+
+    def _rotate(self, index: int) -> None:
+        if self._index == index:
+            return
+        self._previous, self._current = self._current, self._previous
+        if self._index != index - 1:
+            self._previous.clear()
+        self._current.clear()
+        self._index = index
+
+    def count(self, key: str, rate: RateLimit, now: float) -> float:
+        with self._lock:
+            self._rotate(int(now // rate.window))
+            return _sliding(
+                self._previous.estimate(key),
+                self._current.estimate(key),
+                rate.window,
+                now,
+            )
+
+    def add(self, key: str, rate: RateLimit, now: float) -> None:
+        with self._lock:
+            self._rotate(int(now // rate.window))
+            self._current.add(key)
+
+
+class CacheWindowStore(WindowStore):
+    """Compteurs dans un cache Django (partagés par tous les workers)."""
+
+    def __init__(self, cache, prefix: str = "throttle"):
+        self.cache = cache
+        self.prefix = prefix
+
+    def _key(self, key: str, index: int) -> str:
+        return f"{self.prefix}:{key}:{index}"
+
+    def count(self, key: str, rate: RateLimit, now: float) -> float:
+        index = int(now // rate.window)
+        previous_key, current_key = self._key(key, index - 1), self._key(key, index)
+        counts = self.cache.get_many([previous_key, current_key])
+        return _sliding(
+            counts.get(previous_key, 0), counts.get(current_key, 0), rate.window, now
+        )
+
+    def add(self, key: str, rate: RateLimit, now: float) -> None:
+        current_key = self._key(key, int(now // rate.window))
+        timeout = math.ceil(2 * rate.window)
+        if not self.cache.add(current_key, 1, timeout):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:  # expirée entre-temps
+                self.cache.set(current_key, 1, timeout)
+
+
+class LoginThrottle:
+    def __init__(
+        self,
+        per_email: RateLimit,
+        per_ip: RateLimit,
+        email_store: Optional[WindowStore] = None,
+        ip_store: Optional[WindowStore] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.per_email = per_email
+        self.per_ip = per_ip
+        self.email_store = email_store or LocalWindowStore()
+        self.ip_store = ip_store or SketchWindowStore()
+        self.clock = clock
+
+    def check(self, email: Optional[str], ip: Optional[str]) -> None:
+        """Lève TooManyAttempts si l'IP ou l'email a trop d'échecs récents."""
+        now = self.clock()
+        if ip and self.ip_store.exceeded("ip:" + ip, self.per_ip, now):
+            raise TooManyAttempts(self._retry_after(self.per_ip, now))
+        if isinstance(email, str) and self.email_store.exceeded(
+            "email:" + normalize_email(email), self.per_email, now
+        ):
+            raise TooManyAttempts(self._retry_after(self.per_email, now))
+
+    def failed(self, email: Optional[str], ip: Optional[str]) -> None:
+        """Compte un échec d'authentification."""
+        now = self.clock()
+        if ip:
+            self.ip_store.add("ip:" + ip, self.per_ip, now)
+        if isinstance(email, str):
+            self.email_store.add("email:" + normalize_email(email), self.per_email, now)
+
+    @staticmethod
+    def _retry_after(rate: RateLimit, now: float) -> int:
+        # fin de la fenêtre courante : borne haute raisonnable
+        return max(1, math.ceil(rate.window - now % rate.window))
+
+
+def build_throttle(config: Optional[dict], caches=None) -> Optional[LoginThrottle]:
+    """
+    Construit le throttle à partir d'un dictionnaire de réglages (voir
+    settings.USERS_LOGIN_THROTTLE) ; None le désactive. `caches` est
+    django.core.cache.caches quand BACKEND est renseigné.
+    """
+    if not config:
+        return None
+    per_email = RateLimit(*config.get("EMAIL", (5, 60)))
+    per_ip = RateLimit(*config.get("IP", (100, 60)))
+    backend = config.get("BACKEND")
+    if backend:
+        store = CacheWindowStore(caches[backend], config.get("KEY_PREFIX", "throttle"))
+        return LoginThrottle(per_email, per_ip, store, store)
+    return LoginThrottle(
+        per_email,
+        per_ip,
+        LocalWindowStore(config.get("MAX_EMAILS", 100_000)),
+        SketchWindowStore(*config.get("SKETCH", (4096, 4))),
+    )
@@ -0,0 +1,180 @@
+from typing import Dict, Iterator, List, Optional, Set
+
+from users.adapters.identity_map import IdentityMap
+from users.adapters.pagination import UserCursor
+from users.adapters.repository import AbstractUserRepository, ActiveUpdate
+from users.core.commands import UserSelection
+from users.core.events import DomainEvent
+from users.core.models import User
+from users.core.value_object import normalize_email
+
+
+class TrackingUserRepository(AbstractUserRepository):
+    """
+    Repository de la unit of work : les écritures sont mises en attente
+    (nouveaux et modifiés, indexés par id) et envoyées par lots au repository
+    sous-jacent lors de flush(). Les lectures voient les écritures en attente.
+    Les utilisateurs écrits, set_active compris, sont gardés dans `seen` pour
+    collecter leurs événements de domaine et invalider le cache au commit ;
+    begin()/end() en ouvrent un par niveau (savepoint) pour qu'un niveau
+    annulé ne perde que les siens.
+
+    Les utilisateurs lus passent par une identity map (`identity`) : relus
+    par id ou par email dans la même transaction, c'est la même instance,
+    sans requête. clear() la vide en fin de transaction.
+    """
+
+    def __init__(
+        self, inner: AbstractUserRepository, identity: Optional[IdentityMap] = None
+    ):
+        self.inner = inner
+        self.identity = identity if identity is not None else IdentityMap()
+        self.new: Dict[str, User] = {}
+        self.dirty: Dict[str, User] = {}
+        self.seen: Dict[str, User] = {}
+        self._outer: List[Dict[str, User]] = []  # `seen` des niveaux parents
+
+    @property
+    def pending(self) -> List[User]:
+        return [*self.new.values(), *self.dirty.values()]
+
+    def flush(self) -> List[User]:
+        """Écrit les modifications en attente ; retourne les utilisateurs écrits."""
+        written = self.pending
+        if self.new:
+            self.inner.save_many(self.new.values())
+        if self.dirty:
+            self.inner.update_many(self.dirty.values())
+        self.discard()
+        return written
+
+    def discard(self) -> None:
+        self.new.clear()
+        self.dirty.clear()
+
+    def clear(self) -> None:
+        """Fin de transaction : écritures en attente et identity map oubliées."""
+        self.discard()
+        self.identity.clear()
+
+    def begin(self) -> None:
+        """Nouveau niveau : ses utilisateurs écrits sont suivis à part."""
+        self._outer.append(self.seen)
+        self.seen = {}
+
+    def end(self) -> None:
+        """Fin de niveau : ce qui n'a pas été collecté remonte au parent."""
+        parent = self._outer.pop()
+        parent.update(self.seen)
+        self.seen = parent
+
+    def collect_events(self) -> List[DomainEvent]:
+        """
+        Retire les événements des utilisateurs écrits au niveau courant
+        depuis le dernier appel.
+        """
+        events = [event for user in self.seen.values() for event in user.pull_events()]
+        self.seen.clear()
+        return events
+
+    def _pending_by_email(self, email: str) -> Optional[User]:
+        return next(
+            (u for u in self.pending if normalize_email(u.email) == email), None
+        )
+
+    # --- lecture ---
+    def _exists(self, email: str) -> bool:
+        return (
+            self._pending_by_email(email) is not None
+            or self.identity.get_by_email(email) is not None
+            or self.inner.exists(email)
+        )
+
+    def _exists_many(self, emails: Set[str]) -> Set[str]:
+        staged = emails & {normalize_email(u.email) for u in self.pending}
+        return staged | self.inner.exists_many(emails - staged)
+
+    def _get_by_email(self, email: str) -> Optional[User]:
+        return (
+            self._pending_by_email(email)
+            or self.identity.get_by_email(email)
+            or self.identity.add(self.inner.get_by_email(email))
+        )
+
+    def _get_login(self, email: str) -> Optional[User]:
+        # utilisateur partiel (sans created_at) : lu mais pas mis dans la map
+        return (
+            self._pending_by_email(email)
+            or self.identity.get_by_email(email)
+            or self.inner.get_login(email)
+        )
+
+    def _get_by_id(self, user_id: str) -> Optional[User]:
+        return (
+            self.new.get(user_id)
+            or self.dirty.get(user_id)
+            or self.identity.get_by_id(user_id)
+            or self.identity.add(self.inner.get_by_id(user_id))
+        )
+
+    def _list(self) -> List[User]:
+        self.flush()
+        return self.inner.list()
+
+    def _iter_users(
+        self, batch_size: int, after: Optional[UserCursor]
+    ) -> Iterator[User]:
+        self.flush()
+        return self.inner.iter_users(batch_size, after=after)
+
+    # --- écriture (différée) ---
+    def _save(self, user: User) -> User:
+        self.identity.discard([user.id])
+        self.new[user.id] = self.seen[user.id] = user
+        return user
+
+    def _save_many(self, users: List[User]) -> List[User]:
+        self.identity.discard(user.id for user in users)
+        for user in users:
+            self.new[user.id] = self.seen[user.id] = user
+        return users
+
+    def _create_if_absent(self, user: User) -> bool:
+        # pas différé : la réponse dépend de la base, dans la transaction courante
+        if self._pending_by_email(normalize_email(user.email)) is not None:
+            return False
+        created = self.inner.create_if_absent(user)
+        if created:
+            self.seen[user.id] = user
+        return created
+
+    def _set_active(
+        self,
+        selection: UserSelection,
+        is_active: bool,
+        limit: int,
+        after: Optional[str],
+    ) -> ActiveUpdate:
+        # UPDATE ensembliste immédiat : les écritures en attente passent avant
+        self.flush()
+        result = self.inner.set_active(selection, is_active, limit, after)
+        self.identity.discard(user_id for user_id, _ in result.changed)
+        for user_id, email in result.changed:
+            # sans événement, mais à invalider au commit ; une instance déjà
+            # écrite garde sa place (et ses événements)
+            self.seen.setdefault(
+                user_id, User.hydrate(user_id, email, None, None, None)
+            )
+        return result
+
+    def _update(self, user: User) -> User:
+        self.identity.discard([user.id])
+        if user.id not in self.new:
+            self.dirty[user.id] = user
+        self.seen[user.id] = user
+        return user
+
+    def _update_many(self, users: List[User]) -> List[User]:
+        for user in users:
+            self._update(user)
+        return users
@@ -1,7 +1,52 @@
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
 
 
 @dataclass(frozen=True)
 class RegisterUserCommand:
     email: str
     password: str
+
+
+@dataclass(frozen=True)
+class UserSelection:
+    """Critères d'une opération de masse, combinés en ET."""
+
+    ids: Optional[Tuple[str, ...]] = None
+    email_domain: Optional[str] = None  # "example.com", sans le @
+    created_from: Optional[datetime] = None  # inclus
+    created_to: Optional[datetime] = None  # exclu
+
+    @property
+    def is_empty(self) -> bool:
+        return (
+            self.ids is None
+            and self.email_domain is None
+            and self.created_from is None
+            and self.created_to is None
+        )
+
+    @property
+    def email_suffix(self) -> Optional[str]:
+        if self.email_domain is None:
+            return None
+        return "@" + self.email_domain.strip().lower().lstrip("@")
+
+    def matches(self, user) -> bool:
+        suffix = self.email_suffix
+        return (
+            (self.ids is None or user.id in self.ids)
+            and (suffix is None or user.email.strip().lower().endswith(suffix))
+            and (self.created_from is None or user.created_at >= self.created_from)
+            and (self.created_to is None or user.created_at < self.created_to)
+        )
+
+
+@dataclass(frozen=True)
+class SetUsersActiveCommand:
+    """Active ou désactive en masse ; un événement par utilisateur si `emit_events`."""
+
+    selection: UserSelection
+    is_active: bool
+    emit_events: bool = False
@@ -0,0 +1,40 @@
+from dataclasses import asdict, dataclass
+from typing import Dict, Type
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """Fait métier survenu sur un User, publié via l'outbox au commit."""
+
+    user_id: str
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def to_payload(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class UserRegistered(DomainEvent):
+    email: str
+
+
+@dataclass(frozen=True)
+class UserActivated(DomainEvent):
+    pass
+
+
+@dataclass(frozen=True)
+class UserDeactivated(DomainEvent):
+    pass
+
+
+EVENT_TYPES: Dict[str, Type[DomainEvent]] = {
+    cls.__name__: cls for cls in (UserRegistered, UserActivated, UserDeactivated)
+}
+
+
+def event_from_payload(name: str, payload: dict) -> DomainEvent:
+    return EVENT_TYPES[name](**payload)
@@ -16,3 +16,9 @@ class InvalidOperation(Exception):
 
 class InvalidPasswordException(Exception):
     pass
+
+
+class TooManyAttempts(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("Trop de tentatives, réessayez plus tard")
+        self.retry_after = retry_after
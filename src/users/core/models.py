@@ -1,5 +1,12 @@
 import uuid
 from datetime import datetime
+from typing import List
+from users.core.events import (
+    DomainEvent,
+    UserActivated,
+    UserDeactivated,
+    UserRegistered,
+)
 from users.core.value_object import Email
 
 
@@ -9,19 +16,51 @@ class User:
     Toute la logique de validation et règles métier devrait être ici.
     """
 
+    # pas de __dict__ par instance : on peut en hydrater des millions ;
+    # _events n'est créé qu'au premier événement
+    __slots__ = ("id", "password", "_email", "is_active", "created_at", "_events")
+
     def __init__(
         self,
         email: Email,
         password="Password123@#",
         is_active: bool = True,
         created_at: datetime = None,
+        id: str = None,
     ):
-        self.id = str(uuid.uuid4())
+        self.id = id or str(uuid.uuid4())
         self.password = password
         self._email = email
         self.is_active = is_active
         self.created_at = created_at or datetime.utcnow()
-        self.seen = set()
+
+    @classmethod
+    def register(cls, email: str | Email, password_hash: str) -> "User":
+        """Nouvel utilisateur, avec l'événement UserRegistered."""
+        user = cls(email=email, password=password_hash)
+        user.record(UserRegistered(user.id, user.email))
+        return user
+
+    @classmethod
+    def hydrate(
+        cls,
+        id: str,
+        email: str,
+        password: str,
+        is_active: bool,
+        created_at: datetime,
+    ) -> "User":
+        """
+        Reconstruit un User déjà persisté : données de confiance, donc ni
+        génération d'id ni validation.
+        """
+        user = cls.__new__(cls)
+        user.id = id
+        user.password = password
+        user._email = email
+        user.is_active = is_active
+        user.created_at = created_at
+        return user
 
     def __repr__(self):
         return f"User(id={self.id}, email={self.email}, is_active={self.is_active}, created_at={self.created_at})"
@@ -34,6 +73,15 @@ class User:
     def __hash__(self):
         return hash(self.id)  # mieux basé sur l'id unique que l'email
 
+    @property
+    def password_hash(self) -> str:
+        """Le mot de passe n'est jamais stocké en clair : `password` est le hash."""
+        return self.password
+
+    @password_hash.setter
+    def password_hash(self, value: str) -> None:
+        self.password = value
+
     @property
     def email(self) -> str:
         return str(self._email)
@@ -46,7 +94,26 @@ class User:
             self._email = Email(value)
 
     def activate(self):
-        self.is_active = True
+        if not self.is_active:
+            self.is_active = True
+            self.record(UserActivated(self.id))
 
     def deactivate(self):
-        self.is_active = False
+        if self.is_active:
+            self.is_active = False
+            self.record(UserDeactivated(self.id))
+
+    # --- événements de domaine ---
+    def record(self, event: DomainEvent) -> None:
+        try:
+            self._events.append(event)
+        except AttributeError:
+            self._events = [event]
+
+    def pull_events(self) -> List[DomainEvent]:
+        """Retourne les événements en attente et les retire de l'agrégat."""
+        events = getattr(self, "_events", None)
+        if not events:
+            return []
+        self._events = []
+        return events
@@ -1,5 +1,7 @@
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Generic, Iterable, List, Tuple, TypeVar
 import uuid
 
 from users.core.exceptions import (
@@ -9,22 +11,107 @@ from users.core.exceptions import (
 )
 
 
+# Motifs compilés une fois pour toutes : ces validations tournent à chaque
+# construction, y compris pour chaque ligne importée.
+# Regex RFC 5322 simplifiée
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+# forme canonique produite par str(uuid.UUID) ; les autres passent par uuid.UUID
+_CANONICAL_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+# politique complète en un seul appel au moteur de regex
+_PASSWORD_RE = re.compile(
+    r"(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*[!@#$%^&*(),.?\":{}|<>]).{8,}", re.DOTALL
+)
+
+T = TypeVar("T")
+
+
+def normalize_email(value: str) -> str:
+    """
+    Forme canonique d'un email pour l'unicité et les recherches : espaces
+    retirés, minuscules. C'est la valeur stockée dans la colonne indexée
+    `email_normalized` de UserModel.
+    """
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+@dataclass
+class ValidationReport(Generic[T]):
+    """Résultat d'une validation par lot, indexé par position d'entrée."""
+
+    valid: List[Tuple[int, T]] = field(default_factory=list)
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class _ValueObject:
+    """Fabriques communes aux value objects à un seul champ `value`."""
+
+    @classmethod
+    def validate_many(cls, values: Iterable[str]) -> ValidationReport:
+        """
+        Valide un lot de valeurs ; les erreurs sont collectées par position
+        au lieu d'interrompre le lot à la première. Les instances valides sont
+        construites sans repasser par __post_init__.
+        """
+        report = ValidationReport()
+        valid, errors = report.valid.append, report.errors.append
+        check, error = cls._is_valid_value, cls._error
+        new, set_value = object.__new__, object.__setattr__
+        for i, value in enumerate(values):
+            if type(value) is not str:
+                errors((i, f"{cls.__name__} must be a string"))
+            elif check(value):
+                obj = new(cls)
+                set_value(obj, "value", value)
+                valid((i, obj))
+            else:
+                errors((i, error(value)))
+        return report
+
+
+class _InternedValueObject(_ValueObject):
+    @classmethod
+    def of(cls, value: str):
+        """
+        Instance partagée pour une valeur déjà vue : pas de revalidation pour
+        les valeurs chaudes. Réservé aux valeurs non secrètes.
+        """
+        return _interned(cls, value)
+
+
+@lru_cache(maxsize=65_536)
+def _interned(cls, value: str):
+    return cls(value)
+
+
 @dataclass(frozen=True)
-class Email:
+class Email(_InternedValueObject):
     value: str
 
     def __post_init__(self):
         if not isinstance(self.value, str):
             raise TypeError("Email must be a string")
         if not self._is_valid_email(self.value):
-            print(self._is_valid_email(self.value))
-            raise InvalidEmailException(f"Invalid email format: {self.value}")
+            raise InvalidEmailException(self._error(self.value))
 
     @staticmethod
     def _is_valid_email(email: str) -> bool:
-        # Regex RFC 5322 simplifiée
-        pattern = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
-        return re.match(pattern, email) is not None
+        return _EMAIL_RE.fullmatch(email) is not None
+
+    _is_valid_value = _EMAIL_RE.fullmatch
+
+    @staticmethod
+    def _error(value: str) -> str:
+        return f"Invalid email format: {value}"
+
+    @property
+    def normalized(self) -> str:
+        return normalize_email(self.value)
 
     def masked(self) -> str:
         """Masque partiellement l'email pour affichage sécurisé."""
@@ -36,7 +123,7 @@ class Email:
 
 
 @dataclass(frozen=True)
-class UserID:
+class UserID(_InternedValueObject):
     """Value Object représentant l'identifiant unique d'un User."""
 
     value: str
@@ -44,10 +131,22 @@ class UserID:
     def __post_init__(self):
         if not isinstance(self.value, str):
             raise TypeError("UserID must be a string")
+        if not self._is_valid_value(self.value):
+            raise ValueError(self._error(self.value))
+
+    @staticmethod
+    def _is_valid_value(value: str) -> bool:
+        if _CANONICAL_UUID_RE.fullmatch(value):
+            return True
         try:
-            uuid.UUID(self.value)
+            uuid.UUID(value)
         except ValueError:
-            raise ValueError(f"Invalid UserID: {self.value}")
+            return False
+        return True
+
+    @staticmethod
+    def _error(value: str) -> str:
+        return f"Invalid UserID: {value}"
 
     @classmethod
     def new(cls) -> "UserID":
@@ -59,26 +158,24 @@ class UserID:
 
 
 @dataclass(frozen=True)
-class Password:
+class Password(_ValueObject):
     value: str
 
     def __post_init__(self):
         if not isinstance(self.value, str):
             raise TypeError("Password must be a string")
         if not self._is_valid(self.value):
-            raise InvalidPasswordException(
-                "Password does not meet security requirements"
-            )
+            raise InvalidPasswordException(self._error(self.value))
 
     @staticmethod
     def _is_valid(pwd: str) -> bool:
-        return (
-            len(pwd) >= 8
-            and re.search(r"[A-Z]", pwd)
-            and re.search(r"[a-z]", pwd)
-            and re.search(r"\d", pwd)
-            and re.search(r"[!@#$%^&*(),.?\":{}|<>]", pwd)
-        )
+        return _PASSWORD_RE.fullmatch(pwd) is not None
+
+    _is_valid_value = _PASSWORD_RE.fullmatch
+
+    @staticmethod
+    def _error(value: str) -> str:
+        return "Password does not meet security requirements"
 
     def __str__(self):
         return self.value
@@ -0,0 +1,166 @@
+"""
+Instrumentation du service layer : durées et nombre de requêtes SQL par
+étape (cas d'usage, repository, hachage, sérialisation).
+
+Désactivée par défaut ; dans ce cas `span` et `instrumented` se réduisent à
+un test de booléen. Le décompte des requêtes est alimenté par l'adapter
+Django (account.metrics) via `record_query`.
+"""
+
+import contextlib
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class _State:
+    enabled = False
+
+
+state = _State()
+
+
+def enable() -> None:
+    state.enabled = True
+
+
+def disable() -> None:
+    state.enabled = False
+
+
+@dataclass
+class RequestTimings:
+    """Mesures d'une requête, pour l'en-tête Server-Timing."""
+
+    queries: int = 0
+    query_seconds: float = 0.0
+    spans: Dict[str, Tuple[float, int]] = field(default_factory=dict)
+
+    def add(self, name: str, seconds: float, queries: int) -> None:
+        total, count = self.spans.get(name, (0.0, 0))
+        self.spans[name] = (total + seconds, count + queries)
+
+    def server_timing(self) -> str:
+        entries = [
+            f'{name};dur={seconds * 1e3:.2f};desc="{queries} queries"'
+            for name, (seconds, queries) in self.spans.items()
+        ]
+        entries.append(
+            f'db;dur={self.query_seconds * 1e3:.2f};desc="{self.queries} queries"'
+        )
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "users_request_timings", default=None
+)
+
+
+class Metrics:
+    """Agrégats cumulés depuis le démarrage du process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[str, List[float]] = {}  # nom -> [appels, secondes, requêtes]
+        self._gauges: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def observe(self, name: str, seconds: float, queries: int) -> None:
+        with self._lock:
+            entry = self._spans.setdefault(name, [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += queries
+
+    def register_gauges(self, name: str, collect: Callable[[], Dict[str, float]]):
+        """`collect` retourne des valeurs courantes (ex. statistiques de cache)."""
+        self._gauges[name] = collect
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def snapshot(self) -> Dict[str, Tuple[int, float, int]]:
+        with self._lock:
+            return {name: tuple(entry) for name, entry in self._spans.items()}
+
+    def render_prometheus(self) -> str:
+        lines = [
+            "# HELP users_span_seconds Temps passé par étape instrumentée.",
+            "# TYPE users_span_seconds summary",
+        ]
+        spans = self.snapshot()
+        for name, (calls, seconds, _) in sorted(spans.items()):
+            lines.append(f'users_span_seconds_count{{span="{name}"}} {calls}')
+            lines.append(f'users_span_seconds_sum{{span="{name}"}} {seconds:.6f}')
+        lines += [
+            "# HELP users_span_queries_total Requêtes SQL émises par étape.",
+            "# TYPE users_span_queries_total counter",
+        ]
+        for name, (_, _, queries) in sorted(spans.items()):
+            lines.append(f'users_span_queries_total{{span="{name}"}} {queries}')
+        for name, collect in sorted(self._gauges.items()):
+            lines.append(f"# TYPE users_{name} gauge")
+            for key, value in sorted(collect().items()):
+                lines.append(f'users_{name}{{stat="{key}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+@contextlib.contextmanager
+def request_scope() -> Iterator[Optional[RequestTimings]]:
+    """Collecte les mesures d'une requête (None si désactivé)."""
+    if not state.enabled:
+        yield None
+        return
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def record_query(seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.queries += 1
+        timings.query_seconds += seconds
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    if not state.enabled:
+        yield
+        return
+    timings = _current.get()
+    queries_before = timings.queries if timings else 0
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        queries = timings.queries - queries_before if timings else 0
+        metrics.observe(name, seconds, queries)
+        if timings is not None:
+            timings.add(name, seconds, queries)
+
+
+def instrumented(name: str):
+    """Décorateur : mesure chaque appel de la fonction sous le nom `name`."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not state.enabled:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,48 @@
+from typing import Optional
+from users.adapters.async_repository import AbstractAsyncUserRepository
+from users.adapters.hashers import PasswordHashingEngine, build_engine
+from users.core.commands import RegisterUserCommand
+from users.core.exceptions import InvalidOperation, UserAlreadyExists, UserNotFound
+from users.core.models import User
+
+
+class AsyncUserService:
+    """
+    Pendant asynchrone de UserService pour ASGI. Le hachage, coûteux en CPU,
+    est déporté dans un pool pour ne pas bloquer la boucle d'événements.
+    """
+
+    def __init__(
+        self,
+        users: AbstractAsyncUserRepository,
+        hasher: Optional[PasswordHashingEngine] = None,
+    ):
+        self.users = users
+        self.hasher = hasher or build_engine()
+
+    # ---------- Use Case 1 : Register ----------
+    async def register(self, cmd: RegisterUserCommand) -> User:
+        if await self.users.exists(cmd.email):
+            raise UserAlreadyExists(
+                f"Un utilisateur avec l'email {cmd.email} existe déjà."
+            )
+
+        user = User.register(cmd.email, await self.hasher.ahash(cmd.password))
+        return await self.users.save(user)
+
+    # ---------- Use Case 2 : Authenticate ----------
+    async def authenticate(self, email: str, password: str) -> User:
+        user = await self.users.get_login(email)
+        if not user:
+            raise UserNotFound("Utilisateur introuvable")
+
+        valid, needs_rehash = await self.hasher.averify(password, user.password_hash)
+        if not valid:
+            raise ValueError("Mot de passe incorrect")
+        if not user.is_active:
+            raise InvalidOperation("Compte désactivé")
+
+        if needs_rehash:
+            user.password_hash = await self.hasher.ahash(password)
+            user = await self.users.update(user)
+        return user
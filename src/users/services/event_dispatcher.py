@@ -0,0 +1,124 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from users.adapters.outbox import AbstractOutbox, Failure, OutboxMessage
+from users.core.events import DomainEvent
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[DomainEvent], None]
+
+
+@dataclass
+class DispatchReport:
+    claimed: int = 0
+    dispatched: int = 0
+    retried: int = 0
+    abandoned: int = 0
+
+    def add(self, other: "DispatchReport") -> None:
+        self.claimed += other.claimed
+        self.dispatched += other.dispatched
+        self.retried += other.retried
+        self.abandoned += other.abandoned
+
+
+class EventDispatcher:
+    """
+    Publie les événements de l'outbox par lots : chaque lot est réservé pour
+    `lease` secondes, ses messages sont traités en parallèle (un message
+    appelle ses handlers dans l'ordre), puis marqués publiés ou reprogrammés
+    avec un backoff exponentiel. Au-delà de `max_attempts`, le message est
+    abandonné (failed_at) et son erreur conservée.
+
+    Livraison « au moins une fois » : un handler doit tolérer un doublon
+    (bail expiré pendant un traitement trop long, crash avant le marquage).
+    """
+
+    def __init__(
+        self,
+        outbox: AbstractOutbox,
+        handlers: Dict[str, Sequence[Handler]],
+        max_workers: int = 4,
+        max_attempts: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        lease: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.outbox = outbox
+        self.handlers = handlers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="events")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def retry_delay(self, attempts: int) -> float:
+        """Délai avant la tentative suivante, après `attempts` échecs."""
+        return min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+
+    def _handle(self, message: OutboxMessage) -> Optional[str]:
+        try:
+            for handler in self.handlers.get(message.event.name, ()):
+                handler(message.event)
+        except Exception as e:
+            logger.warning("Échec de %s (#%s) : %r", message.event.name, message.id, e)
+            return repr(e)
+        return None
+
+    def dispatch_once(self, batch_size: int = 100) -> DispatchReport:
+        messages = self.outbox.claim(batch_size, self.lease)
+        report = DispatchReport(claimed=len(messages))
+        if not messages:
+            return report
+
+        errors = list(self._executor.map(self._handle, messages))
+        done: List[OutboxMessage] = []
+        failures: List[Failure] = []
+        now = self.clock()
+        for message, error in zip(messages, errors):
+            if error is None:
+                done.append(message)
+                continue
+            attempts = message.attempts + 1
+            if attempts >= self.max_attempts:
+                failures.append(Failure(message, error, None))
+                report.abandoned += 1
+            else:
+                retry_at = now + self.retry_delay(attempts)
+                failures.append(Failure(message, error, retry_at))
+                report.retried += 1
+        self.outbox.mark_dispatched(done)
+        if failures:
+            self.outbox.mark_failed(failures)
+        report.dispatched = len(done)
+        return report
+
+    def run(
+        self,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> DispatchReport:
+        """Boucle du worker : enchaîne les lots, attend `poll_interval` à vide."""
+        total = DispatchReport()
+        while not should_stop():
+            report = self.dispatch_once(batch_size)
+            total.add(report)
+            if report.claimed < batch_size:
+                time.sleep(poll_interval)
+        return total
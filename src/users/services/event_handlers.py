@@ -0,0 +1,14 @@
+"""
+Handlers d'événements de domaine, branchés par settings.USERS_EVENT_HANDLERS
+et appelés par le worker `manage.py dispatch_events`, hors requête HTTP.
+"""
+
+import logging
+
+from users.core.events import DomainEvent
+
+logger = logging.getLogger("users.events")
+
+
+def log_event(event: DomainEvent) -> None:
+    logger.info("%s %s", event.name, event.to_payload())
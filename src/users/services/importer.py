@@ -0,0 +1,146 @@
+"""
+Import d'utilisateurs en flux depuis un fichier CSV ou JSONL.
+
+Le fichier est lu ligne à ligne et traité par lots via
+UserService.register_many : la mémoire dépend de la taille du lot, pas de
+celle du fichier. Après chaque lot, l'offset (en octets) de la dernière ligne
+traitée est écrit dans un fichier de checkpoint pour pouvoir reprendre.
+"""
+
+import csv
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from itertools import islice
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from users.core.commands import RegisterUserCommand
+from users.services.user_services import RegistrationReport, UserService
+
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class ImportProgress:
+    offset: int = 0
+    rows: int = 0
+    created: int = 0
+    already_exists: int = 0
+    invalid: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def add(self, report: RegistrationReport) -> None:
+        self.rows += len(report.results)
+        self.created += report.created
+        self.already_exists += report.already_exists
+        self.invalid += report.invalid
+
+
+class Checkpoint:
+    """Progression persistée dans un fichier JSON, écrit de façon atomique."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[ImportProgress]:
+        try:
+            with open(self.path) as f:
+                return ImportProgress(**json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def save(self, progress: ImportProgress) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(asdict(progress), f)
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Format non reconnu pour {path}, préciser csv ou jsonl")
+
+
+def read_records(f: BinaryIO, fmt: str, offset: int = 0) -> Iterator[Tuple[int, dict]]:
+    """
+    Produit (offset après la ligne, enregistrement) pour chaque ligne non vide.
+    Un enregistrement illisible est produit vide : il sera rejeté à la
+    validation plutôt que d'interrompre l'import.
+    """
+    header = None
+    if fmt == "csv":
+        header = next(csv.reader([f.readline().decode("utf-8")]), None)
+    if offset > f.tell():
+        f.seek(offset)
+
+    for line in iter(f.readline, b""):
+        text = line.decode("utf-8", errors="replace").strip()
+        if not text:
+            continue
+        if header is not None:
+            record = dict(zip(header, next(csv.reader([text]))))
+        else:
+            try:
+                record = json.loads(text)
+            except ValueError:
+                record = {}
+            if not isinstance(record, dict):
+                record = {}
+        yield f.tell(), record
+
+
+def to_commands(
+    records: Iterable[Tuple[int, dict]],
+) -> Iterator[Tuple[int, RegisterUserCommand]]:
+    for offset, record in records:
+        yield offset, RegisterUserCommand(
+            email=record.get("email"), password=record.get("password")
+        )
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def import_users(
+    service: UserService,
+    f: BinaryIO,
+    fmt: str,
+    batch_size: int = 1000,
+    checkpoint: Optional[Checkpoint] = None,
+    on_batch: Optional[Callable[[ImportProgress], None]] = None,
+) -> ImportProgress:
+    progress = (checkpoint and checkpoint.load()) or ImportProgress()
+    resumed_elapsed = progress.elapsed
+    start = time.perf_counter()
+
+    for batch in batched(
+        to_commands(read_records(f, fmt, progress.offset)), batch_size
+    ):
+        report = service.register_many(cmd for _, cmd in batch)
+        progress.add(report)
+        progress.offset = batch[-1][0]
+        progress.elapsed = resumed_elapsed + time.perf_counter() - start
+        if checkpoint:
+            checkpoint.save(progress)
+        if on_batch:
+            on_batch(progress)
+
+    if checkpoint:
+        checkpoint.clear()
+    return progress
@@ -0,0 +1,81 @@
+"""
+Migration des anciens hash SHA-256 vers le KDF courant, hors ligne.
+
+Les lignes sont lues par lots (keyset sur l'id), chaque lot est haché dans
+un pool de process et réécrit par bulk_update dans l'ordre de lecture. Au
+plus `max_in_flight` lots sont en cours à la fois : la mémoire ne dépend
+pas du nombre d'utilisateurs, et la lecture s'arrête quand le pool sature.
+
+Reprise : seuls les hash encore au format SHA-256 sont lus, une migration
+interrompue repart donc d'elle-même là où elle en était ; `after` (dernier
+id écrit, affiché à chaque lot) évite de reparcourir le début.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Tuple
+
+from users.adapters.hashers import PasswordHasher, wrap_legacy_hashes
+
+# hash SHA-256 historique, cf. SHA256LegacyPasswordHasher
+LEGACY_PATTERN = r"^[0-9a-f]{64}$"
+
+
+@dataclass
+class RehashProgress:
+    after: Optional[str] = None  # dernier id écrit
+    rows: int = 0
+    rehashed: int = 0
+    skipped: int = 0  # hash modifié entre la lecture et l'écriture
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def rehash_legacy_passwords(
+    repository,
+    kdf: PasswordHasher,
+    executor: Executor,
+    chunk_size: int = 200,
+    max_in_flight: int = 8,
+    after: Optional[str] = None,
+    on_chunk: Optional[Callable[[RehashProgress], None]] = None,
+) -> RehashProgress:
+    """
+    `repository` fournit iter_password_hashes et replace_password_hashes
+    (DjangoUserRepository).
+    """
+    progress = RehashProgress(after=after)
+    started = time.perf_counter()
+    in_flight: Deque[Tuple[List[Tuple[str, str]], Future]] = deque()
+
+    def write_oldest() -> None:
+        rows, future = in_flight.popleft()
+        hashes = future.result()
+        written = repository.replace_password_hashes(
+            [(pk, old, new) for (pk, old), new in zip(rows, hashes)]
+        )
+        progress.after = rows[-1][0]
+        progress.rows += len(rows)
+        progress.rehashed += written
+        progress.skipped += len(rows) - written
+        progress.elapsed = time.perf_counter() - started
+        if on_chunk is not None:
+            on_chunk(progress)
+
+    for rows in repository.iter_password_hashes(LEGACY_PATTERN, chunk_size, after):
+        in_flight.append(
+            (rows, executor.submit(wrap_legacy_hashes, kdf, [h for _, h in rows]))
+        )
+        # contre-pression : on ne lit le lot suivant qu'une fois de la place
+        if len(in_flight) >= max_in_flight:
+            write_oldest()
+    while in_flight:
+        write_oldest()
+
+    progress.elapsed = time.perf_counter() - started
+    return progress
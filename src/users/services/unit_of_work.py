@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import Optional
+from django.db import DEFAULT_DB_ALIAS, transaction
 from users.adapters.repository import AbstractUserRepository, InMemoryRepository
+from users.adapters.django_outbox import DjangoOutbox
 from users.adapters.django_repository import DjangoUserRepository
+from users.adapters.outbox import AbstractOutbox, InMemoryOutbox
+from users.adapters.tracking_repository import TrackingUserRepository
 
 
 class AbstractUnitOfWork(ABC):
     users: AbstractUserRepository
+    outbox: AbstractOutbox
 
     def __enter__(self):
         return self
@@ -22,36 +28,88 @@ class AbstractUnitOfWork(ABC):
 
 
 class DjangoUnitOfWork(AbstractUnitOfWork):
-    def __init__(self):
-        self.users = DjangoUserRepository()
+    """
+    Chaque `with uow:` ouvre un bloc transaction.atomic (un savepoint s'il est
+    imbriqué). Les écritures du repository sont différées et envoyées par lots
+    au commit(), avec les événements de domaine des utilisateurs écrits
+    (outbox) ; sans commit(), ou sur exception, le bloc est annulé.
+    Les lectures partagent une identity map jusqu'à la sortie du bloc le
+    plus externe.
+    """
+
+    def __init__(
+        self,
+        users: Optional[AbstractUserRepository] = None,
+        using: str = DEFAULT_DB_ALIAS,
+        outbox: Optional[AbstractOutbox] = None,
+    ):
+        # un repository décoré (cache, ...) peut être injecté
+        self.repository = users if users is not None else DjangoUserRepository()
+        self.users = TrackingUserRepository(self.repository)
+        self.outbox = outbox if outbox is not None else DjangoOutbox(using)
+        self.using = using
+        self._blocks = []  # pile de [atomic, committed], un par niveau
 
     def __enter__(self):
+        if self._blocks:
+            # les écritures du niveau parent doivent précéder le savepoint
+            self.users.flush()
+        block = transaction.atomic(using=self.using)
+        block.__enter__()
+        self._blocks.append([block, False])
+        self.users.begin()
         return super().__enter__()
 
-    def __exit__(self, *args):
-        super().__exit__(*args)
+    def __exit__(self, exc_type, exc, tb):
+        block, committed = self._blocks[-1]
+        try:
+            if exc_type is not None or not committed:
+                self.rollback()
+        finally:
+            # annulé : déjà vidé par rollback() ; sinon remonte au parent
+            self.users.end()
+            self._blocks.pop()
+            if not self._blocks:
+                # identity map : valable le temps de la transaction
+                self.users.clear()
+            block.__exit__(exc_type, exc, tb)
 
     def commit(self):
-
-        pass
+        self.users.flush()
+        # tous les écrits du niveau, y compris par un flush() intermédiaire
+        written = list(self.users.seen.values())
+        # même transaction que les écritures : publiés si et seulement si commit
+        self.outbox.add(self.users.collect_events())
+        if self._blocks:
+            self._blocks[-1][1] = True
+        invalidate = getattr(self.repository, "invalidate", None)
+        if invalidate is not None and written:
+            # le cache ne doit être purgé qu'une fois les données visibles
+            transaction.on_commit(
+                lambda: [invalidate(user) for user in written], using=self.using
+            )
 
     def rollback(self):
-
-        pass
+        # instances chargées peut-être modifiées : identity map comprise
+        self.users.clear()
+        # niveau annulé : ses événements sont perdus, pas ceux des parents
+        self.users.collect_events()
+        if self._blocks:
+            transaction.set_rollback(True, using=self.using)
 
 
 class InMemoryUnitOfWork(AbstractUnitOfWork):
-    def __init__(self):
-        self.users = InMemoryRepository()
+    """Même contrat que DjangoUnitOfWork sur un InMemoryRepository."""
 
-    def __enter__(self):
-        return self
-
-    def __exit__(self, *args):
-        pass  # rien à rollback
+    def __init__(self):
+        self.repository = InMemoryRepository()
+        self.users = TrackingUserRepository(self.repository)
+        self.outbox = InMemoryOutbox()
 
     def commit(self):
-        pass  # pas de DB réelle
+        self.users.flush()
+        self.outbox.add(self.users.collect_events())
 
     def rollback(self):
-        pass
+        self.users.clear()
+        self.users.collect_events()
@@ -1,44 +1,220 @@
-import hashlib
+import enum
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
 from users.core.models import User
-from users.core.exceptions import UserAlreadyExists, UserNotFound
-from users.core.commands import RegisterUserCommand
+from users.core.events import UserActivated, UserDeactivated
+from users.core.exceptions import InvalidOperation, UserAlreadyExists, UserNotFound
+from users.core.commands import RegisterUserCommand, SetUsersActiveCommand
+from users.core.value_object import Email, Password
+from users.adapters.hashers import PasswordHashingEngine, build_engine
+from users.adapters.pagination import UserCursor, decode_cursor, encode_cursor
 from users.adapters.repository import AbstractUserRepository
+from users.instrumentation import instrumented
 from users.services.unit_of_work import AbstractUnitOfWork
 
 
+class RegistrationStatus(enum.Enum):
+    CREATED = "created"
+    ALREADY_EXISTS = "already_exists"
+    INVALID = "invalid"
+
+
+@dataclass(frozen=True)
+class RegistrationResult:
+    command: RegisterUserCommand
+    status: RegistrationStatus
+    user: Optional[User] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class RegistrationReport:
+    """Résultat de register_many, dans l'ordre des commandes reçues."""
+
+    results: List[RegistrationResult] = field(default_factory=list)
+
+    def count(self, status: RegistrationStatus) -> int:
+        return sum(1 for r in self.results if r.status is status)
+
+    @property
+    def created(self) -> int:
+        return self.count(RegistrationStatus.CREATED)
+
+    @property
+    def already_exists(self) -> int:
+        return self.count(RegistrationStatus.ALREADY_EXISTS)
+
+    @property
+    def invalid(self) -> int:
+        return self.count(RegistrationStatus.INVALID)
+
+
 class UserService:
-    def __init__(self, uow: AbstractUnitOfWork):
+    def __init__(
+        self, uow: AbstractUnitOfWork, hasher: Optional[PasswordHashingEngine] = None
+    ):
         self.uow = uow
+        self.hasher = hasher or build_engine()
 
     # ---------- Use Case 1 : Register ----------
+    @instrumented("service.register")
     def register(self, cmd: RegisterUserCommand) -> User:
+        # lecture indexée avant le hachage : un email déjà pris ne coûte pas
+        # un KDF complet (doublons, sondage des comptes existants)
+        with self.uow:
+            taken = self.uow.users.exists(cmd.email)
+        if taken:
+            raise UserAlreadyExists(
+                f"Un utilisateur avec l'email {cmd.email} existe déjà."
+            )
+        user = User.register(cmd.email, self._hash_password(cmd.password))
+
         with self.uow:
-            if self.uow.users.exists(cmd.email):
+            # vérification et insertion en une requête : pas de course entre
+            # deux inscriptions concurrentes du même email
+            if not self.uow.users.create_if_absent(user):
                 raise UserAlreadyExists(
                     f"Un utilisateur avec l'email {cmd.email} existe déjà."
                 )
+            self.uow.commit()
 
-            password_hash = self._hash_password(cmd.password)
-            user = User(email=cmd.email)
-            user.password_hash = password_hash
+            return user
+
+    # ---------- Use Case 1 bis : Register en masse ----------
+    @instrumented("service.register_many")
+    def register_many(
+        self, commands: Iterable[RegisterUserCommand]
+    ) -> RegistrationReport:
+        """
+        Inscrit un lot d'utilisateurs : une vérification d'existence groupée
+        et une insertion groupée au lieu de deux requêtes par utilisateur.
+        """
+        commands = list(commands)
+        results: List[Optional[RegistrationResult]] = [None] * len(commands)
 
-            saved_user = self.uow.users.save(user)
+        # validation vectorisée, erreurs collectées par position
+        email_report = Email.validate_many(cmd.email for cmd in commands)
+        password_report = Password.validate_many(cmd.password for cmd in commands)
+        errors = dict(password_report.errors)
+        errors.update(email_report.errors)
+        emails = dict(email_report.valid)
+
+        # email normalisé -> (index de la première commande, Email)
+        candidates = {}
+        for i, cmd in enumerate(commands):
+            if i in errors:
+                results[i] = RegistrationResult(
+                    cmd, RegistrationStatus.INVALID, error=errors[i]
+                )
+                continue
+            email = emails[i]
+            if email.normalized in candidates:
+                results[i] = RegistrationResult(
+                    cmd,
+                    RegistrationStatus.ALREADY_EXISTS,
+                    error="Email en double dans le lot",
+                )
+                continue
+            candidates[email.normalized] = (i, email)
+
+        with self.uow:
+            existing = self.uow.users.exists_many(candidates)
+            to_create = []
+            for value, (i, email) in candidates.items():
+                cmd = commands[i]
+                if value in existing:
+                    results[i] = RegistrationResult(
+                        cmd,
+                        RegistrationStatus.ALREADY_EXISTS,
+                        error=f"Un utilisateur avec l'email {value} existe déjà.",
+                    )
+                    continue
+                to_create.append((i, email))
 
-            return saved_user
+            # hachage groupé : réparti sur le pool du hasher s'il en a un
+            hashes = self.hasher.hash_many(commands[i].password for i, _ in to_create)
+            to_create = [
+                (i, User.register(email, password_hash))
+                for (i, email), password_hash in zip(to_create, hashes)
+            ]
+
+            saved = self.uow.users.save_many(user for _, user in to_create)
+            self.uow.commit()
+
+        for (i, _), user in zip(to_create, saved):
+            results[i] = RegistrationResult(
+                commands[i], RegistrationStatus.CREATED, user=user
+            )
+        return RegistrationReport(results)
 
     # ---------- Use Case 2 : Authenticate ----------
+    @instrumented("service.authenticate")
     def authenticate(self, email: str, password: str) -> User:
         with self.uow:
-            user = self.uow.users.get_by_email(email)
+            user = self.uow.users.get_login(email)
             if not user:
                 raise UserNotFound("Utilisateur introuvable")
 
-            if user.password_hash != self._hash_password(password):
+            valid, needs_rehash = self.hasher.verify(password, user.password_hash)
+            if not valid:
                 raise ValueError("Mot de passe incorrect")
+            if not user.is_active:
+                raise InvalidOperation("Compte désactivé")
 
-            # Pas besoin de commit ici, juste lecture
+            if needs_rehash:
+                # réglages de hachage modifiés depuis le dernier login
+                user.password_hash = self._hash_password(password)
+                user = self.uow.users.update(user)
+                self.uow.commit()
             return user
 
+    # ---------- Use Case 3 : Lister (pagination par curseur) ----------
+    @instrumented("service.list_users")
+    def list_users(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        """Une page d'utilisateurs et le curseur opaque de la page suivante."""
+        after = decode_cursor(cursor) if cursor else None
+        with self.uow:
+            # une ligne de plus pour savoir s'il existe une page suivante
+            users = list(
+                islice(self.uow.users.iter_users(limit + 1, after=after), limit + 1)
+            )
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        return users, encode_cursor(UserCursor.after(users[-1]))
+
+    # ---------- Use Case 4 : Activer / désactiver en masse ----------
+    @instrumented("service.set_active_many")
+    def set_active_many(
+        self, cmd: SetUsersActiveCommand, chunk_size: int = 1000
+    ) -> int:
+        """
+        Applique is_active à toute la sélection par lots de `chunk_size`, une
+        transaction par lot ; retourne le nombre d'utilisateurs modifiés.
+        """
+        if cmd.selection.is_empty:
+            raise InvalidOperation("Sélection vide : préciser au moins un critère")
+        event = UserActivated if cmd.is_active else UserDeactivated
+        total = 0
+        after = None
+        while True:
+            with self.uow:
+                batch = self.uow.users.set_active(
+                    cmd.selection, cmd.is_active, chunk_size, after
+                )
+                if cmd.emit_events:
+                    self.uow.outbox.add(
+                        [event(user_id) for user_id, _ in batch.changed]
+                    )
+                self.uow.commit()
+            total += len(batch.changed)
+            if batch.next_after is None:
+                return total
+            after = batch.next_after
+
     # ---------- Utils ----------
     def _hash_password(self, password: str) -> str:
-        return hashlib.sha256(password.encode()).hexdigest()
+        return self.hasher.hash(password)